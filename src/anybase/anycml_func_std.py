@@ -24,6 +24,9 @@
 ###
 
 import os
+import ast
+import builtins
+import functools
 import pyjson5
 import random
 import numpy as np
@@ -34,7 +37,10 @@ from typing import Any
 import ison
 from . import config
 from . import file
+from . import compress
 from . import path
+from . import path_glob
+from .cls_random_dict_selector import CRandomDictSelector
 from ison.core.cls_parser_error import (
     CParserError,
     CParserError_Message,
@@ -53,8 +59,6 @@ from ison.core.cls_parser_error import (
     CParserError_FuncMessage,
 )
 
-g_dicImport = {}
-
 
 def tooltip(sTooltip):
     def inner(func):
@@ -144,14 +148,16 @@ def DictPathDict(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         else:
             lPaths = _lArgs[2]
         # endif
+        iterPathValues = (
+            (sPath, config.GetDictValue(_lArgs[0], sPath, object, bAllowKeyPath=True)) for sPath in lPaths
+        )
     else:
-        lPaths = config.GetDictPaths(_lArgs[0])
+        # Paths and values in a single pass
+        iterPathValues = config.IterDictPaths(_lArgs[0])
     # endif
 
     xResult = {}
-    for sPath in lPaths:
-        xEl = config.GetDictValue(_lArgs[0], sPath, Any, bAllowKeyPath=True)
-        # xEl = config.GetElementAtPath(_lArgs[0], sPath)
+    for sPath, xEl in iterPathValues:
         if len(lKeyPath) > 0:
             sKey = ison.text.ToString(_xParser.ProcessRefPath(xEl, lKeyPath, 0))
         else:
@@ -226,6 +232,10 @@ def _RandomSelectInDict(_dicVal):
 
 
 ################################################################################
+# Randomly selects one element of each list in a dictionary.
+# Optional arguments are a random seed and the number of variants to generate.
+# With a seed, or if the parser has a random generator, the selection is reproducible.
+# If a number of variants is given, a list of dictionaries is returned.
 @tooltip("Randomly selects from dictionary. Obsolete, use $rand.zwicky{} instead")
 def DictRndDict(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
 
@@ -235,10 +245,26 @@ def DictRndDict(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
 
     iArgCnt = len(_lArgs)
 
-    if iArgCnt != 1:
+    if iArgCnt < 1 or iArgCnt > 3:
         raise CParserError_FuncMessage(
             sFunc=sFuncName,
-            sMsg="Function {0} expects at exactly 1 argument but {1} were given".format(sFuncName, iArgCnt),
+            sMsg="Function {0} expects 1 to 3 arguments but {1} were given".format(sFuncName, iArgCnt),
+        )
+    # endif
+
+    iSeed = _lArgs[1] if iArgCnt > 1 else None
+    if iSeed is not None and not isinstance(iSeed, int):
+        raise CParserError_FuncMessage(
+            sFunc=sFuncName,
+            sMsg="The second argument of function '{0}' must be an integer seed".format(sFuncName),
+        )
+    # endif
+
+    iCount = _lArgs[2] if iArgCnt > 2 else None
+    if iCount is not None and (not isinstance(iCount, int) or iCount < 0):
+        raise CParserError_FuncMessage(
+            sFunc=sFuncName,
+            sMsg="The third argument of function '{0}' must be a non-negative integer".format(sFuncName),
         )
     # endif
 
@@ -251,7 +277,18 @@ def DictRndDict(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
     # endif
 
     dicProc, bIsProc = _xParser.InnerProcess(dicVal)
-    xResult = _RandomSelectInDict(dicProc)
+
+    xRng = getattr(_xParser, "xRandomGenerator", None)
+    if iSeed is None and xRng is None and iCount is None:
+        xResult = _RandomSelectInDict(dicProc)
+    else:
+        xSelector = CRandomDictSelector(dicProc)
+        if iSeed is not None:
+            xRng = np.random.default_rng(iSeed)
+        # endif
+        lVariants = xSelector.SelectMany(1 if iCount is None else iCount, xRng=xRng)
+        xResult = lVariants[0] if iCount is None else lVariants
+    # endif
 
     return xResult, False
 
@@ -284,12 +321,8 @@ def DirectoryList(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
         )
     # endif
 
-    lPaths = glob(path.NormPath(sPath), recursive=True)
-    if lPaths is not None:
-        xResult = [path.NormPath(x) for x in lPaths]
-    else:
-        xResult = None
-    # endif
+    # The resulting paths are already normalized
+    xResult = path_glob.Glob(path.NormPath(sPath))
 
     return xResult, False
 
@@ -297,6 +330,99 @@ def DirectoryList(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
 # enddef
 
 
+################################################################################
+# Globals of python code evaluated by '$py'. The variable data is added per call.
+g_dicEvalGlobals = {
+    "__builtins__": builtins,
+    "rnd": random,
+    "random": random,
+    "np": np,
+    "numpy": np,
+}
+
+# Functions, which may be used in pure expressions.
+# The results of pure expressions only depend on the expression string.
+g_setEvalPureBuiltins = set("abs bool complex divmod float int len max min pow round str sum".split())
+g_setEvalPureNumpy = set(
+    """abs arccos arcsin arctan arctan2 ceil clip cos cosh deg2rad degrees e exp floor hypot inf
+    log log10 log2 max maximum mean min minimum mod nan pi power prod rad2deg radians round sign
+    sin sinh sqrt sum tan tanh trunc""".split()
+)
+g_tEvalPureNodes = (
+    ast.Expression,
+    ast.Constant,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.Tuple,
+    ast.List,
+    ast.Subscript,
+    ast.Slice,
+    ast.Call,
+    ast.keyword,
+    ast.Attribute,
+    ast.Name,
+    ast.expr_context,
+    ast.operator,
+    ast.unaryop,
+    ast.boolop,
+    ast.cmpop,
+)
+# Result types of pure expressions, which are cached
+g_tEvalCacheTypes = (int, float, complex, bool, str, type(None), np.generic)
+
+g_iEvalResultCacheSize: int = 4096
+g_dicEvalPureResult: dict[str, Any] = {}
+
+
+################################################################################
+# Test whether an expression is pure, i.e. it only consists of constants, arithmetic,
+# comparisons and calls of the functions in 'g_setEvalPureBuiltins' and 'g_setEvalPureNumpy'.
+def _IsPurePythonExpr(_xTree: ast.Expression) -> bool:
+    for xNode in ast.walk(_xTree):
+        if not isinstance(xNode, g_tEvalPureNodes):
+            return False
+
+        elif isinstance(xNode, ast.Attribute):
+            if not (
+                isinstance(xNode.value, ast.Name)
+                and xNode.value.id in ("np", "numpy")
+                and xNode.attr in g_setEvalPureNumpy
+            ):
+                return False
+            # endif
+
+        elif isinstance(xNode, ast.Name):
+            if xNode.id not in g_setEvalPureBuiltins and xNode.id not in ("np", "numpy"):
+                return False
+            # endif
+
+        elif isinstance(xNode, ast.Call):
+            if isinstance(xNode.func, ast.Name) and xNode.func.id in ("np", "numpy"):
+                return False
+            # endif
+        # endif
+    # endfor
+
+    return True
+
+
+# enddef
+
+
+################################################################################
+# Compiled code of python expressions, and whether the expression is pure
+@functools.lru_cache(maxsize=1024)
+def _CompilePython(_sCmd: str) -> tuple:
+    xTree = ast.parse(_sCmd, mode="eval")
+    return compile(xTree, "<string>", "eval"), _IsPurePythonExpr(xTree)
+
+
+# enddef
+
+
 ################################################################################
 @tooltip("Evaluates the argument as python code")
 def EvalPython(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
@@ -325,16 +451,21 @@ def EvalPython(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
     sCmd = sCmd.strip()
 
     try:
-        xResult = eval(
-            sCmd,
-            {
-                "rnd": random,
-                "random": random,
-                "np": np,
-                "numpy": np,
-                "dicVar": _xParser.GetVarData(),
-            },
-        )
+        xCode, bIsPure = _CompilePython(sCmd)
+        if bIsPure is True and sCmd in g_dicEvalPureResult:
+            xResult = g_dicEvalPureResult[sCmd]
+        else:
+            dicGlobals = g_dicEvalGlobals.copy()
+            dicGlobals["dicVar"] = _xParser.GetVarData()
+            xResult = eval(xCode, dicGlobals)
+
+            if bIsPure is True and isinstance(xResult, g_tEvalCacheTypes):
+                if len(g_dicEvalPureResult) >= g_iEvalResultCacheSize:
+                    g_dicEvalPureResult.clear()
+                # endif
+                g_dicEvalPureResult[sCmd] = xResult
+            # endif
+        # endif
 
     except Exception as xEx:
         raise CParserError_FuncMessage(
@@ -386,8 +517,6 @@ def Json(_xParser, _lArgs, _lArgIsProc, *, sFuncName):
     "If the path contains wildcards, the first matching path is used"
 )
 def Import(_xParser, _lArgs, _lArgIsProc, *, sFuncName, funcGetCustomVarsFromPath=None):
-    global g_dicImport
-
     if not all(_lArgIsProc):
         return None, False
     # endif
@@ -441,21 +570,38 @@ def Import(_xParser, _lArgs, _lArgIsProc, *, sFuncName, funcGetCustomVarsFromPat
         # endif
         pathImport = Path(lPaths[0])
     else:
-        pathImport = path.ProvideReadFilepathExt(pathFile, [".json", ".json5", ".ison"], bDoRaise=True)
+        pathImport = path.ProvideReadFilepathExt(
+            pathFile, compress.ExtendSuffixes([".json", ".json5", ".ison"]), bDoRaise=True
+        )
+    # endif
+
+    # Record the import in the import graph, if the importing file is known
+    sImportFile = pathImport.as_posix()
+    sImporterFile = dicVarData.get("@loc", {}).get("filepath")
+    if sImporterFile is not None:
+        config.g_xImportGraph.AddImport(sImporterFile, sImportFile)
     # endif
 
-    if pathImport.as_posix() in g_dicImport:
-        xResult = g_dicImport.get(pathImport.as_posix())
+    if iArgCnt == 2:
+        sFpImport = pathImport.parent.as_posix()
+        if funcGetCustomVarsFromPath is not None:
+            dicCustomVars = funcGetCustomVarsFromPath(sFpImport)
+        else:
+            dicCustomVars = {}
+        # endif
+        xResultKey = (_lArgs[1], repr(sorted(dicCustomVars.items())))
     else:
+        dicCustomVars = None
+        xResultKey = None
+    # endif
+
+    xResult = config.g_xImportGraph.GetResult(sImportFile, xResultKey)
+    if xResult is None:
+        # The state of the file is obtained before loading it, so that changes
+        # made while loading are detected on the next import.
+        tFileState = config.g_xImportGraph.GetFileState(sImportFile)
         try:
             if iArgCnt == 2:
-                sFpImport = pathImport.parent.as_posix()
-                if funcGetCustomVarsFromPath is not None:
-                    dicCustomVars = funcGetCustomVarsFromPath(sFpImport)
-                else:
-                    dicCustomVars = {}
-                # endif
-
                 xResult = config.Load(
                     pathImport,
                     sDTI=_lArgs[1],
@@ -463,7 +609,7 @@ def Import(_xParser, _lArgs, _lArgIsProc, *, sFuncName, funcGetCustomVarsFromPat
                     dicCustomVars=dicCustomVars,
                 )
             else:
-                xResult = file.LoadJson(pathImport.as_posix())
+                xResult = file.LoadJson(sImportFile)
             # endif
         except Exception as xEx:
             raise CParserError_FuncMessage(
@@ -473,7 +619,13 @@ def Import(_xParser, _lArgs, _lArgIsProc, *, sFuncName, funcGetCustomVarsFromPat
             )
         # endtry
 
-        g_dicImport[pathImport.as_posix()] = xResult
+        config.g_xImportGraph.SetResult(
+            sImportFile,
+            xResultKey,
+            xResult,
+            tFileState=tFileState,
+            sDti=_lArgs[1] if iArgCnt == 2 else None,
+        )
     # endif
 
     return xResult, False
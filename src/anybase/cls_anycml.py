@@ -24,11 +24,31 @@
 # </LICENSE>
 ###
 
+from typing import Optional
+
 import ison
+import numpy as np
 from . import anycml_func_std
+from .logging import logger
 
 
 class CAnyCML(ison.Parser):
+    # Random generator used by random functions like '$dict_rnd_sel', if no seed is given.
+    # It is None, if no random seed was given to the parser, or to its parent parser.
+    xRandomGenerator: Optional[np.random.Generator]
+
+    # Function table of the standard anybase functions, shared by all parser instances.
+    # It describes the entries that registering the module 'anycml_func_std' adds to the
+    # dictionary attributes of the parser, including entries of nested dictionaries.
+    # The first instance records the table. The second instance registers the module as well
+    # and only enables the table, if it recorded the same entries, i.e. the same function set.
+    # All further instances apply the table, with per-instance copies of the entry containers.
+    # If the registration is not reproducible in this way, e.g. after a change of the ison parser,
+    # 'c_bUseFuncTable' is set to False, a warning is logged and the module is registered for each instance.
+    c_dicFuncTable: Optional[dict] = None
+    c_bFuncTableChecked: bool = False
+    c_bUseFuncTable: bool = True
+
     def __init__(
         self,
         dicConstVars={},
@@ -37,17 +57,223 @@ class CAnyCML(ison.Parser):
         dicRtVars=None,
         setRtVarsEval=None,
         xParser: "CAnyCML" = None,
+        *,
+        iRandomSeed: Optional[int] = None,
     ):
-        super().__init__(
+        self._InitParser(
             dicConstVars,
             dicRefVars=dicRefVars,
             sImportPath=sImportPath,
             dicRtVars=dicRtVars,
             setRtVarsEval=setRtVarsEval,
             xParser=xParser,
+            iRandomSeed=iRandomSeed,
+        )
+
+    # enddef
+
+    # ##################################################################################################
+    # Reset the parser to the state of a newly constructed parser with the given arguments.
+    # This allows reusing a parser in loops, without rebuilding its function table.
+    def Reset(
+        self,
+        dicConstVars={},
+        dicRefVars=None,
+        sImportPath=None,
+        dicRtVars=None,
+        setRtVarsEval=None,
+        xParser: "CAnyCML" = None,
+        *,
+        iRandomSeed: Optional[int] = None,
+    ) -> "CAnyCML":
+        self._InitParser(
+            dicConstVars,
+            dicRefVars=dicRefVars,
+            sImportPath=sImportPath,
+            dicRtVars=dicRtVars,
+            setRtVarsEval=setRtVarsEval,
+            xParser=xParser,
+            iRandomSeed=iRandomSeed,
+        )
+        return self
+
+    # enddef
+
+    # ##################################################################################################
+    def _InitParser(
+        self,
+        _dicConstVars: dict,
+        *,
+        dicRefVars,
+        sImportPath,
+        dicRtVars,
+        setRtVarsEval,
+        xParser: "CAnyCML",
+        iRandomSeed: Optional[int],
+    ):
+        ison.Parser.__init__(
+            self,
+            _dicConstVars,
+            dicRefVars=dicRefVars,
+            sImportPath=sImportPath,
+            dicRtVars=dicRtVars,
+            setRtVarsEval=setRtVarsEval,
+            xParser=xParser,
         )
 
+        if iRandomSeed is not None:
+            self.xRandomGenerator = np.random.default_rng(iRandomSeed)
+        else:
+            self.xRandomGenerator = getattr(xParser, "xRandomGenerator", None)
+        # endif
+
+        self._RegisterStdFunctions()
+
+    # enddef
+
+    # ##################################################################################################
+    def _RegisterStdFunctions(self):
+        if CAnyCML.c_bUseFuncTable is True and not hasattr(self, "__dict__"):
+            CAnyCML._DisableFuncTable("parser stores its data without instance dictionary")
+        # endif
+
+        if CAnyCML.c_bUseFuncTable is False:
+            self.RegisterFunctionModule(anycml_func_std)
+            return
+        # endif
+
+        dicFuncTable = CAnyCML.c_dicFuncTable
+        if dicFuncTable is not None and CAnyCML.c_bFuncTableChecked is True:
+            CAnyCML._ApplyEntries(vars(self), dicFuncTable)
+            return
+        # endif
+
+        # Register the module and record the entries it adds
+        dicBefore = {sAttr: CAnyCML._Snapshot(xValue, set()) for sAttr, xValue in vars(self).items()}
         self.RegisterFunctionModule(anycml_func_std)
+        dicNewTable = CAnyCML._DiffEntries(dicBefore, vars(self))
+
+        if dicNewTable is None:
+            CAnyCML._DisableFuncTable("registration of the functions modifies existing parser data in place")
+        elif dicFuncTable is None:
+            CAnyCML.c_dicFuncTable = dicNewTable
+        elif CAnyCML._IsSameEntry(dicFuncTable, dicNewTable):
+            CAnyCML.c_bFuncTableChecked = True
+        else:
+            CAnyCML._DisableFuncTable("registration of the functions differs between parser instances")
+        # endif
+
+    # enddef
+
+    # ##################################################################################################
+    @staticmethod
+    def _DisableFuncTable(_sReason: str):
+        CAnyCML.c_dicFuncTable = None
+        CAnyCML.c_bUseFuncTable = False
+        logger.warning(
+            f"Shared function table of anycml parser disabled, as the {_sReason}. "
+            f"Standard functions are registered for each parser instance (ison {getattr(ison, '__version__', '?')})."
+        )
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns a snapshot of a value as tuple (value, copy), where the copy of a dictionary
+    # contains the snapshots of its elements, and the copy of a list or set is a shallow copy.
+    @staticmethod
+    def _Snapshot(_xValue, _setVisited: set) -> tuple:
+        if isinstance(_xValue, dict) and id(_xValue) not in _setVisited:
+            _setVisited.add(id(_xValue))
+            return (_xValue, {xKey: CAnyCML._Snapshot(xEl, _setVisited) for xKey, xEl in _xValue.items()})
+        elif isinstance(_xValue, (list, set)):
+            return (_xValue, _xValue.copy())
+        # endif
+        return (_xValue, None)
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the entries that were added to or replaced in the dictionary 'dicAfter' with respect
+    # to the snapshots 'dicBefore', as dictionary of key to tuple (bNested, entry). For nested
+    # dictionaries that were changed in place, the entry contains their changed entries.
+    # Returns None, if the changes cannot be reproduced by setting entries.
+    @staticmethod
+    def _DiffEntries(_dicBefore: dict, _dicAfter: dict) -> Optional[dict]:
+        if any(xKey not in _dicAfter for xKey in _dicBefore):
+            return None
+        # endif
+
+        dicEntries = {}
+        for xKey, xValue in _dicAfter.items():
+            if xKey not in _dicBefore or _dicBefore[xKey][0] is not xValue:
+                dicEntries[xKey] = (False, xValue)
+                continue
+            # endif
+
+            xCopyBefore = _dicBefore[xKey][1]
+            if isinstance(xValue, dict) and isinstance(xCopyBefore, dict):
+                dicNested = CAnyCML._DiffEntries(xCopyBefore, xValue)
+                if dicNested is None:
+                    return None
+                elif len(dicNested) > 0:
+                    dicEntries[xKey] = (True, dicNested)
+                # endif
+            elif isinstance(xValue, (list, set)) and xCopyBefore != xValue:
+                # Changed in place
+                return None
+            # endif
+        # endfor
+
+        return dicEntries
+
+    # enddef
+
+    # ##################################################################################################
+    @staticmethod
+    def _ApplyEntries(_dicTarget: dict, _dicEntries: dict):
+        for xKey, (bNested, xEntry) in _dicEntries.items():
+            if bNested is True:
+                CAnyCML._ApplyEntries(_dicTarget[xKey], xEntry)
+            else:
+                _dicTarget[xKey] = CAnyCML._CopyEntry(xEntry)
+            # endif
+        # endfor
+
+    # enddef
+
+    # ##################################################################################################
+    # Copy the containers of an entry, so that parser instances do not share them.
+    # Functions and other objects are shared.
+    @staticmethod
+    def _CopyEntry(_xEntry):
+        if isinstance(_xEntry, dict):
+            return {xKey: CAnyCML._CopyEntry(xEl) for xKey, xEl in _xEntry.items()}
+        elif isinstance(_xEntry, list):
+            return [CAnyCML._CopyEntry(xEl) for xEl in _xEntry]
+        elif isinstance(_xEntry, set):
+            return _xEntry.copy()
+        # endif
+        return _xEntry
+
+    # enddef
+
+    # ##################################################################################################
+    # Test whether two recorded entries are the same. Containers are compared by their elements,
+    # scalars by value, and all other objects, like functions, by identity.
+    @staticmethod
+    def _IsSameEntry(_xA, _xB) -> bool:
+        if isinstance(_xA, dict) and isinstance(_xB, dict):
+            return _xA.keys() == _xB.keys() and all(CAnyCML._IsSameEntry(_xA[xKey], _xB[xKey]) for xKey in _xA)
+        elif isinstance(_xA, (list, tuple)) and isinstance(_xB, (list, tuple)):
+            return (
+                type(_xA) is type(_xB)
+                and len(_xA) == len(_xB)
+                and all(CAnyCML._IsSameEntry(xA, xB) for xA, xB in zip(_xA, _xB))
+            )
+        elif isinstance(_xA, (str, bytes, int, float, frozenset, set, type(None))):
+            return type(_xA) is type(_xB) and _xA == _xB
+        # endif
+        return _xA is _xB
 
     # enddef
 
@@ -31,6 +31,8 @@ from pathlib import Path
 from . import path
 from . import config
 from .cls_any_error import CAnyError_Message
+from .cls_config_view import CConfigView
+from .cls_frozen_config import CFrozenDict
 
 
 # Configuration base class, supporting sDTI and sId tags.
@@ -122,7 +124,13 @@ class CConfigBase:
 
     def FromDict(self, _dicData: dict):
         config.AssertConfigType(_dicData, self._sDti)
-        self._dicCfg = copy.deepcopy(_dicData)
+        if isinstance(_dicData, CFrozenDict):
+            # Frozen data cannot change, so a copy-on-write view suffices,
+            # which only copies the branches that are accessed
+            self._dicCfg = CConfigView(_dicData)
+        else:
+            self._dicCfg = copy.deepcopy(_dicData)
+        # endif
         self._Init()
 
     # enddef FromDict()
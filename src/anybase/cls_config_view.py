@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+from typing import Any, Optional
+
+_g_xNoValue = object()
+
+
+####################################################################################
+# Copy a value of the base data, so that changes do not propagate to the base data.
+# Dictionaries and lists are copied regardless of their type, including frozen data and views,
+# so that a view of another view does not share mutable elements with it.
+def _Wrap(_xValue: Any) -> Any:
+    if isinstance(_xValue, dict):
+        return CConfigView(_xValue)
+    elif isinstance(_xValue, list):
+        return CConfigListView(_xValue)
+    # endif
+    return _xValue
+
+
+# enddef
+
+
+####################################################################################
+# Returns the plain data of a wrapped value
+def _Unwrap(_xValue: Any) -> Any:
+    if isinstance(_xValue, CConfigView):
+        return _xValue.ToDict()
+    elif isinstance(_xValue, CConfigListView):
+        return _xValue.ToList()
+    # endif
+    return _xValue
+
+
+# enddef
+
+
+####################################################################################
+# Copy-on-write view of a configuration dictionary.
+# The view starts as a shallow copy of the base dictionary, sharing all nested elements
+# with it. Nested dictionaries and lists are copied only one level at a time, when they are
+# accessed via the mapping methods, so that changes to the view never modify the base data,
+# and only the accessed branches are copied. Untouched branches stay shared with the base.
+# The view keeps track of the keys whose values it owns, i.e. the copied branches and the
+# values assigned to the view. All other values belong to the base data.
+#
+# The view is a dictionary, so it can be used wherever a configuration dictionary is
+# expected and it is serialized by all JSON backends as it is.
+# Note that functions which read the dictionary storage directly, like dict(view) or
+# '**view', return the shared nested elements of the base, which must not be modified.
+# The base data must not be modified while views of it are in use, which is guaranteed
+# for frozen configuration data.
+class CConfigView(dict):
+    __slots__ = ("_setOwnedKeys",)
+
+    def __init__(self, _dicBase: Optional[dict] = None):
+        if _dicBase is None:
+            super().__init__()
+        else:
+            super().__init__(_dicBase)
+        # endif
+        self._setOwnedKeys: set = set()
+
+    # enddef
+
+    # Returns the value of the key, after copying it if it belongs to the base data
+    def _GetOwned(self, _xKey: Any, _xValue: Any) -> Any:
+        if _xKey in self._setOwnedKeys:
+            return _xValue
+        # endif
+        xWrapped = _Wrap(_xValue)
+        if xWrapped is not _xValue:
+            dict.__setitem__(self, _xKey, xWrapped)
+        # endif
+        self._setOwnedKeys.add(_xKey)
+        return xWrapped
+
+    # enddef
+
+    def __getitem__(self, _xKey: Any) -> Any:
+        return self._GetOwned(_xKey, dict.__getitem__(self, _xKey))
+
+    # enddef
+
+    def __setitem__(self, _xKey: Any, _xValue: Any):
+        dict.__setitem__(self, _xKey, _xValue)
+        self._setOwnedKeys.add(_xKey)
+
+    # enddef
+
+    def __delitem__(self, _xKey: Any):
+        dict.__delitem__(self, _xKey)
+        self._setOwnedKeys.discard(_xKey)
+
+    # enddef
+
+    def get(self, _xKey: Any, _xDefault: Any = None) -> Any:
+        xValue = dict.get(self, _xKey, _g_xNoValue)
+        if xValue is _g_xNoValue:
+            return _xDefault
+        # endif
+        return self._GetOwned(_xKey, xValue)
+
+    # enddef
+
+    def setdefault(self, _xKey: Any, _xDefault: Any = None) -> Any:
+        if _xKey in self:
+            return self[_xKey]
+        # endif
+        self[_xKey] = _xDefault
+        return _xDefault
+
+    # enddef
+
+    def update(self, *_tArgs, **_dicArgs):
+        for xKey, xValue in dict(*_tArgs, **_dicArgs).items():
+            self[xKey] = xValue
+        # endfor
+
+    # enddef
+
+    def __ior__(self, _xOther: Any) -> "CConfigView":
+        self.update(_xOther)
+        return self
+
+    # enddef
+
+    def pop(self, _xKey: Any, *_tDefault) -> Any:
+        if len(_tDefault) > 1:
+            raise TypeError("pop expected at most 2 arguments, got {}".format(1 + len(_tDefault)))
+        # endif
+        if _xKey not in self:
+            if len(_tDefault) == 0:
+                raise KeyError(_xKey)
+            # endif
+            return _tDefault[0]
+        # endif
+        xValue = self[_xKey]
+        dict.__delitem__(self, _xKey)
+        self._setOwnedKeys.discard(_xKey)
+        return xValue
+
+    # enddef
+
+    def popitem(self) -> tuple:
+        xKey, xValue = dict.popitem(self)
+        xValue = self._GetOwned(xKey, xValue)
+        self._setOwnedKeys.discard(xKey)
+        return xKey, xValue
+
+    # enddef
+
+    def clear(self):
+        dict.clear(self)
+        self._setOwnedKeys.clear()
+
+    # enddef
+
+    # Copy all values of the base data, so that the values returned by values() and items()
+    # are owned by the view
+    def _WrapAll(self):
+        for xKey, xValue in list(dict.items(self)):
+            self._GetOwned(xKey, xValue)
+        # endfor
+
+    # enddef
+
+    def values(self):
+        self._WrapAll()
+        return dict.values(self)
+
+    # enddef
+
+    def items(self):
+        self._WrapAll()
+        return dict.items(self)
+
+    # enddef
+
+    # A copy is a view of this view, so that it does not share any mutable elements with it
+    def copy(self) -> "CConfigView":
+        return CConfigView(self)
+
+    # enddef
+
+    def __copy__(self) -> "CConfigView":
+        return CConfigView(self)
+
+    # enddef
+
+    def __reduce__(self):
+        return (CConfigView, (dict(self),))
+
+    # enddef
+
+    def __repr__(self) -> str:
+        return "CConfigView({})".format(dict.__repr__(self))
+
+    # enddef
+
+    # Returns a plain dictionary. Branches that have not been accessed are shared with the base data.
+    def ToDict(self) -> dict:
+        return {xKey: _Unwrap(xValue) for xKey, xValue in dict.items(self)}
+
+    # enddef
+
+
+# endclass
+
+
+####################################################################################
+# Copy of a list of the base data, whose nested dictionaries and lists are views.
+# All elements are owned by the list.
+class CConfigListView(list):
+    __slots__ = ()
+
+    def __init__(self, _lBase: Optional[list] = None):
+        if _lBase is None:
+            super().__init__()
+        else:
+            super().__init__(_Wrap(xValue) for xValue in _lBase)
+        # endif
+
+    # enddef
+
+    def copy(self) -> "CConfigListView":
+        return CConfigListView(self)
+
+    # enddef
+
+    def __copy__(self) -> "CConfigListView":
+        return CConfigListView(self)
+
+    # enddef
+
+    # Returns a plain list. Branches that have not been accessed are shared with the base data.
+    def ToList(self) -> list:
+        return [_Unwrap(xValue) for xValue in self]
+
+    # enddef
+
+
+# endclass
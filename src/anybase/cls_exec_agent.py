@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+import os
+import stat
+import socket
+import threading
+from typing import Optional, Union
+
+from .cls_exec_env import CExecEnv
+from .cls_exec_backend import CExecBackend, CExecProcess
+from .cls_exec_backend_local import CExecBackendLocal
+from .exec_socket import TAddress, CreateServerSocket, SendFrame, RecvFrame, ProvideSecret, AuthenticateClient
+
+
+#################################################################################################################
+# Jobs and output streams of a single client connection
+class _CAgentConnection:
+    def __init__(
+        self,
+        _xSocket: socket.socket,
+        _xBackend: CExecBackend,
+        _bTerminateOnDisconnect: bool,
+        _bytSecret: bytes,
+        _fAuthTimeout_s: float,
+    ):
+        self._xSocket: socket.socket = _xSocket
+        self._bytSecret: bytes = _bytSecret
+        self._fAuthTimeout_s: float = _fAuthTimeout_s
+        self._xBackend: CExecBackend = _xBackend
+        self._bTerminateOnDisconnect: bool = _bTerminateOnDisconnect
+        self._lockSend: threading.Lock = threading.Lock()
+        self._lockJobs: threading.Lock = threading.Lock()
+        self._dicJobs: dict[int, CExecProcess] = dict()
+
+    # enddef
+
+    def _Send(self, _dicHeader: dict, _bytPayload: bytes = b""):
+        try:
+            with self._lockSend:
+                SendFrame(self._xSocket, _dicHeader, _bytPayload)
+            # endwith
+        except OSError:
+            # Connection lost. This is handled by the receive loop.
+            pass
+        # endtry
+
+    # enddef
+
+    # ##################################################################################################
+    def _Authenticate(self) -> bool:
+        try:
+            self._xSocket.settimeout(self._fAuthTimeout_s)
+            bIsValid = AuthenticateClient(self._xSocket, self._bytSecret)
+            self._xSocket.settimeout(None)
+        except OSError:
+            bIsValid = False
+        # endtry
+        return bIsValid
+
+    # enddef
+
+    # ##################################################################################################
+    def Run(self):
+        if self._Authenticate() is False:
+            self._xSocket.close()
+            return
+        # endif
+
+        try:
+            while True:
+                try:
+                    tFrame = RecvFrame(self._xSocket)
+                except OSError:
+                    tFrame = None
+                # endtry
+                if tFrame is None:
+                    break
+                # endif
+
+                dicHeader, bytPayload = tFrame
+                sOp = dicHeader.get("sOp")
+                if sOp == "start":
+                    self._StartJob(dicHeader)
+                elif sOp == "terminate":
+                    self._TerminateJob(dicHeader)
+                else:
+                    self._Send({"sOp": "error", "iJobId": dicHeader.get("iJobId"), "sMsg": f"Unknown operation: {sOp}"})
+                # endif
+            # endwhile
+        finally:
+            if self._bTerminateOnDisconnect is True:
+                with self._lockJobs:
+                    lProcs = list(self._dicJobs.values())
+                # endwith
+                for xProc in lProcs:
+                    xProc.Terminate()
+                # endfor
+            # endif
+            self._xSocket.close()
+        # endtry
+
+    # enddef
+
+    # ##################################################################################################
+    def _StartJob(self, _dicHeader: dict):
+        iJobId: int = _dicHeader.get("iJobId")
+
+        xEnv = None
+        dicEnv: dict = _dicHeader.get("dicEnv")
+        if dicEnv is not None:
+            if _dicHeader.get("bInheritEnv", True) is True:
+                xEnv = dicEnv
+            else:
+                xEnv = CExecEnv(dicEnv, _bInheritOsEnv=False)
+            # endif
+        # endif
+
+        try:
+            xProc = self._xBackend.Start(
+                xCmd=_dicHeader.get("xCmd"),
+                sCwd=_dicHeader.get("sCwd"),
+                xEnv=xEnv,
+                bShell=_dicHeader.get("bShell", False),
+                bReadChunks=_dicHeader.get("bReadChunks", False),
+                iChunkSize=_dicHeader.get("iChunkSize", 65536),
+                bNewProcessGroup=_dicHeader.get("bNewProcessGroup", False),
+            )
+        except Exception as xEx:
+            self._Send({"sOp": "error", "iJobId": iJobId, "sMsg": f"Error starting process: {xEx}"})
+            return
+        # endtry
+
+        with self._lockJobs:
+            self._dicJobs[iJobId] = xProc
+        # endwith
+
+        self._Send({"sOp": "started", "iJobId": iJobId, "iPid": xProc.iPid})
+
+        threadPump = threading.Thread(target=self._PumpOutput, args=(iJobId, xProc), daemon=True)
+        threadPump.start()
+
+    # enddef
+
+    # ##################################################################################################
+    def _TerminateJob(self, _dicHeader: dict):
+        iJobId: int = _dicHeader.get("iJobId")
+        with self._lockJobs:
+            xProc: CExecProcess = self._dicJobs.get(iJobId)
+        # endwith
+
+        if xProc is not None:
+            fGraceTime_s: float = _dicHeader.get("fGraceTime_s", 5.0)
+            threading.Thread(target=xProc.Terminate, kwargs={"_fGraceTime_s": fGraceTime_s}, daemon=True).start()
+        # endif
+
+    # enddef
+
+    # ##################################################################################################
+    def _SendOutput(self, _iJobId: int, _xOutput):
+        if isinstance(_xOutput, str):
+            self._Send({"sOp": "output", "iJobId": _iJobId, "bText": True}, _xOutput.encode("utf-8"))
+        else:
+            self._Send({"sOp": "output", "iJobId": _iJobId, "bText": False}, _xOutput)
+        # endif
+
+    # enddef
+
+    def _PumpOutput(self, _iJobId: int, _xProc: CExecProcess):
+        while True:
+            xOutput = _xProc.GetOutput(_fTimeout_s=0.05)
+            if xOutput is not None:
+                self._SendOutput(_iJobId, xOutput)
+                continue
+            # endif
+
+            if _xProc.WaitOutputEnded(0.0) is True:
+                break
+            # endif
+
+            if _xProc.Wait(0.0) is not None:
+                # Output pipe may be held open by a detached child process
+                _xProc.WaitOutputEnded(1.0)
+                break
+            # endif
+        # endwhile
+
+        while True:
+            xOutput = _xProc.GetOutput()
+            if xOutput is None:
+                break
+            # endif
+            self._SendOutput(_iJobId, xOutput)
+        # endwhile
+
+        iReturnCode = _xProc.Wait()
+
+        with self._lockJobs:
+            self._dicJobs.pop(_iJobId, None)
+        # endwith
+
+        self._Send({"sOp": "exit", "iJobId": _iJobId, "iReturnCode": iReturnCode})
+
+    # enddef
+
+
+# endclass
+
+
+#################################################################################################################
+# Execution agent that runs jobs on the local host on behalf of a 'CExecBackendSocket' client.
+# The agent listens on a Unix domain socket (path) or a TCP socket ((host, port) tuple, or port on localhost).
+# Clients must prove knowledge of the shared secret before any job is started.
+# Note that the agent executes arbitrary commands and should only be reachable from trusted hosts.
+class CExecAgent:
+    def __init__(
+        self,
+        _xAddress: TAddress,
+        *,
+        _xSecret: Union[str, bytes],
+        _xBackend: Optional[CExecBackend] = None,
+        _bTerminateOnDisconnect: bool = True,
+        _fAuthTimeout_s: float = 10.0,
+    ):
+        self._xAddress: TAddress = _xAddress
+        self._bytSecret: bytes = ProvideSecret(_xSecret)
+        self._fAuthTimeout_s: float = _fAuthTimeout_s
+        self._xBackend: CExecBackend = _xBackend if _xBackend is not None else CExecBackendLocal()
+        self._bTerminateOnDisconnect: bool = _bTerminateOnDisconnect
+        self._xSocket: Optional[socket.socket] = None
+        self._threadAccept: Optional[threading.Thread] = None
+        self._evStop: threading.Event = threading.Event()
+
+    # enddef
+
+    # ##################################################################################################
+    # The address the agent is bound to. For TCP with port 0, this contains the actual port.
+    @property
+    def xAddress(self) -> TAddress:
+        if self._xSocket is not None and not isinstance(self._xAddress, str):
+            return self._xSocket.getsockname()[0:2]
+        # endif
+        return self._xAddress
+
+    # enddef
+
+    # ##################################################################################################
+    def Start(self):
+        if self._xSocket is not None:
+            raise RuntimeError("Execution agent already started")
+        # endif
+
+        self._evStop.clear()
+        self._xSocket = CreateServerSocket(self._xAddress)
+        self._threadAccept = threading.Thread(target=self._AcceptLoop, daemon=True)
+        self._threadAccept.start()
+
+    # enddef
+
+    # ##################################################################################################
+    def ServeForever(self):
+        self.Start()
+        try:
+            while self._threadAccept.is_alive():
+                self._threadAccept.join(0.5)
+            # endwhile
+        finally:
+            self.Stop()
+        # endtry
+
+    # enddef
+
+    # ##################################################################################################
+    def Stop(self):
+        if self._xSocket is None:
+            return
+        # endif
+
+        self._evStop.set()
+        try:
+            self._xSocket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        # endtry
+        self._xSocket.close()
+        self._xSocket = None
+
+        if isinstance(self._xAddress, str):
+            try:
+                if stat.S_ISSOCK(os.lstat(self._xAddress).st_mode):
+                    os.remove(self._xAddress)
+                # endif
+            except FileNotFoundError:
+                pass
+            # endtry
+        # endif
+
+    # enddef
+
+    # ##################################################################################################
+    def _AcceptLoop(self):
+        xSocket = self._xSocket
+        while not self._evStop.is_set():
+            try:
+                xConnSocket, xAddr = xSocket.accept()
+            except OSError:
+                break
+            # endtry
+
+            xConn = _CAgentConnection(
+                xConnSocket, self._xBackend, self._bTerminateOnDisconnect, self._bytSecret, self._fAuthTimeout_s
+            )
+            threading.Thread(target=xConn.Run, daemon=True).start()
+        # endwhile
+
+    # enddef
+
+
+# endclass
+
+
+#################################################################################################################
+if __name__ == "__main__":
+    import argparse
+
+    xParser = argparse.ArgumentParser(description="Execution agent for anybase.shell jobs")
+    xParser.add_argument("--socket", dest="sSocket", default=None, help="Path of Unix domain socket")
+    xParser.add_argument("--host", dest="sHost", default="127.0.0.1", help="Host for TCP socket")
+    xParser.add_argument("--port", dest="iPort", type=int, default=None, help="Port for TCP socket")
+    xParser.add_argument(
+        "--secret-file",
+        dest="sSecretFile",
+        default=None,
+        help="File containing the shared secret. Defaults to the environment variable ANYBASE_EXEC_AGENT_SECRET.",
+    )
+    xArgs = xParser.parse_args()
+
+    if xArgs.sSecretFile is not None:
+        with open(xArgs.sSecretFile, "r", encoding="utf-8") as xFile:
+            sSecret = xFile.read().strip()
+        # endwith
+    else:
+        sSecret = os.environ.get("ANYBASE_EXEC_AGENT_SECRET", "")
+    # endif
+    if len(sSecret) == 0:
+        xParser.error("A shared secret must be given via --secret-file or ANYBASE_EXEC_AGENT_SECRET")
+    # endif
+
+    if xArgs.sSocket is not None:
+        xAddress = xArgs.sSocket
+    elif xArgs.iPort is not None:
+        xAddress = (xArgs.sHost, xArgs.iPort)
+    else:
+        xParser.error("Either --socket or --port must be given")
+    # endif
+
+    CExecAgent(xAddress, _xSecret=sSecret).ServeForever()
+# endif
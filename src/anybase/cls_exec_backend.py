@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+from typing import Optional, Union
+
+from .cls_exec_env import CExecEnv
+
+
+# Handle of a process started by an execution backend.
+# Output is either passed on as lines (str) or, in chunked read mode, as raw chunks (bytes).
+class CExecProcess:
+    @property
+    def iPid(self) -> int:
+        raise NotImplementedError()
+
+    # enddef
+
+    # Returns the next output element, or None if no output is available within the given time.
+    def GetOutput(self, *, _fTimeout_s: float = 0.0) -> Optional[Union[str, bytes]]:
+        raise NotImplementedError()
+
+    # enddef
+
+    # Waits until the output stream of the process has ended. Returns True if it has ended.
+    def WaitOutputEnded(self, _fTimeout_s: Optional[float] = None) -> bool:
+        raise NotImplementedError()
+
+    # enddef
+
+    # Waits for the process to end. Returns the exit code or None, if the process is still running.
+    def Wait(self, _fTimeout_s: Optional[float] = None) -> Optional[int]:
+        raise NotImplementedError()
+
+    # enddef
+
+    # Terminates the process together with all of its child processes
+    def Terminate(self, *, _fGraceTime_s: float = 5.0):
+        raise NotImplementedError()
+
+    # enddef
+
+
+# endclass
+
+
+# Execution backend interface used by the functions in 'anybase.shell'
+class CExecBackend:
+    # Identifies the host the processes are run on. Process ids are only meaningful on this host.
+    # Processes of the local host are identified by 'local'.
+    @property
+    def sHost(self) -> str:
+        raise NotImplementedError()
+
+    # enddef
+
+    def Start(
+        self,
+        *,
+        xCmd: Union[str, list],
+        sCwd: Optional[str],
+        xEnv: Optional[Union[dict, CExecEnv]],
+        bShell: bool,
+        bReadChunks: bool = False,
+        iChunkSize: int = 65536,
+        bNewProcessGroup: bool = False,
+    ) -> CExecProcess:
+        raise NotImplementedError()
+
+    # enddef
+
+
+# endclass
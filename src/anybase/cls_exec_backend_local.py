@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import os
+import queue
+import signal
+import threading
+import subprocess
+from typing import IO, Optional, Union
+
+import psutil
+
+from .cls_exec_env import CExecEnv, ProvideEnviron
+from .cls_exec_backend import CExecBackend, CExecProcess
+
+
+#################################################################################################################
+def _ReadPipeToQueue(_xPipe: IO[str], _qLines: queue.Queue):
+    for sLine in iter(_xPipe.readline, ""):
+        _qLines.put(sLine)
+    # endfor
+    _xPipe.close()
+
+    # # print(">> READ PIPE TO QUEUE ENDED")
+
+
+# enddef
+
+
+#################################################################################################################
+def _ReadPipeChunksToQueue(_xPipe: IO[bytes], _qChunks: queue.Queue, _iChunkSize: int):
+    # read1() returns whatever is available up to the chunk size,
+    # so output is passed on without waiting for a newline.
+    while True:
+        bytChunk = _xPipe.read1(_iChunkSize)
+        if len(bytChunk) == 0:
+            break
+        # endif
+        _qChunks.put(bytChunk)
+    # endwhile
+    _xPipe.close()
+
+
+# enddef
+
+
+#################################################################################################################
+def _TerminateProcTree(_procChild: subprocess.Popen, *, _fGraceTime_s: float = 5.0, _bIsGroupLeader: bool = False):
+    """Terminate a child process together with all of its descendants.
+
+    First sends SIGTERM (terminate) to the whole process tree, waits up to
+    '_fGraceTime_s' seconds and then kills all processes that are still alive.
+    """
+    lProcs = []
+    try:
+        # Collect descendants before terminating the root,
+        # as they are re-parented once the root has ended.
+        lProcs = psutil.Process(_procChild.pid).children(recursive=True)
+    except psutil.NoSuchProcess:
+        pass
+    # endtry
+
+    # The root process is signalled and reaped via its Popen object, so that
+    # its return code is kept and reported by Popen.wait().
+    _procChild.terminate()
+    for procX in lProcs:
+        try:
+            procX.terminate()
+        except psutil.NoSuchProcess:
+            pass
+        # endtry
+    # endfor
+
+    lGone, lAlive = psutil.wait_procs(lProcs, timeout=_fGraceTime_s)
+    try:
+        _procChild.wait(timeout=_fGraceTime_s)
+    except subprocess.TimeoutExpired:
+        _procChild.kill()
+    # endtry
+
+    for procX in lAlive:
+        try:
+            procX.kill()
+        except psutil.NoSuchProcess:
+            pass
+        # endtry
+    # endfor
+    if len(lAlive) > 0:
+        psutil.wait_procs(lAlive, timeout=_fGraceTime_s)
+    # endif
+
+    # Make sure that no stray process of the group survives
+    if _bIsGroupLeader is True and os.name == "posix":
+        try:
+            os.killpg(_procChild.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        # endtry
+    # endif
+
+
+# enddef
+
+
+#################################################################################################################
+# Process started as local subprocess
+class CExecProcessLocal(CExecProcess):
+    def __init__(
+        self,
+        *,
+        xCmd: Union[str, list],
+        sCwd: Optional[str],
+        xEnv: Optional[Union[dict, CExecEnv]],
+        bShell: bool,
+        bReadChunks: bool = False,
+        iChunkSize: int = 65536,
+        bNewProcessGroup: bool = False,
+    ):
+        self._qOutput: queue.Queue = queue.Queue()
+
+        # Starting a new session makes the child the leader of a new process group,
+        # so that the whole group can be signalled on termination.
+        self._bIsGroupLeader: bool = bNewProcessGroup is True and os.name == "posix"
+
+        self._procChild = subprocess.Popen(
+            xCmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            shell=bShell,
+            cwd=sCwd,
+            universal_newlines=not bReadChunks,
+            env=ProvideEnviron(xEnv),
+            start_new_session=self._bIsGroupLeader,
+        )
+
+        if bReadChunks is True:
+            self._threadRead = threading.Thread(
+                target=_ReadPipeChunksToQueue, args=(self._procChild.stdout, self._qOutput, iChunkSize), daemon=True
+            )
+        else:
+            self._threadRead = threading.Thread(
+                target=_ReadPipeToQueue, args=(self._procChild.stdout, self._qOutput), daemon=True
+            )
+        # endif
+        self._threadRead.start()
+
+    # enddef
+
+    @property
+    def iPid(self) -> int:
+        return self._procChild.pid
+
+    # enddef
+
+    def GetOutput(self, *, _fTimeout_s: float = 0.0) -> Optional[Union[str, bytes]]:
+        try:
+            if _fTimeout_s > 0.0:
+                return self._qOutput.get(timeout=_fTimeout_s)
+            else:
+                return self._qOutput.get_nowait()
+            # endif
+        except queue.Empty:
+            return None
+        # endtry
+
+    # enddef
+
+    def WaitOutputEnded(self, _fTimeout_s: Optional[float] = None) -> bool:
+        self._threadRead.join(_fTimeout_s)
+        return not self._threadRead.is_alive()
+
+    # enddef
+
+    def Wait(self, _fTimeout_s: Optional[float] = None) -> Optional[int]:
+        try:
+            return self._procChild.wait(timeout=_fTimeout_s)
+        except subprocess.TimeoutExpired:
+            return None
+        # endtry
+
+    # enddef
+
+    def Terminate(self, *, _fGraceTime_s: float = 5.0):
+        _TerminateProcTree(self._procChild, _fGraceTime_s=_fGraceTime_s, _bIsGroupLeader=self._bIsGroupLeader)
+
+    # enddef
+
+
+# endclass
+
+
+#################################################################################################################
+# Execution backend that starts processes as local subprocesses
+class CExecBackendLocal(CExecBackend):
+    @property
+    def sHost(self) -> str:
+        return "local"
+
+    # enddef
+
+    def Start(
+        self,
+        *,
+        xCmd: Union[str, list],
+        sCwd: Optional[str],
+        xEnv: Optional[Union[dict, CExecEnv]],
+        bShell: bool,
+        bReadChunks: bool = False,
+        iChunkSize: int = 65536,
+        bNewProcessGroup: bool = False,
+    ) -> CExecProcess:
+        return CExecProcessLocal(
+            xCmd=xCmd,
+            sCwd=sCwd,
+            xEnv=xEnv,
+            bShell=bShell,
+            bReadChunks=bReadChunks,
+            iChunkSize=iChunkSize,
+            bNewProcessGroup=bNewProcessGroup,
+        )
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+import queue
+import socket
+import threading
+from typing import Optional, Union
+
+from .cls_any_error import CAnyError_Message
+from .cls_exec_env import CExecEnv
+from .cls_exec_backend import CExecBackend, CExecProcess
+from .exec_socket import TAddress, CreateClientSocket, SendFrame, RecvFrame, ProvideSecret, AuthenticateAgent
+
+
+#################################################################################################################
+# Process executed by a remote execution agent
+class CExecProcessSocket(CExecProcess):
+    def __init__(self, _xBackend: "CExecBackendSocket", _iJobId: int):
+        self._xBackend: "CExecBackendSocket" = _xBackend
+        self._iJobId: int = _iJobId
+        self._iPid: int = None
+        self._iReturnCode: int = None
+        self._sError: str = None
+        self._qOutput: queue.Queue = queue.Queue()
+        self._evStarted: threading.Event = threading.Event()
+        self._evEnded: threading.Event = threading.Event()
+
+    # enddef
+
+    @property
+    def iJobId(self) -> int:
+        return self._iJobId
+
+    # enddef
+
+    @property
+    def iPid(self) -> int:
+        return self._iPid
+
+    # enddef
+
+    @property
+    def sError(self) -> str:
+        return self._sError
+
+    # enddef
+
+    def GetOutput(self, *, _fTimeout_s: float = 0.0) -> Optional[Union[str, bytes]]:
+        try:
+            if _fTimeout_s > 0.0:
+                return self._qOutput.get(timeout=_fTimeout_s)
+            else:
+                return self._qOutput.get_nowait()
+            # endif
+        except queue.Empty:
+            return None
+        # endtry
+
+    # enddef
+
+    # The agent sends all output before the exit status, so the output has ended with the process
+    def WaitOutputEnded(self, _fTimeout_s: Optional[float] = None) -> bool:
+        return self._evEnded.wait(_fTimeout_s)
+
+    # enddef
+
+    def Wait(self, _fTimeout_s: Optional[float] = None) -> Optional[int]:
+        if self._evEnded.wait(_fTimeout_s) is False:
+            return None
+        # endif
+        return self._iReturnCode
+
+    # enddef
+
+    def Terminate(self, *, _fGraceTime_s: float = 5.0):
+        if self._evEnded.is_set():
+            return
+        # endif
+
+        self._xBackend._Send({"sOp": "terminate", "iJobId": self._iJobId, "fGraceTime_s": _fGraceTime_s})
+        # The agent first terminates and then kills the process tree
+        self._evEnded.wait(2.0 * _fGraceTime_s + 1.0)
+
+    # enddef
+
+    # ##################################################################################################
+    def _OnStarted(self, _iPid: int):
+        self._iPid = _iPid
+        self._evStarted.set()
+
+    # enddef
+
+    def _OnOutput(self, _xOutput: Union[str, bytes]):
+        self._qOutput.put(_xOutput)
+
+    # enddef
+
+    def _OnEnded(self, _iReturnCode: int, _sError: Optional[str] = None):
+        if self._evEnded.is_set():
+            return
+        # endif
+        self._iReturnCode = _iReturnCode
+        if _sError is not None:
+            self._sError = _sError
+            self._qOutput.put(_sError + "\n")
+        # endif
+        self._evEnded.set()
+        self._evStarted.set()
+
+    # enddef
+
+
+# endclass
+
+
+#################################################################################################################
+# Execution backend that runs processes via a 'CExecAgent' listening on a Unix domain socket or TCP socket.
+# All jobs started through one backend instance share a single connection.
+# Environment dictionaries are applied on top of the environment of the agent,
+# whereas a CExecEnv instance is passed on as complete environment.
+# The secret must be the same as the one the agent has been started with.
+class CExecBackendSocket(CExecBackend):
+    def __init__(self, _xAddress: TAddress, *, _xSecret: Union[str, bytes], _fTimeout_s: float = 10.0):
+        self._xAddress: TAddress = _xAddress
+        self._bytSecret: bytes = ProvideSecret(_xSecret)
+        self._fTimeout_s: float = _fTimeout_s
+        self._xSocket: Optional[socket.socket] = None
+        self._threadRecv: Optional[threading.Thread] = None
+        self._lockSend: threading.Lock = threading.Lock()
+        self._lockConnect: threading.Lock = threading.Lock()
+        self._lockJobs: threading.Lock = threading.Lock()
+        self._dicJobs: dict[int, CExecProcessSocket] = dict()
+        self._iNextJobId: int = 0
+
+    # enddef
+
+    @property
+    def xAddress(self) -> TAddress:
+        return self._xAddress
+
+    # enddef
+
+    @property
+    def sHost(self) -> str:
+        return f"socket:{self._xAddress}"
+
+    # enddef
+
+    @property
+    def bIsConnected(self) -> bool:
+        return self._xSocket is not None
+
+    # enddef
+
+    # ##################################################################################################
+    def Connect(self):
+        with self._lockConnect:
+            if self._xSocket is not None:
+                return
+            # endif
+
+            xSocket = CreateClientSocket(self._xAddress, _fTimeout_s=self._fTimeout_s)
+            try:
+                xSocket.settimeout(self._fTimeout_s)
+                AuthenticateAgent(xSocket, self._bytSecret)
+                xSocket.settimeout(None)
+            except BaseException as xEx:
+                xSocket.close()
+                if isinstance(xEx, OSError):
+                    raise CAnyError_Message(
+                        sMsg=f"Error authenticating with execution agent '{self._xAddress}'", xChildEx=xEx
+                    )
+                # endif
+                raise
+            # endtry
+
+            self._xSocket = xSocket
+            self._threadRecv = threading.Thread(target=self._ReceiveLoop, args=(self._xSocket,), daemon=True)
+            self._threadRecv.start()
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    def Close(self):
+        with self._lockConnect:
+            xSocket = self._xSocket
+            self._xSocket = None
+        # endwith
+
+        if xSocket is not None:
+            try:
+                xSocket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            # endtry
+            xSocket.close()
+        # endif
+
+    # enddef
+
+    # ##################################################################################################
+    def Start(
+        self,
+        *,
+        xCmd: Union[str, list],
+        sCwd: Optional[str],
+        xEnv: Optional[Union[dict, CExecEnv]],
+        bShell: bool,
+        bReadChunks: bool = False,
+        iChunkSize: int = 65536,
+        bNewProcessGroup: bool = False,
+    ) -> CExecProcess:
+        self.Connect()
+
+        with self._lockJobs:
+            iJobId = self._iNextJobId
+            self._iNextJobId += 1
+            xProc = CExecProcessSocket(self, iJobId)
+            self._dicJobs[iJobId] = xProc
+        # endwith
+
+        dicHeader = {
+            "sOp": "start",
+            "iJobId": iJobId,
+            "xCmd": xCmd,
+            "sCwd": sCwd,
+            "bShell": bShell,
+            "bReadChunks": bReadChunks,
+            "iChunkSize": iChunkSize,
+            "bNewProcessGroup": bNewProcessGroup,
+        }
+        if isinstance(xEnv, CExecEnv):
+            dicHeader["dicEnv"] = xEnv.ToDict()
+            dicHeader["bInheritEnv"] = False
+        elif xEnv is not None:
+            dicHeader["dicEnv"] = dict(xEnv)
+            dicHeader["bInheritEnv"] = True
+        # endif
+
+        self._Send(dicHeader)
+
+        if xProc._evStarted.wait(self._fTimeout_s) is False:
+            # Do not wait for the process to end. Should it still be started,
+            # the agent processes the terminate request after the start request.
+            with self._lockJobs:
+                self._dicJobs.pop(iJobId, None)
+            # endwith
+            try:
+                self._Send({"sOp": "terminate", "iJobId": iJobId, "fGraceTime_s": 5.0})
+            except CAnyError_Message:
+                pass
+            # endtry
+            raise CAnyError_Message(sMsg=f"Timeout starting process at execution agent '{self._xAddress}'")
+        # endif
+
+        if xProc.iPid is None:
+            with self._lockJobs:
+                self._dicJobs.pop(iJobId, None)
+            # endwith
+            raise CAnyError_Message(
+                sMsg=f"Error starting process at execution agent '{self._xAddress}': {xProc.sError}"
+            )
+        # endif
+
+        return xProc
+
+    # enddef
+
+    # ##################################################################################################
+    def _Send(self, _dicHeader: dict):
+        xSocket = self._xSocket
+        if xSocket is None:
+            raise CAnyError_Message(sMsg=f"Not connected to execution agent '{self._xAddress}'")
+        # endif
+
+        try:
+            with self._lockSend:
+                SendFrame(xSocket, _dicHeader)
+            # endwith
+        except OSError as xEx:
+            raise CAnyError_Message(sMsg=f"Error sending to execution agent '{self._xAddress}'", xChildEx=xEx)
+        # endtry
+
+    # enddef
+
+    # ##################################################################################################
+    def _ReceiveLoop(self, _xSocket: socket.socket):
+        while True:
+            try:
+                tFrame = RecvFrame(_xSocket)
+            except OSError:
+                tFrame = None
+            # endtry
+            if tFrame is None:
+                break
+            # endif
+
+            dicHeader, bytPayload = tFrame
+            with self._lockJobs:
+                xProc: CExecProcessSocket = self._dicJobs.get(dicHeader.get("iJobId"))
+            # endwith
+            if xProc is None:
+                continue
+            # endif
+
+            sOp = dicHeader.get("sOp")
+            if sOp == "output":
+                if dicHeader.get("bText", False) is True:
+                    xProc._OnOutput(bytPayload.decode("utf-8"))
+                else:
+                    xProc._OnOutput(bytPayload)
+                # endif
+
+            elif sOp == "started":
+                xProc._OnStarted(dicHeader.get("iPid"))
+
+            elif sOp == "exit":
+                xProc._OnEnded(dicHeader.get("iReturnCode"))
+                with self._lockJobs:
+                    self._dicJobs.pop(xProc.iJobId, None)
+                # endwith
+
+            elif sOp == "error":
+                xProc._OnEnded(-1, dicHeader.get("sMsg"))
+                with self._lockJobs:
+                    self._dicJobs.pop(xProc.iJobId, None)
+                # endwith
+            # endif
+        # endwhile
+
+        # Connection lost: all running jobs have ended for this client
+        with self._lockConnect:
+            if self._xSocket is _xSocket:
+                self._xSocket = None
+            # endif
+        # endwith
+
+        with self._lockJobs:
+            lProcs = list(self._dicJobs.values())
+            self._dicJobs.clear()
+        # endwith
+
+        for xProc in lProcs:
+            xProc._OnEnded(-1, f"Connection to execution agent '{self._xAddress}' lost")
+        # endfor
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import os
+from typing import Iterator, Mapping, Optional, Union
+
+
+# Immutable process environment.
+# The variables of the base environment and all overrides are merged once on construction,
+# so that the resulting dictionary can be passed to subprocess.Popen() for every launch.
+# Environments can be layered, e.g. base -> conda -> job, via Layer().
+# Overrides with value None remove the variable from the environment.
+class CExecEnv(Mapping):
+    iMaxLayerCacheSize: int = 256
+
+    def __init__(
+        self,
+        _dicVars: Optional[Mapping[str, Optional[str]]] = None,
+        *,
+        _xParent: Optional["CExecEnv"] = None,
+        _bInheritOsEnv: bool = True,
+    ):
+        if _xParent is not None:
+            dicEnv = dict(_xParent._dicEnv)
+        elif _bInheritOsEnv is True:
+            dicEnv = os.environ.copy()
+        else:
+            dicEnv = dict()
+        # endif
+
+        if _dicVars is not None:
+            for sKey, xValue in _dicVars.items():
+                if xValue is None:
+                    dicEnv.pop(sKey, None)
+                else:
+                    dicEnv[sKey] = str(xValue)
+                # endif
+            # endfor
+        # endif
+
+        self._dicEnv: dict[str, str] = dicEnv
+        self._xParent: Optional["CExecEnv"] = _xParent
+        self._iHash: Optional[int] = None
+        self._dicLayerCache: dict[frozenset, "CExecEnv"] = dict()
+
+    # enddef
+
+    # ##################################################################################################
+    @property
+    def xParent(self) -> Optional["CExecEnv"]:
+        return self._xParent
+
+    # enddef
+
+    # ##################################################################################################
+    # The merged environment dictionary that is passed to subprocess.Popen().
+    # This dictionary is shared and must not be modified.
+    @property
+    def dicEnviron(self) -> dict[str, str]:
+        return self._dicEnv
+
+    # enddef
+
+    # ##################################################################################################
+    def __getitem__(self, _sKey: str) -> str:
+        return self._dicEnv[_sKey]
+
+    # enddef
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._dicEnv)
+
+    # enddef
+
+    def __len__(self) -> int:
+        return len(self._dicEnv)
+
+    # enddef
+
+    def __contains__(self, _sKey: object) -> bool:
+        return _sKey in self._dicEnv
+
+    # enddef
+
+    def __eq__(self, _xOther: object) -> bool:
+        if isinstance(_xOther, CExecEnv):
+            if self is _xOther:
+                return True
+            # endif
+            if hash(self) != hash(_xOther):
+                return False
+            # endif
+            return self._dicEnv == _xOther._dicEnv
+        # endif
+        return NotImplemented
+
+    # enddef
+
+    def __hash__(self) -> int:
+        if self._iHash is None:
+            self._iHash = hash(frozenset(self._dicEnv.items()))
+        # endif
+        return self._iHash
+
+    # enddef
+
+    def __repr__(self) -> str:
+        return f"CExecEnv({len(self._dicEnv)} variables)"
+
+    # enddef
+
+    # ##################################################################################################
+    # Create a new environment with the given overrides on top of this one.
+    # Layers with the same overrides are cached, so that repeatedly
+    # layering the same job environment does not create a new dictionary.
+    def Layer(self, _dicVars: Optional[Mapping[str, Optional[str]]]) -> "CExecEnv":
+        if _dicVars is None or len(_dicVars) == 0:
+            return self
+        # endif
+
+        try:
+            xKey = frozenset(_dicVars.items())
+        except TypeError:
+            return CExecEnv(_dicVars, _xParent=self)
+        # endtry
+
+        xEnv: CExecEnv = self._dicLayerCache.get(xKey)
+        if xEnv is None:
+            if len(self._dicLayerCache) >= self.iMaxLayerCacheSize:
+                self._dicLayerCache.clear()
+            # endif
+            xEnv = CExecEnv(_dicVars, _xParent=self)
+            self._dicLayerCache[xKey] = xEnv
+        # endif
+
+        return xEnv
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns a mutable copy of the environment variables
+    def ToDict(self) -> dict[str, str]:
+        return dict(self._dicEnv)
+
+    # enddef
+
+
+# endclass
+
+
+#################################################################################################################
+# Environment passed to subprocess.Popen(). If no environment is given, the child inherits
+# the environment of the current process without copying it. A CExecEnv instance is passed
+# on directly, as it already contains the merged environment.
+def ProvideEnviron(_xEnv: Optional[Union[dict, CExecEnv]]) -> Optional[dict]:
+    if _xEnv is None:
+        return None
+    elif isinstance(_xEnv, CExecEnv):
+        return _xEnv.dicEnviron
+    # endif
+
+    dicEnviron = os.environ.copy()
+    dicEnviron.update(_xEnv)
+    return dicEnviron
+
+
+# enddef
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+# Immutable, hashable configuration data.
+# Frozen dictionaries and lists are subclasses of dict and list, so that they can be
+# passed to all functions that expect configuration data, and are serialized by all
+# JSON backends as they are. All methods that would modify them raise a TypeError.
+# Updates return new frozen objects, that share all unchanged elements with the original,
+# so that only the elements along the updated path are copied.
+
+from typing import Any, Iterable, Optional, Union
+
+
+####################################################################################
+# Returns a frozen version of the given data. Frozen elements are shared, not copied.
+def Freeze(_xData: Any) -> Any:
+    if isinstance(_xData, (CFrozenDict, CFrozenList)):
+        return _xData
+    elif isinstance(_xData, dict):
+        return CFrozenDict(_xData)
+    elif isinstance(_xData, (list, tuple)):
+        return CFrozenList(_xData)
+    # endif
+    return _xData
+
+
+# enddef
+
+
+####################################################################################
+# Returns a mutable deep copy of frozen data, consisting of plain dictionaries and lists
+def Thaw(_xData: Any) -> Any:
+    if isinstance(_xData, dict):
+        return {xKey: Thaw(xValue) for xKey, xValue in _xData.items()}
+    elif isinstance(_xData, list):
+        return [Thaw(xValue) for xValue in _xData]
+    # endif
+    return _xData
+
+
+# enddef
+
+
+####################################################################################
+def IsFrozen(_xData: Any) -> bool:
+    return isinstance(_xData, (CFrozenDict, CFrozenList))
+
+
+# enddef
+
+
+####################################################################################
+def _RaiseImmutable(self, *_tArgs, **_dicArgs):
+    raise TypeError("'{}' object is immutable".format(type(self).__name__))
+
+
+# enddef
+
+
+####################################################################################
+# Split a path "a/b/0" into its keys. Paths may also be given as tuple of keys.
+def _SplitPath(_xPath: Union[str, tuple, list]) -> tuple:
+    if isinstance(_xPath, str):
+        return tuple(_xPath.split("/"))
+    # endif
+    return tuple(_xPath)
+
+
+# enddef
+
+
+####################################################################################
+# Immutable, hashable dictionary
+class CFrozenDict(dict):
+    __slots__ = ("_iHash",)
+
+    def __init__(self, _xData: Optional[Union[dict, Iterable]] = None):
+        if _xData is None:
+            super().__init__()
+        else:
+            super().__init__((xKey, Freeze(xValue)) for xKey, xValue in dict(_xData).items())
+        # endif
+        self._iHash: Optional[int] = None
+
+    # enddef
+
+    # Create from key/value pairs whose values are already frozen
+    @classmethod
+    def _FromFrozenItems(cls, _iterItems: Iterable) -> "CFrozenDict":
+        dicX = cls.__new__(cls)
+        dict.__init__(dicX, _iterItems)
+        dicX._iHash = None
+        return dicX
+
+    # enddef
+
+    def __hash__(self) -> int:
+        if self._iHash is None:
+            self._iHash = hash(frozenset(dict.items(self)))
+        # endif
+        return self._iHash
+
+    # enddef
+
+    def __repr__(self) -> str:
+        return "CFrozenDict({})".format(dict.__repr__(self))
+
+    # enddef
+
+    def __reduce__(self):
+        return (CFrozenDict, (dict(self),))
+
+    # enddef
+
+    def __copy__(self) -> "CFrozenDict":
+        return self
+
+    # enddef
+
+    def __deepcopy__(self, _dicMemo: dict) -> "CFrozenDict":
+        return self
+
+    # enddef
+
+    def copy(self) -> "CFrozenDict":
+        return self
+
+    # enddef
+
+    __setitem__ = _RaiseImmutable
+    __delitem__ = _RaiseImmutable
+    __ior__ = _RaiseImmutable
+    clear = _RaiseImmutable
+    pop = _RaiseImmutable
+    popitem = _RaiseImmutable
+    setdefault = _RaiseImmutable
+    update = _RaiseImmutable
+
+    # ##################################################################################################
+    # Returns a new frozen dictionary with the element set to the given value
+    def Set(self, _xKey: Any, _xValue: Any) -> "CFrozenDict":
+        dicX = dict(self)
+        dicX[_xKey] = Freeze(_xValue)
+        return CFrozenDict._FromFrozenItems(dicX)
+
+    # enddef
+
+    # Returns a new frozen dictionary without the given element
+    def Remove(self, _xKey: Any) -> "CFrozenDict":
+        if _xKey not in self:
+            raise KeyError(_xKey)
+        # endif
+        return CFrozenDict._FromFrozenItems((xKey, xValue) for xKey, xValue in dict.items(self) if xKey != _xKey)
+
+    # enddef
+
+    # Returns a new frozen dictionary updated with the elements of the given dictionary
+    def Merge(self, _dicX: dict) -> "CFrozenDict":
+        dicX = dict(self)
+        dicX.update((xKey, Freeze(xValue)) for xKey, xValue in _dicX.items())
+        return CFrozenDict._FromFrozenItems(dicX)
+
+    # enddef
+
+    # Returns a new frozen dictionary with the element at the path set to the given value.
+    # The path is a string "a/b/0" or a tuple of keys, where keys of list elements are indices.
+    # Missing dictionaries along the path are created.
+    def SetAtPath(self, _xPath: Union[str, tuple, list], _xValue: Any) -> "CFrozenDict":
+        return _SetAtPath(self, _SplitPath(_xPath), Freeze(_xValue))
+
+    # enddef
+
+    # Returns the element at the path or 'xDefault', if it does not exist
+    def GetAtPath(self, _xPath: Union[str, tuple, list], xDefault: Any = None) -> Any:
+        xValue = self
+        for xKey in _SplitPath(_xPath):
+            if isinstance(xValue, dict):
+                xValue = xValue.get(xKey)
+            elif isinstance(xValue, list):
+                try:
+                    xValue = xValue[int(xKey)]
+                except (ValueError, IndexError):
+                    return xDefault
+                # endtry
+            else:
+                return xDefault
+            # endif
+            if xValue is None:
+                return xDefault
+            # endif
+        # endfor
+        return xValue
+
+    # enddef
+
+
+# endclass
+
+
+####################################################################################
+# Immutable, hashable list
+class CFrozenList(list):
+    __slots__ = ("_iHash",)
+
+    def __init__(self, _xData: Optional[Iterable] = None):
+        if _xData is None:
+            super().__init__()
+        else:
+            super().__init__(Freeze(xValue) for xValue in _xData)
+        # endif
+        self._iHash: Optional[int] = None
+
+    # enddef
+
+    @classmethod
+    def _FromFrozenItems(cls, _iterItems: Iterable) -> "CFrozenList":
+        lX = cls.__new__(cls)
+        list.__init__(lX, _iterItems)
+        lX._iHash = None
+        return lX
+
+    # enddef
+
+    def __hash__(self) -> int:
+        if self._iHash is None:
+            self._iHash = hash(tuple(self))
+        # endif
+        return self._iHash
+
+    # enddef
+
+    def __repr__(self) -> str:
+        return "CFrozenList({})".format(list.__repr__(self))
+
+    # enddef
+
+    def __reduce__(self):
+        return (CFrozenList, (list(self),))
+
+    # enddef
+
+    def __copy__(self) -> "CFrozenList":
+        return self
+
+    # enddef
+
+    def __deepcopy__(self, _dicMemo: dict) -> "CFrozenList":
+        return self
+
+    # enddef
+
+    def copy(self) -> "CFrozenList":
+        return self
+
+    # enddef
+
+    __setitem__ = _RaiseImmutable
+    __delitem__ = _RaiseImmutable
+    __iadd__ = _RaiseImmutable
+    __imul__ = _RaiseImmutable
+    append = _RaiseImmutable
+    extend = _RaiseImmutable
+    insert = _RaiseImmutable
+    remove = _RaiseImmutable
+    pop = _RaiseImmutable
+    clear = _RaiseImmutable
+    sort = _RaiseImmutable
+    reverse = _RaiseImmutable
+
+    # ##################################################################################################
+    # Returns a new frozen list with the element at the index set to the given value
+    def Set(self, _iIdx: int, _xValue: Any) -> "CFrozenList":
+        lX = list(self)
+        lX[_iIdx] = Freeze(_xValue)
+        return CFrozenList._FromFrozenItems(lX)
+
+    # enddef
+
+    # Returns a new frozen list with the given value appended
+    def Append(self, _xValue: Any) -> "CFrozenList":
+        lX = list(self)
+        lX.append(Freeze(_xValue))
+        return CFrozenList._FromFrozenItems(lX)
+
+    # enddef
+
+    # Returns a new frozen list without the element at the index
+    def Remove(self, _iIdx: int) -> "CFrozenList":
+        lX = list(self)
+        del lX[_iIdx]
+        return CFrozenList._FromFrozenItems(lX)
+
+    # enddef
+
+
+# endclass
+
+
+####################################################################################
+# Copy the containers along the path and share all other elements
+def _SetAtPath(_xContainer: Any, _tPath: tuple, _xValue: Any) -> Any:
+    xKey = _tPath[0]
+    if isinstance(_xContainer, list):
+        try:
+            xKey = int(xKey)
+        except ValueError:
+            raise KeyError("Invalid list index '{}'".format(xKey))
+        # endtry
+        if not -len(_xContainer) <= xKey < len(_xContainer):
+            raise IndexError("List index '{}' out of range".format(xKey))
+        # endif
+        xChild = _xContainer[xKey]
+
+    elif isinstance(_xContainer, dict):
+        xChild = _xContainer.get(xKey)
+
+    else:
+        raise TypeError("Cannot set element '{}' in element of type '{}'".format(xKey, type(_xContainer).__name__))
+    # endif
+
+    if len(_tPath) == 1:
+        xNewChild = _xValue
+    else:
+        if xChild is None:
+            xChild = CFrozenDict()
+        # endif
+        xNewChild = _SetAtPath(xChild, _tPath[1:], _xValue)
+    # endif
+
+    return Freeze(_xContainer).Set(xKey, xNewChild)
+
+
+# enddef
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+from . import file
+
+
+# Node of the import graph for a single file
+class CImportNode:
+    def __init__(self, _sFilePath: str):
+        self.sFilePath: str = _sFilePath
+        # File size and modification time, and hash of the contents, when the results were stored
+        self.tStat: Optional[tuple] = None
+        self.sHash: Optional[str] = None
+        # DTIs the file was imported with
+        self.setDti: set[str] = set()
+        # Results of loading the file, by result key
+        self.dicResults: dict[Hashable, Any] = {}
+        # Paths of the files this file imports, and of the files that import this file
+        self.setImports: set[str] = set()
+        self.setImportedBy: set[str] = set()
+
+    # enddef
+
+
+# endclass
+
+
+# Import graph of configuration files, with the results of importing a file cached per file.
+# Files are compared by size and modification time, and by the hash of their contents,
+# if only the modification time differs. A cached result is only used, if neither the file
+# nor any of the files it imports, directly or indirectly, have changed. The result of an import
+# with a DTI is the processed configuration, which contains the data of the files it imports.
+# The result of an import without a DTI is the data as loaded, whose imports are processed by
+# the importing parser, which again uses the cache for each of them.
+# The recorded imports of a file are reset when the file is loaded again, and recorded anew
+# when its imports are processed, so that imports that were removed are not considered.
+class CImportGraph:
+    def __init__(self):
+        self._dicNodes: dict[str, CImportNode] = {}
+        self._xLock = threading.RLock()
+
+    # enddef
+
+    # ##################################################################################################
+    @staticmethod
+    def _GetStat(_sFilePath: str) -> Optional[tuple]:
+        try:
+            xStat = os.stat(_sFilePath)
+        except OSError:
+            return None
+        # endtry
+        return (xStat.st_size, xStat.st_mtime_ns)
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the state of a file as tuple (stat, hash), or None if the file cannot be read.
+    # It has to be obtained before the file is loaded, and is passed to SetResult().
+    @staticmethod
+    def GetFileState(_sFilePath: str) -> Optional[tuple]:
+        tStat = CImportGraph._GetStat(_sFilePath)
+        if tStat is None:
+            return None
+        # endif
+        try:
+            sHash = file.GetFileHash(Path(_sFilePath))
+        except OSError:
+            return None
+        # endtry
+        return (tStat, sHash)
+
+    # enddef
+
+    # ##################################################################################################
+    def _ProvideNode(self, _sFilePath: str) -> CImportNode:
+        xNode = self._dicNodes.get(_sFilePath)
+        if xNode is None:
+            xNode = self._dicNodes[_sFilePath] = CImportNode(_sFilePath)
+        # endif
+        return xNode
+
+    # enddef
+
+    # ##################################################################################################
+    # Test whether the file of the node is unchanged since its results were stored
+    def _IsCurrent(self, _xNode: CImportNode) -> bool:
+        if _xNode.tStat is None:
+            return False
+        # endif
+
+        tStat = CImportGraph._GetStat(_xNode.sFilePath)
+        if tStat is None:
+            return False
+        elif tStat == _xNode.tStat:
+            return True
+        elif tStat[0] != _xNode.tStat[0]:
+            return False
+        # endif
+
+        # Only the modification time has changed
+        try:
+            sHash = file.GetFileHash(Path(_xNode.sFilePath))
+        except OSError:
+            return False
+        # endtry
+
+        if sHash != _xNode.sHash:
+            return False
+        # endif
+        _xNode.tStat = tStat
+        return True
+
+    # enddef
+
+    # ##################################################################################################
+    # Record that the file '_sImporter' imports the file '_sImported'
+    def AddImport(self, _sImporter: str, _sImported: str):
+        with self._xLock:
+            self._ProvideNode(_sImporter).setImports.add(_sImported)
+            self._ProvideNode(_sImported).setImportedBy.add(_sImporter)
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    # Remove the recorded imports of a file, e.g. because the file is loaded again
+    def ResetImports(self, _sFilePath: str):
+        with self._xLock:
+            xNode = self._dicNodes.get(_sFilePath)
+            if xNode is None:
+                return
+            # endif
+
+            for sImport in xNode.setImports:
+                xImportNode = self._dicNodes.get(sImport)
+                if xImportNode is not None:
+                    xImportNode.setImportedBy.discard(_sFilePath)
+                # endif
+            # endfor
+            xNode.setImports.clear()
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the cached result of the file for the result key,
+    # or None if there is none, or if the file has changed.
+    def GetResult(self, _sFilePath: str, _xResultKey: Hashable) -> Any:
+        with self._xLock:
+            xNode = self._dicNodes.get(_sFilePath)
+            if xNode is None or _xResultKey not in xNode.dicResults:
+                return None
+            # endif
+
+            if not self._IsCurrent(xNode) or self._HasChangedImports(xNode):
+                self.Invalidate(_sFilePath)
+                return None
+            # endif
+
+            return xNode.dicResults[_xResultKey]
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    # Test whether any of the files imported by the node, directly or indirectly, has changed
+    def _HasChangedImports(self, _xNode: CImportNode) -> bool:
+        setVisited = {_xNode.sFilePath}
+        lStack = list(_xNode.setImports)
+        while len(lStack) > 0:
+            sFilePath = lStack.pop()
+            if sFilePath in setVisited:
+                continue
+            # endif
+            setVisited.add(sFilePath)
+
+            xNode = self._dicNodes.get(sFilePath)
+            if xNode is None:
+                continue
+            # endif
+
+            if xNode.tStat is None or not self._IsCurrent(xNode):
+                return True
+            # endif
+            lStack.extend(xNode.setImports)
+        # endwhile
+        return False
+
+    # enddef
+
+    # ##################################################################################################
+    # Store the result of loading the file for the result key. 'tFileState' is the state of
+    # the file as returned by GetFileState() before the file was loaded. The result is not stored,
+    # if the file has changed since then, or its state differs from that of the stored results.
+    def SetResult(
+        self,
+        _sFilePath: str,
+        _xResultKey: Hashable,
+        _xResult: Any,
+        *,
+        tFileState: Optional[tuple],
+        sDti: Optional[str] = None,
+    ):
+        if tFileState is None:
+            return
+        # endif
+
+        tStat, sHash = tFileState
+        if CImportGraph._GetStat(_sFilePath) != tStat:
+            return
+        # endif
+
+        with self._xLock:
+            xNode = self._ProvideNode(_sFilePath)
+            if xNode.tStat is not None and xNode.sHash != sHash:
+                xNode.dicResults.clear()
+            # endif
+            xNode.tStat = tStat
+            xNode.sHash = sHash
+
+            if sDti is not None:
+                xNode.setDti.add(sDti)
+            # endif
+            xNode.dicResults[_xResultKey] = _xResult
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the paths of all files that depend on the given file, i.e. that import it
+    # directly or indirectly, including the file itself.
+    def GetAffected(self, _sFilePath: str) -> set[str]:
+        with self._xLock:
+            setAffected = {_sFilePath}
+            lStack = [_sFilePath]
+            while len(lStack) > 0:
+                xNode = self._dicNodes.get(lStack.pop())
+                if xNode is None:
+                    continue
+                # endif
+
+                for sImporter in xNode.setImportedBy:
+                    if sImporter not in setAffected:
+                        setAffected.add(sImporter)
+                        lStack.append(sImporter)
+                    # endif
+                # endfor
+            # endwhile
+            return setAffected
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    # Remove the cached results of the file
+    def Invalidate(self, _sFilePath: str):
+        with self._xLock:
+            xNode = self._dicNodes.get(_sFilePath)
+            if xNode is not None:
+                xNode.dicResults.clear()
+                xNode.tStat = None
+                xNode.sHash = None
+            # endif
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the paths of all files with cached results, that have changed
+    def GetChanged(self) -> list[str]:
+        with self._xLock:
+            return [
+                xNode.sFilePath
+                for xNode in self._dicNodes.values()
+                if xNode.tStat is not None and not self._IsCurrent(xNode)
+            ]
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the graph as dictionary of file paths to dictionaries with the elements
+    # "sHash", "lDti", "lImports", "lImportedBy" and "bCached".
+    def GetGraph(self) -> dict:
+        with self._xLock:
+            return {
+                sFilePath: {
+                    "sHash": xNode.sHash,
+                    "lDti": sorted(xNode.setDti),
+                    "lImports": sorted(xNode.setImports),
+                    "lImportedBy": sorted(xNode.setImportedBy),
+                    "bCached": len(xNode.dicResults) > 0,
+                }
+                for sFilePath, xNode in self._dicNodes.items()
+            }
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    def Clear(self):
+        with self._xLock:
+            self._dicNodes.clear()
+        # endwith
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+import re
+from typing import IO, Any, Iterator, Optional
+
+from .cls_any_error import CAnyError_Message
+from . import json_codec
+
+
+# Incremental reader for strict JSON data from a binary file object.
+# The reader navigates through the JSON structure without decoding it and only
+# returns the raw bytes of the values that are requested. The memory needed is
+# therefore bounded by the size of the largest value read plus the chunk size.
+class CJsonStreamReader:
+    reWhitespace = re.compile(rb"[ \t\r\n]*")
+    reContainerSpecial = re.compile(rb'["\[\]{}]')
+    reStringSpecial = re.compile(rb'["\\]')
+    reScalarEnd = re.compile(rb"[,\]}: \t\r\n]")
+
+    def __init__(self, _xFile: IO[bytes], *, _iChunkSize: int = 1 << 16):
+        self._xFile: IO[bytes] = _xFile
+        self._iChunkSize: int = _iChunkSize
+        self._bytBuffer: bytearray = bytearray()
+        self._iPos: int = 0
+        self._bEof: bool = False
+
+    # enddef
+
+    # ##################################################################################################
+    # Read the next chunk. Data before the current position is discarded,
+    # once it makes up at least half of the buffer, so that the buffer is only
+    # compacted a logarithmic number of times while a large value is read.
+    def _Fill(self) -> bool:
+        if self._bEof is True:
+            return False
+        # endif
+
+        bytChunk = self._xFile.read(self._iChunkSize)
+        if len(bytChunk) == 0:
+            self._bEof = True
+            return False
+        # endif
+
+        if self._iPos > 0 and 2 * self._iPos >= len(self._bytBuffer):
+            del self._bytBuffer[: self._iPos]
+            self._iPos = 0
+        # endif
+        self._bytBuffer += bytChunk
+        return True
+
+    # enddef
+
+    # ##################################################################################################
+    def _Error(self, _sMsg: str):
+        raise CAnyError_Message(sMsg=f"Error parsing JSON stream: {_sMsg}")
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the next non-whitespace character without consuming it, or None at the end of the data
+    def Peek(self) -> Optional[bytes]:
+        while True:
+            self._iPos = self.reWhitespace.match(self._bytBuffer, self._iPos).end()
+            if self._iPos < len(self._bytBuffer):
+                return bytes(self._bytBuffer[self._iPos : self._iPos + 1])
+            # endif
+            if self._Fill() is False:
+                return None
+            # endif
+        # endwhile
+
+    # enddef
+
+    # ##################################################################################################
+    def Expect(self, _bytChar: bytes):
+        bytNext = self.Peek()
+        if bytNext != _bytChar:
+            sFound = "end of data" if bytNext is None else bytNext.decode()
+            self._Error(f"Expected '{_bytChar.decode()}' but found '{sFound}'")
+        # endif
+        self._iPos += 1
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the raw bytes of the next value
+    def ReadRaw(self) -> bytes:
+        bytFirst = self.Peek()
+        if bytFirst is None:
+            self._Error("Unexpected end of data")
+        # endif
+
+        iStart = self._iPos
+        if bytFirst == b'"':
+            iEnd = self._ScanString(iStart + 1)
+        elif bytFirst == b"{" or bytFirst == b"[":
+            iEnd = self._ScanContainer(iStart + 1)
+        else:
+            iEnd = self._ScanScalar(iStart)
+        # endif
+
+        # Positions may have shifted, if the buffer has been refilled
+        iStart = self._iPos
+        bytValue = bytes(self._bytBuffer[iStart:iEnd])
+        self._iPos = iEnd
+        return bytValue
+
+    # enddef
+
+    # ##################################################################################################
+    def ReadValue(self) -> Any:
+        return json_codec.Decode(self.ReadRaw(), sSuffix=".json")
+
+    # enddef
+
+    # ##################################################################################################
+    def SkipValue(self):
+        self.ReadRaw()
+
+    # enddef
+
+    # ##################################################################################################
+    # Scan functions return the position after the scanned element.
+    # Refilling the buffer may move the current position, so positions are kept relative to it.
+    def _ScanString(self, _iPos: int) -> int:
+        iRel = _iPos - self._iPos
+        while True:
+            xMatch = self.reStringSpecial.search(self._bytBuffer, self._iPos + iRel)
+            if xMatch is None or (xMatch.group(0) == b"\\" and xMatch.end() >= len(self._bytBuffer)):
+                iRel = len(self._bytBuffer) - self._iPos if xMatch is None else xMatch.start() - self._iPos
+                if self._Fill() is False:
+                    self._Error("Unterminated string")
+                # endif
+                continue
+            # endif
+
+            if xMatch.group(0) == b"\\":
+                iRel = xMatch.end() + 1 - self._iPos
+                continue
+            # endif
+
+            return xMatch.end()
+        # endwhile
+
+    # enddef
+
+    def _ScanContainer(self, _iPos: int) -> int:
+        iRel = _iPos - self._iPos
+        iDepth = 1
+        while True:
+            xMatch = self.reContainerSpecial.search(self._bytBuffer, self._iPos + iRel)
+            if xMatch is None:
+                iRel = len(self._bytBuffer) - self._iPos
+                if self._Fill() is False:
+                    self._Error("Unterminated object or array")
+                # endif
+                continue
+            # endif
+
+            bytChar = xMatch.group(0)
+            if bytChar == b'"':
+                iRel = self._ScanString(xMatch.end()) - self._iPos
+                continue
+            elif bytChar == b"{" or bytChar == b"[":
+                iDepth += 1
+            else:
+                iDepth -= 1
+                if iDepth == 0:
+                    return xMatch.end()
+                # endif
+            # endif
+            iRel = xMatch.end() - self._iPos
+        # endwhile
+
+    # enddef
+
+    def _ScanScalar(self, _iPos: int) -> int:
+        iRel = _iPos - self._iPos
+        while True:
+            xMatch = self.reScalarEnd.search(self._bytBuffer, self._iPos + iRel)
+            if xMatch is not None:
+                return xMatch.start()
+            # endif
+            iRel = len(self._bytBuffer) - self._iPos
+            if self._Fill() is False:
+                return len(self._bytBuffer)
+            # endif
+        # endwhile
+
+    # enddef
+
+    # ##################################################################################################
+    # Iterate over the members of an object. For each key, the caller must either
+    # read or skip the value, before the next key is returned.
+    def IterObjectKeys(self) -> Iterator[str]:
+        self.Expect(b"{")
+        if self.Peek() == b"}":
+            self._iPos += 1
+            return
+        # endif
+
+        while True:
+            sKey = json_codec.Decode(self.ReadRaw(), sSuffix=".json")
+            self.Expect(b":")
+            yield sKey
+
+            bytNext = self.Peek()
+            self._iPos += 1
+            if bytNext == b"}":
+                return
+            elif bytNext != b",":
+                self._Error("Expected ',' or '}' in object")
+            # endif
+        # endwhile
+
+    # enddef
+
+    # ##################################################################################################
+    # Iterate over the elements of an array. For each yielded index, the caller must
+    # either read or skip the element, before the next index is returned.
+    def IterArrayIndices(self) -> Iterator[int]:
+        self.Expect(b"[")
+        if self.Peek() == b"]":
+            self._iPos += 1
+            return
+        # endif
+
+        iIdx = 0
+        while True:
+            yield iIdx
+            iIdx += 1
+
+            bytNext = self.Peek()
+            self._iPos += 1
+            if bytNext == b"]":
+                return
+            elif bytNext != b",":
+                self._Error("Expected ',' or ']' in array")
+            # endif
+        # endwhile
+
+    # enddef
+
+    # ##################################################################################################
+    # Move to the value referenced by the given JSON pointer (RFC 6901), e.g. '/frames'.
+    def Seek(self, _sPointer: str):
+        if len(_sPointer) == 0:
+            return
+        # endif
+        if not _sPointer.startswith("/"):
+            raise CAnyError_Message(sMsg=f"Invalid JSON pointer: {_sPointer}")
+        # endif
+
+        for sToken in _sPointer[1:].split("/"):
+            sToken = sToken.replace("~1", "/").replace("~0", "~")
+            bytNext = self.Peek()
+            bFound = False
+            if bytNext == b"{":
+                for sKey in self.IterObjectKeys():
+                    if sKey == sToken:
+                        bFound = True
+                        break
+                    # endif
+                    self.SkipValue()
+                # endfor
+            elif bytNext == b"[" and sToken.isdigit():
+                iTrgIdx = int(sToken)
+                for iIdx in self.IterArrayIndices():
+                    if iIdx == iTrgIdx:
+                        bFound = True
+                        break
+                    # endif
+                    self.SkipValue()
+                # endfor
+            # endif
+
+            if bFound is False:
+                raise CAnyError_Message(sMsg=f"Element '{sToken}' of JSON pointer '{_sPointer}' not found")
+            # endif
+        # endfor
+
+    # enddef
+
+
+# endclass
@@ -22,13 +22,16 @@
 # </LICENSE>
 ###
 
+import os
 import time
 import enum
 import threading
 import queue
+from typing import Optional
 
 from .cls_process_handler import CProcessHandler
 from .cls_process_output import CProcessOutput
+from .cls_process_journal import CProcessJournal
 
 
 class EProcessStatus(enum.Enum):
@@ -37,13 +40,69 @@ class EProcessStatus(enum.Enum):
     RUNNING = enum.auto()
     ENDED = enum.auto()
     TERMINATED = enum.auto()
+    # Process was running when the controller ended and its exit status is unknown
+    INTERRUPTED = enum.auto()
+    # Re-attached process of a previous controller has ended. As it is not a child process
+    # of this controller, its exit status is unknown. The job is not run again.
+    ENDED_UNKNOWN = enum.auto()
 
 
 # endclass
 
 
+################################################################################################################
+# Returns the creation time of a process, which is used to detect re-used process ids
+def _GetProcCreateTime(_iPid: int) -> Optional[float]:
+    try:
+        import psutil
+
+        return psutil.Process(_iPid).create_time()
+    except Exception:
+        return None
+    # endtry
+
+
+# enddef
+
+
+################################################################################################################
+def _IsProcAlive(_iPid: int, _fCreateTime: Optional[float]) -> bool:
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    # endtry
+
+    if psutil is not None:
+        try:
+            procX = psutil.Process(_iPid)
+            if _fCreateTime is not None and abs(procX.create_time() - _fCreateTime) > 1e-3:
+                return False
+            # endif
+            return procX.status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+        # endtry
+    # endif
+
+    try:
+        os.kill(_iPid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    # endtry
+    return True
+
+
+# enddef
+
+
 class CProcessGroupHandler:
-    def __init__(self):
+    def __init__(self, *, _xJournal: Optional[CProcessJournal] = None):
+        self._xJournal: Optional[CProcessJournal] = _xJournal
         self._qProcStdOut: queue.Queue = queue.Queue()
         self._lockProcData: threading.Lock = threading.Lock()
 
@@ -51,12 +110,21 @@ class CProcessGroupHandler:
         self._dicProcStatus: dict[int, EProcessStatus] = dict()
         self._dicProcEndMsg: dict[int, str] = dict()
         self._dicProcTerminateEvent: dict[int, threading.Event] = dict()
+        self._dicProcJobInfo: dict[int, dict] = dict()
+        # Processes of a previous controller that are still running: job id -> (pid, create time)
+        self._dicProcReattached: dict[int, tuple[int, Optional[float]]] = dict()
 
         self._setProcStatusChanged: set[int] = set()
         self._setProcOutputChanged: set[int] = set()
 
     # enddef
 
+    @property
+    def xJournal(self) -> Optional[CProcessJournal]:
+        return self._xJournal
+
+    # enddef
+
     # ##################################################################################################
     def Clear(self, *, bForce: bool = False):
         if bForce is False and not self.AllEnded():
@@ -67,9 +135,15 @@ class CProcessGroupHandler:
         self._dicProcStatus = dict()
         self._dicProcEndMsg = dict()
         self._dicProcTerminateEvent = dict()
+        self._dicProcJobInfo = dict()
+        self._dicProcReattached = dict()
         self._setProcOutputChanged = set()
         self._setProcStatusChanged = set()
 
+        if self._xJournal is not None:
+            self._xJournal.WriteClear()
+        # endif
+
     # enddef
 
     # ##################################################################################################
@@ -77,7 +151,12 @@ class CProcessGroupHandler:
         with self._lockProcData:
             eStatus: EProcessStatus = None
             for eStatus in self._dicProcStatus.values():
-                if eStatus != EProcessStatus.ENDED and eStatus != EProcessStatus.TERMINATED:
+                if eStatus not in (
+                    EProcessStatus.ENDED,
+                    EProcessStatus.TERMINATED,
+                    EProcessStatus.INTERRUPTED,
+                    EProcessStatus.ENDED_UNKNOWN,
+                ):
                     return False
                 # endif
             # endfor
@@ -88,20 +167,160 @@ class CProcessGroupHandler:
     # enddef
 
     # ##################################################################################################
-    def AddProcessHandler(self, *, _iJobId: int, _xProcHandler: CProcessHandler):
+    # The optional job info is stored in the journal, so that a restarted
+    # controller knows how to resume the job. It must be JSON serializable.
+    def AddProcessHandler(self, *, _iJobId: int, _xProcHandler: CProcessHandler, _dicJobInfo: Optional[dict] = None):
         if _iJobId in self._dicProcStatus:
             raise RuntimeError(f"Job Id '{_iJobId}' already used")
         # endif
 
         self._dicProcTerminateEvent[_iJobId] = threading.Event()
+        self._AddCallbacks(_iJobId, _xProcHandler)
+        self._dicProcOutput[_iJobId] = CProcessOutput()
+        self._dicProcStatus[_iJobId] = EProcessStatus.NOT_STARTED
+        self._dicProcJobInfo[_iJobId] = _dicJobInfo
+
+        if self._xJournal is not None:
+            self._xJournal.WriteRegister(_iJobId, _dicJobInfo)
+        # endif
+
+    # enddef
+
+    # ##################################################################################################
+    # Attach a new process handler to a job restored from the journal, that has not been started
+    # or was interrupted, so that the job can be run again. The output of the job is kept.
+    def ResumeProcessHandler(self, *, _iJobId: int, _xProcHandler: CProcessHandler):
+        eStatus = self._dicProcStatus.get(_iJobId)
+        if eStatus is None:
+            raise RuntimeError(f"Job Id '{_iJobId}' not available")
+        # endif
+        if eStatus not in (EProcessStatus.NOT_STARTED, EProcessStatus.INTERRUPTED):
+            raise RuntimeError(f"Job Id '{_iJobId}' cannot be resumed from status '{eStatus.name}'")
+        # endif
+
+        self._dicProcTerminateEvent[_iJobId] = threading.Event()
+        self._AddCallbacks(_iJobId, _xProcHandler)
+        with self._lockProcData:
+            self._dicProcStatus[_iJobId] = EProcessStatus.NOT_STARTED
+            self._setProcStatusChanged.add(_iJobId)
+        # endwith
+
+        if self._xJournal is not None:
+            self._xJournal.WriteStatus(_iJobId, EProcessStatus.NOT_STARTED.name)
+        # endif
 
+    # enddef
+
+    # ##################################################################################################
+    def _AddCallbacks(self, _iJobId: int, _xProcHandler: CProcessHandler):
         _xProcHandler.AddHandlerPreStart(self._CreateCallback_ProcStarting(_iJobId))
-        _xProcHandler.AddHandlerPostStart(self._CreateCallback_ProcStarted(_iJobId))
+        _xProcHandler.AddHandlerPostStart(self._CreateCallback_ProcStarted(_iJobId, _xProcHandler))
         _xProcHandler.AddHandlerEnded(self._CreateCallback_ProcEnded(_iJobId))
         _xProcHandler.AddHandlerStdOut(self._CreateCallback_ProcStdOut(_iJobId))
         _xProcHandler.AddHandlerPollTerminate(self._CreateCallback_ProcPollTerminate(_iJobId))
-        self._dicProcOutput[_iJobId] = CProcessOutput()
-        self._dicProcStatus[_iJobId] = EProcessStatus.NOT_STARTED
+
+    # enddef
+
+    # ##################################################################################################
+    # Restore the jobs from the journal of a previous controller.
+    # Finished jobs keep their status and output. Jobs whose process is still running are re-attached,
+    # i.e. they stay in status RUNNING until PollReattachedProcs() detects that the process has ended.
+    # Only processes of the local host, whose creation time is known, are re-attached. This ensures
+    # that a re-used process id is not mistaken for the process of the job.
+    # All other jobs that were running are marked as INTERRUPTED, as their exit status is unknown.
+    def RestoreFromJournal(self):
+        if self._xJournal is None:
+            raise RuntimeError("No journal available")
+        # endif
+        if len(self._dicProcStatus) > 0:
+            raise RuntimeError("Jobs can only be restored into an empty process group handler")
+        # endif
+
+        dicJobs = CProcessJournal.Read(self._xJournal.pathFile)
+        for iJobId, dicJob in dicJobs.items():
+            eStatus = EProcessStatus[dicJob["sStatus"]]
+            iPid: int = dicJob["iPid"]
+            fCreateTime: float = dicJob["fCreateTime"]
+            if eStatus in (EProcessStatus.STARTING, EProcessStatus.RUNNING):
+                if (
+                    dicJob["sHost"] == "local"
+                    and iPid is not None
+                    and fCreateTime is not None
+                    and _IsProcAlive(iPid, fCreateTime)
+                ):
+                    eStatus = EProcessStatus.RUNNING
+                    self._dicProcReattached[iJobId] = (iPid, fCreateTime)
+                else:
+                    eStatus = EProcessStatus.INTERRUPTED
+                    self._xJournal.WriteStatus(iJobId, eStatus.name)
+                # endif
+            # endif
+
+            xOutput = CProcessOutput()
+            for sLine in dicJob["lLines"]:
+                xOutput.AddLine(sLine)
+            # endfor
+
+            self._dicProcTerminateEvent[iJobId] = threading.Event()
+            self._dicProcOutput[iJobId] = xOutput
+            self._dicProcStatus[iJobId] = eStatus
+            self._dicProcJobInfo[iJobId] = dicJob["dicJobInfo"]
+            if dicJob["sEndMsg"] is not None:
+                self._dicProcEndMsg[iJobId] = dicJob["sEndMsg"]
+            # endif
+            self._setProcStatusChanged.add(iJobId)
+        # endfor
+
+    # enddef
+
+    # ##################################################################################################
+    # Check whether re-attached processes are still running.
+    # As they were not started by this controller, their exit status is unknown
+    # and they are marked as ENDED_UNKNOWN when they have ended, so that they are not run again.
+    def PollReattachedProcs(self):
+        lEndedJobs = [iJobId for iJobId, tProc in self._dicProcReattached.items() if not _IsProcAlive(*tProc)]
+        if len(lEndedJobs) == 0:
+            return
+        # endif
+
+        # Journal the pending output before the end status
+        self.UpdateProcOutput(_iMaxTime_ms=0)
+
+        for iJobId in lEndedJobs:
+            del self._dicProcReattached[iJobId]
+            with self._lockProcData:
+                self._dicProcStatus[iJobId] = EProcessStatus.ENDED_UNKNOWN
+                self._setProcStatusChanged.add(iJobId)
+            # endwith
+            if self._xJournal is not None:
+                self._xJournal.WriteStatus(iJobId, EProcessStatus.ENDED_UNKNOWN.name)
+            # endif
+        # endfor
+
+    # enddef
+
+    # ##################################################################################################
+    # Job ids that have to be run (again) to complete the process group
+    def GetResumableJobs(self) -> list[int]:
+        with self._lockProcData:
+            return [
+                iJobId
+                for iJobId, eStatus in self._dicProcStatus.items()
+                if eStatus in (EProcessStatus.NOT_STARTED, EProcessStatus.INTERRUPTED)
+            ]
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    def GetJobInfo(self, iId: int) -> Optional[dict]:
+        return self._dicProcJobInfo.get(iId)
+
+    # enddef
+
+    # ##################################################################################################
+    def IsReattached(self, iId: int) -> bool:
+        return iId in self._dicProcReattached
 
     # enddef
 
@@ -154,6 +373,10 @@ class CProcessGroupHandler:
             evTerminate.set()
         # endfor
 
+        for iJobId in list(self._dicProcReattached.keys()):
+            self._TerminateReattached(iJobId)
+        # endfor
+
     # enddef
 
     # ##################################################################################################
@@ -163,6 +386,37 @@ class CProcessGroupHandler:
         # endif
 
         self._dicProcTerminateEvent[_iJobId].set()
+        if _iJobId in self._dicProcReattached:
+            self._TerminateReattached(_iJobId)
+        # endif
+
+    # enddef
+
+    # ##################################################################################################
+    def _TerminateReattached(self, _iJobId: int):
+        iPid, fCreateTime = self._dicProcReattached[_iJobId]
+        if not _IsProcAlive(iPid, fCreateTime):
+            return
+        # endif
+
+        # Re-attached processes have been verified by their creation time, which requires psutil
+        import psutil
+
+        try:
+            procRoot = psutil.Process(iPid)
+            lProcs = procRoot.children(recursive=True)
+        except (psutil.NoSuchProcess, OSError):
+            return
+        # endtry
+
+        lProcs.insert(0, procRoot)
+        for procX in lProcs:
+            try:
+                procX.terminate()
+            except (psutil.NoSuchProcess, OSError):
+                pass
+            # endtry
+        # endfor
 
     # enddef
 
@@ -180,6 +434,12 @@ class CProcessGroupHandler:
     def UpdateProcOutput(self, *, _iMaxTime_ms: int = 100, _fInitialWaitTime_s: float = 0.0):
         bFirst: bool = True
         iStartTime_ns = time.time_ns()
+
+        # Output lines per job, together with their line offset, that are written to the journal
+        dicJournalLines: dict[int, tuple[int, list[str]]] = None
+        if self._xJournal is not None and self._xJournal.bStoreOutput is True:
+            dicJournalLines = dict()
+        # endif
         while True:
             try:
                 if _fInitialWaitTime_s > 0.0 and bFirst is True:
@@ -194,6 +454,9 @@ class CProcessGroupHandler:
 
             xJobOutput: CProcessOutput = self._dicProcOutput.get(iJobId)
             if xJobOutput is not None:
+                if dicJournalLines is not None:
+                    dicJournalLines.setdefault(iJobId, (len(xJobOutput), []))[1].append(sLine)
+                # endif
                 xJobOutput.AddLine(sLine)
                 self._setProcOutputChanged.add(iJobId)
             # endif
@@ -203,6 +466,12 @@ class CProcessGroupHandler:
             # endif
         # endwhile
 
+        if dicJournalLines is not None:
+            for iJobId, (iLineOffset, lLines) in dicJournalLines.items():
+                self._xJournal.WriteOutput(iJobId, iLineOffset, lLines)
+            # endfor
+        # endif
+
     # enddef
 
     # ##################################################################################################
@@ -227,6 +496,10 @@ class CProcessGroupHandler:
                 # endif
             # endwith
 
+            if self._xJournal is not None:
+                self._xJournal.WriteStatus(iId, EProcessStatus.STARTING.name)
+            # endif
+
         # enddef
 
         return Callback
@@ -234,7 +507,7 @@ class CProcessGroupHandler:
     # enddef
 
     # ##################################################################################################
-    def _CreateCallback_ProcStarted(self, iId: int):
+    def _CreateCallback_ProcStarted(self, iId: int, _xProcHandler: CProcessHandler):
         def Callback(lCmd: list[str], iPid: int):
             with self._lockProcData:
                 if iId in self._dicProcStatus:
@@ -243,6 +516,15 @@ class CProcessGroupHandler:
                 # endif
             # endwith
 
+            if self._xJournal is not None:
+                # The process id is only meaningful on the host the process runs on
+                sHost: Optional[str] = _xProcHandler.sExecHost
+                fCreateTime = _GetProcCreateTime(iPid) if sHost == "local" else None
+                self._xJournal.WriteStatus(
+                    iId, EProcessStatus.RUNNING.name, sHost=sHost, iPid=iPid, fCreateTime=fCreateTime
+                )
+            # endif
+
         # enddef
 
         return Callback
@@ -260,6 +542,11 @@ class CProcessGroupHandler:
                 # endif
             # endwith
 
+            if self._xJournal is not None:
+                eStatus = EProcessStatus.ENDED if iReturnValue == 0 else EProcessStatus.TERMINATED
+                self._xJournal.WriteStatus(iId, eStatus.name, iReturnCode=iReturnValue, sEndMsg=sMsg)
+            # endif
+
         # enddef
 
         return Callback
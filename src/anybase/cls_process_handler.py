@@ -32,23 +32,39 @@ class CProcessHandler:
         _funcPreStart: Optional[Callable[[list], None]] = None,
         _funcPostStart: Optional[Callable[[list, int], None]] = None,
         _funcStdOut: Optional[Callable[[str], None]] = None,
+        _funcStdOutChunk: Optional[Callable[[bytes], None]] = None,
         _funcEnded: Optional[Callable[[int, str], None]] = None,
         _funcPollTerminate: Optional[Callable[[None], bool]] = None,
     ):
         self._lFuncPreStart: list[Callable[[list], None]] = []
         self._lFuncPostStart: list[Callable[[list, int], None]] = []
         self._lFuncStdOut: list[Callable[[str], None]] = []
+        self._lFuncStdOutChunk: list[Callable[[bytes], None]] = []
         self._lFuncEnded: list[Callable[[int, str], None]] = []
         self._lFuncPollTerminate: list[Callable[[None], bool]] = []
+        self._sExecHost: Optional[str] = None
 
         self.AddHandlerPreStart(_funcPreStart)
         self.AddHandlerPostStart(_funcPostStart)
         self.AddHandlerStdOut(_funcStdOut)
+        self.AddHandlerStdOutChunk(_funcStdOutChunk)
         self.AddHandlerEnded(_funcEnded)
         self.AddHandlerPollTerminate(_funcPollTerminate)
 
     # enddef
 
+    # Host of the started process, as given by the execution backend. None, if unknown.
+    @property
+    def sExecHost(self) -> Optional[str]:
+        return self._sExecHost
+
+    # enddef
+
+    def SetExecHost(self, _sHost: Optional[str]):
+        self._sExecHost = _sHost
+
+    # enddef
+
     @property
     def bPreStartAvailable(self) -> bool:
         return len(self._lFuncPreStart) > 0
@@ -67,6 +83,12 @@ class CProcessHandler:
 
     # enddef
 
+    @property
+    def bStdOutChunkAvailable(self) -> bool:
+        return len(self._lFuncStdOutChunk) > 0
+
+    # enddef
+
     @property
     def bEndedAvailable(self) -> bool:
         return len(self._lFuncEnded) > 0
@@ -103,6 +125,14 @@ class CProcessHandler:
 
     # enddef
 
+    def StdOutChunk(self, *args):
+        funcX: Callable[[bytes], None] = None
+        for funcX in self._lFuncStdOutChunk:
+            funcX(*args)
+        # endfor
+
+    # enddef
+
     def Ended(self, *args):
         funcX: Callable[[int, str], None] = None
         for funcX in self._lFuncEnded:
@@ -146,6 +176,16 @@ class CProcessHandler:
 
     # enddef
 
+    # ############################################################################
+    # Chunk handlers receive the raw bytes read from the process output.
+    # They are only called if the process is executed in chunked read mode.
+    def AddHandlerStdOutChunk(self, _funcStdOutChunk: Callable[[bytes], None]):
+        if _funcStdOutChunk is not None:
+            self._lFuncStdOutChunk.append(_funcStdOutChunk)
+        # endif
+
+    # enddef
+
     # ############################################################################
     def AddHandlerEnded(self, _funcEnded: Callable[[int, str], None]):
         if _funcEnded is not None:
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from .path import MakeNormPath
+
+
+# Append-only journal of the jobs of a 'CProcessGroupHandler'.
+# Each line of the journal file is a JSON object that describes one event:
+# job registration, status change, output lines (with their line offset) or a clear of all jobs.
+# Replaying the journal with Read() reconstructs the last known state of all jobs,
+# so that a restarted controller can re-attach to or resume the jobs.
+class CProcessJournal:
+    def __init__(self, _xPathFile: Union[str, list, tuple, Path], *, _bSync: bool = False, _bStoreOutput: bool = True):
+        self._pathFile: Path = MakeNormPath(_xPathFile)
+        self._bSync: bool = _bSync
+        self._bStoreOutput: bool = _bStoreOutput
+        self._lockWrite: threading.Lock = threading.Lock()
+        self._xFile = None
+
+    # enddef
+
+    @property
+    def pathFile(self) -> Path:
+        return self._pathFile
+
+    # enddef
+
+    @property
+    def bStoreOutput(self) -> bool:
+        return self._bStoreOutput
+
+    # enddef
+
+    # ##################################################################################################
+    def Close(self):
+        with self._lockWrite:
+            if self._xFile is not None:
+                self._xFile.close()
+                self._xFile = None
+            # endif
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    def _WriteRecords(self, _lRecords: list[dict]):
+        if len(_lRecords) == 0:
+            return
+        # endif
+
+        sText = "".join(json.dumps(dicRec) + "\n" for dicRec in _lRecords)
+        with self._lockWrite:
+            if self._xFile is None:
+                self._pathFile.parent.mkdir(parents=True, exist_ok=True)
+                self._xFile = self._pathFile.open("a", encoding="utf-8")
+                # Terminate an incomplete last record of a previous controller,
+                # so that the first new record is not appended to it.
+                if self._xFile.tell() > 0:
+                    with self._pathFile.open("rb") as xFile:
+                        xFile.seek(-1, os.SEEK_END)
+                        if xFile.read(1) != b"\n":
+                            sText = "\n" + sText
+                        # endif
+                    # endwith
+                # endif
+            # endif
+            self._xFile.write(sText)
+            self._xFile.flush()
+            if self._bSync is True:
+                os.fsync(self._xFile.fileno())
+            # endif
+        # endwith
+
+    # enddef
+
+    # ##################################################################################################
+    def _Write(self, _sEvent: str, **kwargs):
+        dicRec = {"sEvent": _sEvent, "iTime_ns": time.time_ns()}
+        dicRec.update(kwargs)
+        self._WriteRecords([dicRec])
+
+    # enddef
+
+    # ##################################################################################################
+    def WriteRegister(self, _iJobId: int, _dicJobInfo: Optional[dict] = None):
+        self._Write("register", iJobId=_iJobId, dicJobInfo=_dicJobInfo)
+
+    # enddef
+
+    # ##################################################################################################
+    def WriteStatus(self, _iJobId: int, _sStatus: str, **kwargs):
+        self._Write("status", iJobId=_iJobId, sStatus=_sStatus, **kwargs)
+
+    # enddef
+
+    # ##################################################################################################
+    def WriteOutput(self, _iJobId: int, _iLineOffset: int, _lLines: list[str]):
+        if self._bStoreOutput is False or len(_lLines) == 0:
+            return
+        # endif
+        self._Write("output", iJobId=_iJobId, iLine=_iLineOffset, lLines=_lLines)
+
+    # enddef
+
+    # ##################################################################################################
+    def WriteClear(self):
+        self._Write("clear")
+
+    # enddef
+
+    # ##################################################################################################
+    # Replays the journal file and returns the last known state of each job.
+    # The returned dictionary maps job ids to dictionaries with the elements
+    # 'dicJobInfo', 'sStatus', 'sHost', 'iPid', 'fCreateTime', 'iReturnCode', 'sEndMsg' and 'lLines'.
+    @staticmethod
+    def Read(_xPathFile: Union[str, list, tuple, Path]) -> dict[int, dict]:
+        pathFile = MakeNormPath(_xPathFile)
+        dicJobs: dict[int, dict] = dict()
+        if not pathFile.exists():
+            return dicJobs
+        # endif
+
+        with pathFile.open("r", encoding="utf-8") as xFile:
+            for sLine in xFile:
+                try:
+                    dicRec: dict = json.loads(sLine)
+                except json.JSONDecodeError:
+                    # The last record may be incomplete, if the controller died while writing
+                    continue
+                # endtry
+
+                sEvent = dicRec.get("sEvent")
+                if sEvent == "clear":
+                    dicJobs = dict()
+                    continue
+                # endif
+
+                iJobId = dicRec.get("iJobId")
+                if sEvent == "register":
+                    dicJobs[iJobId] = {
+                        "dicJobInfo": dicRec.get("dicJobInfo"),
+                        "sStatus": "NOT_STARTED",
+                        "sHost": None,
+                        "iPid": None,
+                        "fCreateTime": None,
+                        "iReturnCode": None,
+                        "sEndMsg": None,
+                        "lLines": [],
+                    }
+                    continue
+                # endif
+
+                dicJob = dicJobs.get(iJobId)
+                if dicJob is None:
+                    continue
+                # endif
+
+                if sEvent == "status":
+                    for sKey in ("sStatus", "sHost", "iPid", "fCreateTime", "iReturnCode", "sEndMsg"):
+                        if sKey in dicRec:
+                            dicJob[sKey] = dicRec[sKey]
+                        # endif
+                    # endfor
+
+                elif sEvent == "output":
+                    lLines: list = dicJob["lLines"]
+                    iLine: int = dicRec.get("iLine", len(lLines))
+                    del lLines[iLine:]
+                    lLines.extend(dicRec.get("lLines", []))
+                # endif
+            # endfor
+        # endwith
+
+        return dicJobs
+
+    # enddef
+
+
+# endclass
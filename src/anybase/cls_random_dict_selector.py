@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+from typing import Optional
+
+import numpy as np
+
+from .cls_any_error import CAnyError_Message
+
+
+# Random selection of one element of each list in a nested dictionary.
+# The dictionary is analyzed once on construction. Variants are then generated by sampling
+# the indices of all lists for all variants together from a 'numpy.random.Generator',
+# so that the result is reproducible for a given seed, also across processes and hosts.
+class CRandomDictSelector:
+    def __init__(self, _dicVal: dict):
+        self._lChoices: list[list] = []
+        self._lTemplate: list = self._Compile(_dicVal, [])
+        self._aChoiceCnt = np.array([len(lChoice) for lChoice in self._lChoices], dtype=np.int64)
+
+    # enddef
+
+    # ##################################################################################################
+    # Build the selection template: list of (key, kind, payload), where kind is
+    # 0 for constant values, 1 for the index of a list of choices, and 2 for a nested template.
+    def _Compile(self, _dicVal: dict, _lPath: list) -> list:
+        lTemplate = []
+        for sKey, xValue in _dicVal.items():
+            if isinstance(xValue, list):
+                if len(xValue) == 0:
+                    raise CAnyError_Message(
+                        sMsg="Cannot select randomly from empty list at: {}".format("/".join(_lPath + [str(sKey)]))
+                    )
+                # endif
+                lTemplate.append((sKey, 1, len(self._lChoices)))
+                self._lChoices.append(xValue)
+
+            elif isinstance(xValue, dict):
+                lTemplate.append((sKey, 2, self._Compile(xValue, _lPath + [str(sKey)])))
+
+            else:
+                lTemplate.append((sKey, 0, xValue))
+            # endif
+        # endfor
+        return lTemplate
+
+    # enddef
+
+    # ##################################################################################################
+    # Number of lists to select from
+    @property
+    def iChoiceCount(self) -> int:
+        return len(self._lChoices)
+
+    # enddef
+
+    # ##################################################################################################
+    # Number of different variants
+    @property
+    def iVariantCount(self) -> int:
+        iCnt = 1
+        for lChoice in self._lChoices:
+            iCnt *= len(lChoice)
+        # endfor
+        return iCnt
+
+    # enddef
+
+    # ##################################################################################################
+    # Sample the selection indices for '_iCount' variants.
+    # Returns an array of shape (_iCount, iChoiceCount).
+    def SampleIndices(self, _iCount: int, *, xRng: np.random.Generator) -> np.ndarray:
+        return xRng.integers(0, self._aChoiceCnt, size=(_iCount, len(self._aChoiceCnt)))
+
+    # enddef
+
+    # ##################################################################################################
+    def _Build(self, _lTemplate: list, _lIdx: list) -> dict:
+        dicSel = {}
+        for sKey, iKind, xPayload in _lTemplate:
+            if iKind == 1:
+                dicSel[sKey] = self._lChoices[xPayload][_lIdx[xPayload]]
+            elif iKind == 2:
+                dicSel[sKey] = self._Build(xPayload, _lIdx)
+            else:
+                dicSel[sKey] = xPayload
+            # endif
+        # endfor
+        return dicSel
+
+    # enddef
+
+    # ##################################################################################################
+    # Generate '_iCount' variants. If no generator is given, a new generator is created
+    # with the given seed, or with fresh entropy if the seed is None.
+    def SelectMany(
+        self, _iCount: int, *, xRng: Optional[np.random.Generator] = None, iSeed: Optional[int] = None
+    ) -> list[dict]:
+        if xRng is None:
+            xRng = np.random.default_rng(iSeed)
+        # endif
+
+        aIdx = self.SampleIndices(_iCount, xRng=xRng)
+        return [self._Build(self._lTemplate, lIdx) for lIdx in aIdx.tolist()]
+
+    # enddef
+
+    # ##################################################################################################
+    def Select(self, *, xRng: Optional[np.random.Generator] = None, iSeed: Optional[int] = None) -> dict:
+        return self.SelectMany(1, xRng=xRng, iSeed=iSeed)[0]
+
+    # enddef
+
+
+# endclass
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+
+# Transparent compression of files, selected by the last suffix of the file name,
+# e.g. 'data.json.gz', 'data.json.zst' or 'data.pkl.lz4'.
+# gzip, bz2 and xz are always available, zstd and lz4 only if the packages
+# 'zstandard' and 'lz4' are installed. All streams compress and decompress incrementally,
+# and appending to a compressed file creates a new frame, which is read transparently.
+
+import io
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+# endtry
+
+try:
+    import lz4.frame as lz4frame
+except ImportError:
+    lz4frame = None
+# endtry
+
+
+#######################################################################
+# Stream factories: take an open binary file and return a binary stream,
+# which does not close the file when it is closed.
+def _ReadGzip(_xFile: BinaryIO) -> BinaryIO:
+    return gzip.GzipFile(fileobj=_xFile, mode="rb")
+
+
+# enddef
+
+
+def _WriteGzip(_xFile: BinaryIO, _iLevel: int) -> BinaryIO:
+    return gzip.GzipFile(fileobj=_xFile, mode="wb", compresslevel=_iLevel, mtime=0)
+
+
+# enddef
+
+
+def _ReadBz2(_xFile: BinaryIO) -> BinaryIO:
+    return bz2.BZ2File(_xFile, mode="rb")
+
+
+# enddef
+
+
+def _WriteBz2(_xFile: BinaryIO, _iLevel: int) -> BinaryIO:
+    return bz2.BZ2File(_xFile, mode="wb", compresslevel=_iLevel)
+
+
+# enddef
+
+
+def _ReadXz(_xFile: BinaryIO) -> BinaryIO:
+    return lzma.LZMAFile(_xFile, mode="rb")
+
+
+# enddef
+
+
+def _WriteXz(_xFile: BinaryIO, _iLevel: int) -> BinaryIO:
+    return lzma.LZMAFile(_xFile, mode="wb", preset=_iLevel)
+
+
+# enddef
+
+
+def _ReadZstd(_xFile: BinaryIO) -> BinaryIO:
+    xReader = zstandard.ZstdDecompressor().stream_reader(_xFile, read_across_frames=True, closefd=False)
+    return io.BufferedReader(xReader)
+
+
+# enddef
+
+
+def _WriteZstd(_xFile: BinaryIO, _iLevel: int) -> BinaryIO:
+    return zstandard.ZstdCompressor(level=_iLevel).stream_writer(_xFile, closefd=False)
+
+
+# enddef
+
+
+def _ReadLz4(_xFile: BinaryIO) -> BinaryIO:
+    return lz4frame.LZ4FrameFile(_xFile, mode="rb")
+
+
+# enddef
+
+
+def _WriteLz4(_xFile: BinaryIO, _iLevel: int) -> BinaryIO:
+    return lz4frame.LZ4FrameFile(_xFile, mode="wb", compression_level=_iLevel)
+
+
+# enddef
+
+
+#######################################################################
+# Registered compression formats: suffix -> (reader, writer, default level)
+g_dicCompression: dict[str, tuple[Callable, Callable, int]] = {
+    ".gz": (_ReadGzip, _WriteGzip, 6),
+    ".bz2": (_ReadBz2, _WriteBz2, 9),
+    ".xz": (_ReadXz, _WriteXz, 6),
+}
+if zstandard is not None:
+    g_dicCompression[".zst"] = (_ReadZstd, _WriteZstd, 3)
+# endif
+if lz4frame is not None:
+    g_dicCompression[".lz4"] = (_ReadLz4, _WriteLz4, 0)
+# endif
+
+# Suffixes that denote compression, also if the package for the format is not installed
+g_setCompressSuffix: set[str] = {".gz", ".bz2", ".xz", ".zst", ".lz4"}
+
+
+#######################################################################
+# Returns the list of compression suffixes, which can be read and written
+def GetSuffixes() -> list[str]:
+    return list(g_dicCompression.keys())
+
+
+# enddef
+
+
+#######################################################################
+# Returns the compression suffix of a file path, or None if the file is not compressed
+def GetCompression(_pathFile: Path) -> Optional[str]:
+    sSuffix = _pathFile.suffix.lower()
+    if sSuffix in g_setCompressSuffix:
+        return sSuffix
+    # endif
+    return None
+
+
+# enddef
+
+
+#######################################################################
+# Returns the path without the compression suffix, e.g. 'data.json' for 'data.json.gz'
+def GetDataPath(_pathFile: Path) -> Path:
+    if GetCompression(_pathFile) is None:
+        return _pathFile
+    # endif
+    return _pathFile.with_suffix("")
+
+
+# enddef
+
+
+#######################################################################
+# Extend a list of file suffixes by their compressed variants.
+# The uncompressed suffixes come first, so that they are preferred by the file discovery.
+def ExtendSuffixes(_lSuffixes: list[str]) -> list[str]:
+    lResult = list(_lSuffixes)
+    for sCompress in g_dicCompression:
+        lResult.extend(sSuffix + sCompress for sSuffix in _lSuffixes)
+    # endfor
+    return lResult
+
+
+# enddef
+
+
+#######################################################################
+def _GetFormat(_sCompress: str) -> tuple[Callable, Callable, int]:
+    tFormat = g_dicCompression.get(_sCompress)
+    if tFormat is None:
+        from .cls_any_error import CAnyError_Message
+
+        raise CAnyError_Message(
+            sMsg="Compression format '{}' is not available. Available formats are: {}".format(
+                _sCompress, ", ".join(g_dicCompression.keys())
+            )
+        )
+    # endif
+    return tFormat
+
+
+# enddef
+
+
+#######################################################################
+# Raise an error, if the given compression format cannot be used
+def CheckAvailable(_sCompress: str):
+    _GetFormat(_sCompress)
+
+
+# enddef
+
+
+#######################################################################
+# Wrap an open binary file in a decompressing stream
+def WrapRead(_xFile: BinaryIO, _sCompress: str) -> BinaryIO:
+    funcRead, _, _ = _GetFormat(_sCompress)
+    return funcRead(_xFile)
+
+
+# enddef
+
+
+#######################################################################
+# Wrap an open binary file in a compressing stream.
+# If 'iLevel' is None, the default level of the format is used.
+def WrapWrite(_xFile: BinaryIO, _sCompress: str, *, iLevel: Optional[int] = None) -> BinaryIO:
+    _, funcWrite, iDefaultLevel = _GetFormat(_sCompress)
+    return funcWrite(_xFile, iDefaultLevel if iLevel is None else iLevel)
+
+
+# enddef
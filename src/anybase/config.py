@@ -24,16 +24,20 @@
 # </LICENSE>
 ###
 
+import re
 import sys
-import copy
-from typing import Any, Iterable, Optional, Union, TypeVar
+import functools
+from typing import Any, Iterable, Iterator, Optional, Union, TypeVar
 from pathlib import Path
 
 import ison
 from . import path
 from . import file
+from . import compress
 from . import filepathvars
 from .cls_any_error import CAnyError_TaskMessage, CAnyError_Message
+from .cls_frozen_config import Freeze
+from .cls_import_graph import CImportGraph
 
 from . import assertion
 
@@ -72,7 +76,7 @@ class CDtiInfo:
 ####################################################################################
 def ProvideReadFilepathExt(_xPathFile: Union[str, list, tuple, Path]):
     pathConfig = path.MakeNormPath(_xPathFile)
-    pathConfigExt = path.ProvideReadFilepathExt(pathConfig, [".json", ".json5", ".ison"])
+    pathConfigExt = path.ProvideReadFilepathExt(pathConfig, compress.ExtendSuffixes([".json", ".json5", ".ison"]))
     if pathConfigExt is None:
         if len(pathConfig.suffix) == 0:
             sMsg = "Config file '{0}' not found at path: {1}[.json, .json5, .ison]".format(
@@ -90,8 +94,30 @@ def ProvideReadFilepathExt(_xPathFile: Union[str, list, tuple, Path]):
 # enddef
 
 
+# Dependency graph of the files imported with '$import', which caches the loaded data per file
+g_xImportGraph = CImportGraph()
+
+
+####################################################################################
+def GetImportGraph() -> CImportGraph:
+    return g_xImportGraph
+
+
+# enddef
+
+
 ####################################################################################
-# Load a config file and check its validity
+def ClearImportCache():
+    g_xImportGraph.Clear()
+
+
+# enddef
+
+
+####################################################################################
+# Load a config file and check its validity.
+# If 'bFrozen' is True, the configuration is returned as immutable, hashable CFrozenDict,
+# which can be shared without copies. See cls_frozen_config.
 def Load(
     _xPathFile: Union[str, list, tuple, Path],
     *,
@@ -100,8 +126,8 @@ def Load(
     bAddPathVars: bool = False,
     bDoThrow: bool = True,
     dicCustomVars: dict = None,
+    bFrozen: bool = False,
 ) -> dict:
-    from .cls_anycml import CAnyCML
 
     try:
         pathConfig = ProvideReadFilepathExt(_xPathFile)
@@ -115,19 +141,132 @@ def Load(
     # endif
 
     dicCfg = file.LoadJson(pathConfig)
-
-    dicRes = CheckConfigType(dicCfg, sDTI)
+    # The imports of the file are recorded again, when they are processed
+    g_xImportGraph.ResetImports(pathConfig.as_posix())
+
+    dicRes = _ProcessLoaded(
+        pathConfig,
+        dicCfg,
+        sDTI=sDTI,
+        bReplacePureVars=bReplacePureVars,
+        bAddPathVars=bAddPathVars,
+        dicCustomVars=dicCustomVars,
+        bFrozen=bFrozen,
+    )
     if not dicRes.get("bOK"):
-        sTask = "Invalid configuration file '{0}'".format(pathConfig.as_posix())
-        sMsg = dicRes.get("sMsg")
         if bDoThrow:
-            raise CAnyError_TaskMessage(sTask=sTask, sMsg=sMsg)
+            raise CAnyError_TaskMessage(sTask=dicRes["sTask"], sMsg=dicRes["sMsg"])
         else:
-            sMsg = "{}: {}".format(sTask, sMsg)
+            sMsg = "{}: {}".format(dicRes["sTask"], dicRes["sMsg"])
             return {"bOK": False, "sMsg": sMsg, "dicCfg": None}
         # endif
     # endif
 
+    if bDoThrow:
+        return dicRes["dicCfg"]
+    else:
+        return {"bOK": True, "sMsg": "", "dicCfg": dicRes["dicCfg"]}
+    # endif
+
+
+# enddef
+
+
+####################################################################################
+# Simple variable reference, that can be replaced without the ISON parser
+g_reSimpleVarRef = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+####################################################################################
+# Find all strings in the data, that contain variable references.
+# Returns a list of (container, key) tuples of these strings, or None if the data
+# contains anything other than simple references '${name}', or special keys starting with '__',
+# which have to be processed by the ISON parser.
+def _ScanVarRefs(_xData: Union[dict, list]) -> Optional[list]:
+    lVarRefs = []
+    lStack = [_xData]
+    while len(lStack) > 0:
+        xContainer = lStack.pop()
+        iterItems = xContainer.items() if isinstance(xContainer, dict) else enumerate(xContainer)
+        for xKey, xValue in iterItems:
+            if isinstance(xKey, str) and ("$" in xKey or xKey.startswith("__")):
+                return None
+            # endif
+
+            if isinstance(xValue, str):
+                if "$" in xValue:
+                    if xValue.count("$") != len(g_reSimpleVarRef.findall(xValue)):
+                        return None
+                    # endif
+                    lVarRefs.append((xContainer, xKey))
+                # endif
+            elif isinstance(xValue, (dict, list)):
+                lStack.append(xValue)
+            # endif
+        # endfor
+    # endwhile
+
+    return lVarRefs
+
+
+# enddef
+
+
+####################################################################################
+# Replace the simple variable references found by _ScanVarRefs() in place.
+# Nothing is replaced and False is returned, if a variable is not defined, or its value
+# is not a string without variable references, as then the ISON parser is needed.
+def _ReplaceSimpleVarRefs(_lVarRefs: list, _dicVars: dict) -> bool:
+    if len(_lVarRefs) == 0:
+        return True
+    # endif
+
+    def _GetVar(_xMatch: re.Match) -> str:
+        sValue = _dicVars[_xMatch.group(1)]
+        if not isinstance(sValue, str) or "$" in sValue:
+            raise KeyError(_xMatch.group(1))
+        # endif
+        return sValue
+
+    # enddef
+
+    try:
+        lValues = [g_reSimpleVarRef.sub(_GetVar, xContainer[xKey]) for xContainer, xKey in _lVarRefs]
+    except KeyError:
+        return False
+    # endtry
+
+    for (xContainer, xKey), sValue in zip(_lVarRefs, lValues):
+        xContainer[xKey] = sValue
+    # endfor
+
+    return True
+
+
+# enddef
+
+
+####################################################################################
+# Check the DTI of loaded config data and replace the variables as in Load()
+def _ProcessLoaded(
+    _pathConfig: Path,
+    _dicCfg: dict,
+    *,
+    sDTI: str,
+    bReplacePureVars: bool,
+    bAddPathVars: bool,
+    dicCustomVars: Optional[dict],
+    bFrozen: bool = False,
+) -> dict:
+    pathConfig = _pathConfig
+    dicCfg = _dicCfg
+
+    dicRes = CheckConfigType(dicCfg, sDTI)
+    if not dicRes.get("bOK"):
+        sTask = "Invalid configuration file '{0}'".format(pathConfig.as_posix())
+        return {"bOK": False, "sTask": sTask, "sMsg": dicRes.get("sMsg"), "dicCfg": None}
+    # endif
+
     # Replace variables in top id element if present.
     # If no 'sId' tag is present then create one with the filebasename.
     if dicCfg.get("sId") is None:
@@ -142,20 +281,124 @@ def Load(
     # endif
 
     if bReplacePureVars is True:
-        xCML = CAnyCML(dicConstVars=dicPathVars)
-        dicCfg = xCML.ReplacePureVars(dicCfg)
+        # Most configurations contain no variables or only simple references like '${filebasename}'.
+        # These are replaced directly, and the ISON parser is only used for all other cases.
+        lVarRefs = _ScanVarRefs(dicCfg)
+        if lVarRefs is None or not _ReplaceSimpleVarRefs(lVarRefs, dicPathVars):
+            from .cls_anycml import CAnyCML
+
+            xCML = CAnyCML(dicConstVars=dicPathVars)
+            dicCfg = xCML.ReplacePureVars(dicCfg)
+        # endif
     # endif
 
     if bAddPathVars is True:
         ison.util.data.AddVarsToData(dicCfg, dicLocals=dicPathVars)
     # endif
 
-    if bDoThrow:
-        return dicCfg
-    else:
-        return {"bOK": True, "sMsg": "", "dicCfg": dicCfg}
+    if bFrozen is True:
+        dicCfg = Freeze(dicCfg)
     # endif
 
+    return {"bOK": True, "sTask": "", "sMsg": "", "dicCfg": dicCfg}
+
+
+# enddef
+
+
+####################################################################################
+# Load many config files, reading the files in parallel with file.LoadJsonMany().
+# The DTI check and variable replacement is done for each file as in Load().
+# Returns a dictionary with the elements:
+#   "lResults": list of dictionaries, one per given path in the same order, with the elements
+#               "pathFile", "bOK", "sMsg" and "dicCfg", as returned by Load() with 'bDoThrow=False'.
+#               The configurations are frozen if 'bFrozen' is True.
+#   "dicStats": the loading statistics as returned by file.LoadJsonMany()
+def LoadMany(
+    _iterPathFiles: Iterable,
+    *,
+    sDTI: str = "/*:*.*",
+    bReplacePureVars: bool = True,
+    bAddPathVars: bool = False,
+    dicCustomVars: dict = None,
+    iMaxThreads: int = 16,
+    iMaxProcesses: Optional[int] = None,
+    bFrozen: bool = False,
+) -> dict:
+
+    dicLoad = file.LoadJsonMany(
+        _iterPathFiles,
+        iMaxThreads=iMaxThreads,
+        iMaxProcesses=iMaxProcesses,
+        funcProvidePath=ProvideReadFilepathExt,
+    )
+
+    lResults = []
+    for dicFile in dicLoad["lResults"]:
+        pathConfig = dicFile["pathFile"]
+        if not dicFile["bOK"]:
+            lResults.append({"pathFile": pathConfig, "bOK": False, "sMsg": dicFile["sMsg"], "dicCfg": None})
+            continue
+        # endif
+
+        try:
+            dicRes = _ProcessLoaded(
+                pathConfig,
+                dicFile["xData"],
+                sDTI=sDTI,
+                bReplacePureVars=bReplacePureVars,
+                bAddPathVars=bAddPathVars,
+                dicCustomVars=dicCustomVars,
+                bFrozen=bFrozen,
+            )
+        except Exception as xEx:
+            dicRes = {"bOK": False, "sTask": "Error processing configuration file", "sMsg": str(xEx)}
+        # endtry
+
+        if dicRes["bOK"]:
+            lResults.append({"pathFile": pathConfig, "bOK": True, "sMsg": "", "dicCfg": dicRes["dicCfg"]})
+        else:
+            sMsg = "{}: {}".format(dicRes["sTask"], dicRes["sMsg"])
+            lResults.append({"pathFile": pathConfig, "bOK": False, "sMsg": sMsg, "dicCfg": None})
+        # endif
+    # endfor
+
+    return {"lResults": lResults, "dicStats": dicLoad["dicStats"]}
+
+
+# enddef
+
+
+####################################################################################
+# Iterate over the elements of an array in a large data file, after checking the DTI
+# of the file. Only the scalar elements of the top-level object are loaded for the DTI check,
+# and the array elements are read one at a time.
+# No variable substitution is applied to the elements. Only strict JSON files (.json) are supported.
+def IterArray(
+    _xPathFile: Union[str, list, tuple, Path],
+    *,
+    sPointer: str,
+    sDTI: str = "/*:*.*",
+) -> Iterator:
+    pathConfig = ProvideReadFilepathExt(_xPathFile)
+    if compress.GetDataPath(pathConfig).suffix != ".json":
+        raise CAnyError_Message(
+            sMsg="Only strict JSON files with suffix '.json' can be iterated, but found: {0}".format(
+                pathConfig.as_posix()
+            )
+        )
+    # endif
+
+    dicHeader = file.LoadJsonHeader(pathConfig)
+    dicRes = CheckConfigType(dicHeader, sDTI)
+    if not dicRes.get("bOK"):
+        raise CAnyError_TaskMessage(
+            sTask="Invalid data file '{0}'".format(pathConfig.as_posix()), sMsg=dicRes.get("sMsg")
+        )
+    # endif
+
+    yield from file.IterJsonArray(pathConfig, sPointer)
+
 
 # enddef
 
@@ -168,7 +411,8 @@ def Save(
     *,
     sDTI: Optional[str] = None,
 ):
-    dicData = copy.deepcopy(_dicData)
+    # Only the top level is modified, so that a shallow copy suffices
+    dicData = dict(_dicData)
 
     # Add an empty DTI field if it does not exist
     if "sDTI" not in dicData:
@@ -479,33 +723,251 @@ def GetDataBlocksOfType(_dicData: dict, _sDti: str) -> list:
 
 
 ####################################################################################
-# Get dictionary at given path of nested dictionaries
+# Compiled key path like "a/b/c" for accessing elements of nested dictionaries and lists.
+# Path segments are
+#   - dictionary keys,
+#   - list indices, e.g. "a/0/b", where negative indices count from the end of the list,
+#   - DTI keys in angle brackets, e.g. "a/</catharsys/camera:1>/b", which select the first
+#     dictionary key, that is a DTI compatible with the given one. Segments in angle brackets
+#     that are no valid DTI are literal dictionary keys.
+# Elements with value None are treated as not existing, as in GetDictValue().
+class CKeyPath:
+    # Segment kinds
+    c_iKey: int = 0
+    c_iDti: int = 1
+
+    def __init__(self, _sPath: str):
+        self._sPath: str = _sPath
+        lSegments = []
+        for sSegment in self._Split(_sPath):
+            if len(sSegment) > 1 and sSegment.startswith("<") and sSegment.endswith(">"):
+                try:
+                    SplitDti(sSegment[1:-1])
+                    bIsDti = True
+                except (ValueError, CAnyError_Message):
+                    bIsDti = False
+                # endtry
+            else:
+                bIsDti = False
+            # endif
+
+            if bIsDti is True:
+                lSegments.append((CKeyPath.c_iDti, sSegment[1:-1], None))
+            else:
+                try:
+                    iIdx = int(sSegment)
+                except ValueError:
+                    iIdx = None
+                # endtry
+                lSegments.append((CKeyPath.c_iKey, sSegment, iIdx))
+            # endif
+        # endfor
+        self._tSegments: tuple = tuple(lSegments)
+
+    # enddef
+
+    # ##################################################################################################
+    # Split the path at '/', but not within DTI segments in angle brackets
+    @staticmethod
+    def _Split(_sPath: str) -> list[str]:
+        if "<" not in _sPath:
+            return _sPath.split("/")
+        # endif
+
+        lSegments = []
+        iStart = 0
+        iDepth = 0
+        for iPos, sChar in enumerate(_sPath):
+            if sChar == "<":
+                iDepth += 1
+            elif sChar == ">" and iDepth > 0:
+                iDepth -= 1
+            elif sChar == "/" and iDepth == 0:
+                lSegments.append(_sPath[iStart:iPos])
+                iStart = iPos + 1
+            # endif
+        # endfor
+        lSegments.append(_sPath[iStart:])
+        return lSegments
+
+    # enddef
+
+    # ##################################################################################################
+    @property
+    def sPath(self) -> str:
+        return self._sPath
+
+    # enddef
+
+    def __repr__(self) -> str:
+        return "CKeyPath('{}')".format(self._sPath)
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the first key that is a DTI compatible with the given one.
+    # Keys that are not DTIs, like "time:stamp", are skipped.
+    @staticmethod
+    def _FindDtiKey(_dicX: dict, _sDti: str) -> Optional[str]:
+        for sDicKey in _dicX:
+            if not isinstance(sDicKey, str):
+                continue
+            # endif
+
+            try:
+                bOK = CheckDti(sDicKey, _sDti)["bOK"]
+            except (ValueError, CAnyError_Message):
+                continue
+            # endtry
+
+            if bOK is True:
+                return sDicKey
+            # endif
+        # endfor
+        return None
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the element of a container for a segment, or None if it does not exist
+    @staticmethod
+    def _GetElement(_xContainer: Any, _tSegment: tuple) -> Any:
+        iKind, sKey, iIdx = _tSegment
+        if isinstance(_xContainer, dict):
+            if iKind == CKeyPath.c_iDti:
+                sKey = CKeyPath._FindDtiKey(_xContainer, sKey)
+                if sKey is None:
+                    return None
+                # endif
+            # endif
+            return _xContainer.get(sKey)
+
+        elif iIdx is not None and isinstance(_xContainer, list):
+            if -len(_xContainer) <= iIdx < len(_xContainer):
+                return _xContainer[iIdx]
+            # endif
+        # endif
+
+        return None
+
+    # enddef
+
+    # ##################################################################################################
+    # Returns the element at the path, or 'xDefault' if it does not exist
+    def Get(self, _xData: Any, xDefault: Any = None) -> Any:
+        xValue = _xData
+        for tSegment in self._tSegments:
+            xValue = CKeyPath._GetElement(xValue, tSegment)
+            if xValue is None:
+                return xDefault
+            # endif
+        # endfor
+        return xValue
+
+    # enddef
+
+    # ##################################################################################################
+    def Exists(self, _xData: Any) -> bool:
+        return self.Get(_xData) is not None
+
+    # enddef
+
+    # ##################################################################################################
+    # Set the element at the path. Missing dictionaries along the path are created.
+    # For a DTI segment without a matching key, the DTI is used as key.
+    def Set(self, _xData: Any, _xValue: Any):
+        xContainer = _xData
+        iLastIdx = len(self._tSegments) - 1
+        for iSegIdx, (iKind, sKey, iIdx) in enumerate(self._tSegments):
+            if isinstance(xContainer, dict):
+                if iKind == CKeyPath.c_iDti:
+                    sKey = CKeyPath._FindDtiKey(xContainer, sKey) or sKey
+                # endif
+                xKey = sKey
+
+            elif iIdx is not None and isinstance(xContainer, list):
+                if not -len(xContainer) <= iIdx < len(xContainer):
+                    raise CAnyError_Message(
+                        sMsg="List index '{}' out of range in key path '{}'".format(sKey, self._sPath)
+                    )
+                # endif
+                xKey = iIdx
+
+            else:
+                raise CAnyError_Message(
+                    sMsg="Cannot set element '{}' of key path '{}' in element of type '{}'".format(
+                        sKey, self._sPath, type(xContainer).__name__
+                    )
+                )
+            # endif
+
+            if iSegIdx == iLastIdx:
+                xContainer[xKey] = _xValue
+            else:
+                xNext = xContainer[xKey] if isinstance(xContainer, list) else xContainer.get(xKey)
+                if xNext is None:
+                    xNext = xContainer[xKey] = {}
+                # endif
+                xContainer = xNext
+            # endif
+        # endfor
+
+    # enddef
+
+
+# endclass
+
+
+####################################################################################
+# Returns the compiled accessor for a key path. Accessors are cached.
+@functools.lru_cache(maxsize=4096)
+def CompileKeyPath(_sPath: str) -> CKeyPath:
+    return CKeyPath(_sPath)
+
+
+# enddef
+
+
+####################################################################################
+# Set element at given path of nested dictionaries. See CKeyPath for the path syntax.
 def SetElementAtPath(_dicData: dict, _sPath: str, _xEl: Any):
     assertion.FuncArgTypes()
 
-    lPath = _sPath.split("/")
+    CompileKeyPath(_sPath).Set(_dicData, _xEl)
 
-    dicX = _dicData
-    for iIdx in range(0, len(lPath)):
-        sX = lPath[iIdx]
-        dicY = dicX.get(sX)
-        if dicY is None:
-            if iIdx < len(lPath) - 1:
-                dicX[sX] = {}
-                dicX = dicX[sX]
-            else:
-                dicX[sX] = _xEl
-                break
+
+# enddef
+
+
+######################################################################################
+# Iterate over the paths of all dictionaries with an 'sDTI' element in nested dictionaries,
+# together with these dictionaries. Only dictionaries whose DTI matches 'sDTI' are returned,
+# if 'sDTI' is given. Dictionaries with an 'sDTI' element are not searched further.
+# Yields tuples (path, dictionary), where the path is a tuple of keys if 'bTuplePaths'
+# is True, and a string of the keys separated by '/' otherwise.
+def IterDictPaths(_dicX: dict, sDTI: Optional[str] = None, *, bTuplePaths: bool = False) -> Iterator:
+
+    # Depth-first traversal with an explicit stack, so that each element is yielded directly
+    lStack = [(iter(_dicX.items()), ())]
+    while len(lStack) > 0:
+        iterItems, tPath = lStack[-1]
+        for sEl, dicSub in iterItems:
+            if not isinstance(dicSub, dict):
+                continue
             # endif
-        else:
-            if iIdx == len(lPath) - 1:
-                dicX[sX] = _xEl
+
+            if "sDTI" not in dicSub:
+                lStack.append((iter(dicSub.items()), tPath + (sEl,)))
                 break
-            else:
-                dicX = dicY
+
+            elif sDTI is None or CheckDti(dicSub.get("sDTI"), sDTI).get("bOK"):
+                tElPath = tPath + (sEl,)
+                yield (tElPath if bTuplePaths else "/".join(map(str, tElPath))), dicSub
             # endif
-        # endif
-    # endfor
+        else:
+            lStack.pop()
+        # endfor
+    # endwhile
 
 
 # enddef
@@ -515,30 +977,58 @@ def SetElementAtPath(_dicData: dict, _sPath: str, _xEl: Any):
 def GetDictPaths(_dicX: dict, sDTI: Optional[str] = None) -> list:
     assertion.FuncArgTypes()
 
-    lPaths = []
-    for sEl in _dicX:
-        dicSub = _dicX.get(sEl)
-        if isinstance(dicSub, dict):
-            if "sDTI" not in dicSub:
-                lSubPaths = GetDictPaths(dicSub, sDTI=sDTI)
-                lPaths.extend(["{0}/{1}".format(sEl, x) for x in lSubPaths])
+    return [sPath for sPath, _ in IterDictPaths(_dicX, sDTI=sDTI)]
 
-            elif isinstance(sDTI, str):
-                dicR = CheckDti(dicSub.get("sDTI"), sDTI)
-                if dicR.get("bOK"):
-                    lPaths.append(sEl)
-                # endif
 
-            else:
-                lPaths.append(sEl)
+# enddef
+
+
+######################################################################################
+# Index of the values at key paths in a nested dictionary, like "a/b/c".
+# Paths are resolved as by GetDictValue() with 'bAllowKeyPath=True', and the results
+# are cached, so that repeated look-ups of the same path take constant time.
+# The dictionary must not be modified while the index is used, or the index has to be cleared.
+class CDictPathIndex:
+    def __init__(self, _dicX: dict):
+        self._dicX: dict = _dicX
+        self._dicIndex: dict[str, Any] = {}
+
+    # enddef
+
+    @property
+    def dicData(self) -> dict:
+        return self._dicX
+
+    # enddef
+
+    def Clear(self):
+        self._dicIndex.clear()
+
+    # enddef
+
+    # Returns the value at the given path, or 'xDefault' if the path does not exist
+    def Get(self, _sPath: str, xDefault: Any = None) -> Any:
+        try:
+            xValue = self._dicIndex[_sPath]
+        except KeyError:
+            xValue = self._dicX.get(_sPath)
+            if xValue is None:
+                xValue = CompileKeyPath(_sPath).Get(self._dicX)
             # endif
-        # endif is dict
-    # endfor
+            self._dicIndex[_sPath] = xValue
+        # endtry
 
-    return lPaths
+        return xDefault if xValue is None else xValue
 
+    # enddef
 
-# enddef
+    def __contains__(self, _sPath: str) -> bool:
+        return self.Get(_sPath) is not None
+
+    # enddef
+
+
+# endclass
 
 
 ######################################################################################
@@ -587,24 +1077,7 @@ def GetDictValue(
 
         if xValue is None and bAllowKeyPath is True:
             # Try interpreting key as path
-            bFoundValue = True
-            lKey: list[str] = _sKey.split("/")
-            dicY = _dicX
-            for sPartKey in lKey:
-                if not isinstance(dicY, dict):
-                    bFoundValue = False
-                    break
-                # endif
-                dicY = dicY.get(sPartKey)
-                if dicY is None:
-                    bFoundValue = False
-                    break
-                # endif
-            # endfor partial keys
-
-            if bFoundValue is True:
-                xValue = dicY
-            # endif
+            xValue = CompileKeyPath(_sKey).Get(_dicX)
         # endif
     # endif
 
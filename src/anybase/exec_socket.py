@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+
+# Message framing for the socket execution backend ('cls_exec_agent.CExecAgent' and
+# 'cls_exec_backend_socket.CExecBackendSocket').
+# Each frame consists of the lengths of a JSON header and a binary payload,
+# followed by the header and the payload. All output streams of the jobs of
+# one connection are multiplexed over the same socket, using the job id in the header.
+# Before any other frame is exchanged, the agent and the client authenticate each other
+# with a challenge-response handshake, based on a shared secret. See AuthenticateClient().
+
+import os
+import hmac
+import json
+import stat
+import socket
+import struct
+import hashlib
+import secrets
+from typing import Optional, Union
+
+from .cls_any_error import CAnyError_Message
+
+# An address is either the path of a Unix domain socket, a (host, port) tuple for TCP,
+# or a port number for TCP on the local host.
+TAddress = Union[str, tuple[str, int], int]
+
+g_xFrameHeader = struct.Struct(">II")
+
+# Maximal size of the frames exchanged during authentication
+g_iMaxAuthFrameSize: int = 4096
+g_iAuthNonceSize: int = 32
+
+
+#################################################################################################################
+def _GetSocketAddress(_xAddress: TAddress) -> Union[str, tuple[str, int]]:
+    if isinstance(_xAddress, int):
+        return ("127.0.0.1", _xAddress)
+    elif isinstance(_xAddress, list):
+        return tuple(_xAddress)
+    # endif
+    return _xAddress
+
+
+# enddef
+
+
+#################################################################################################################
+def _GetSocketFamily(_xAddress: TAddress) -> int:
+    _xAddress = _GetSocketAddress(_xAddress)
+    if isinstance(_xAddress, str):
+        if not hasattr(socket, "AF_UNIX"):
+            raise CAnyError_Message(sMsg="Unix domain sockets are not supported on this platform")
+        # endif
+        return socket.AF_UNIX
+    elif isinstance(_xAddress, (tuple, list)) and len(_xAddress) == 2:
+        return socket.AF_INET6 if ":" in _xAddress[0] else socket.AF_INET
+    # endif
+
+    raise CAnyError_Message(sMsg=f"Invalid socket address: {_xAddress}")
+
+
+# enddef
+
+
+#################################################################################################################
+# Remove a stale Unix domain socket file. Any other type of file at the path is not removed.
+def RemoveSocketFile(_sPath: str):
+    try:
+        xStat = os.lstat(_sPath)
+    except FileNotFoundError:
+        return
+    # endtry
+
+    if not stat.S_ISSOCK(xStat.st_mode):
+        raise CAnyError_Message(sMsg=f"Path for Unix domain socket exists and is not a socket: {_sPath}")
+    # endif
+    os.remove(_sPath)
+
+
+# enddef
+
+
+#################################################################################################################
+# Create a listening socket. A Unix domain socket is only accessible by the current user.
+def CreateServerSocket(_xAddress: TAddress, *, _iBacklog: int = 16) -> socket.socket:
+    iFamily = _GetSocketFamily(_xAddress)
+    xAddress = _GetSocketAddress(_xAddress)
+    xSocket = socket.socket(iFamily, socket.SOCK_STREAM)
+    try:
+        if iFamily == socket.AF_UNIX:
+            RemoveSocketFile(xAddress)
+            xSocket.bind(xAddress)
+            # Connections are only accepted after listen()
+            os.chmod(xAddress, 0o600)
+        else:
+            xSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            xSocket.bind(xAddress)
+        # endif
+        xSocket.listen(_iBacklog)
+    except BaseException:
+        xSocket.close()
+        raise
+    # endtry
+    return xSocket
+
+
+# enddef
+
+
+#################################################################################################################
+def CreateClientSocket(_xAddress: TAddress, *, _fTimeout_s: Optional[float] = 10.0) -> socket.socket:
+    iFamily = _GetSocketFamily(_xAddress)
+    xSocket = socket.socket(iFamily, socket.SOCK_STREAM)
+    xSocket.settimeout(_fTimeout_s)
+    try:
+        xSocket.connect(_GetSocketAddress(_xAddress))
+    except OSError as xEx:
+        xSocket.close()
+        raise CAnyError_Message(sMsg=f"Cannot connect to execution agent at: {_xAddress}", xChildEx=xEx)
+    # endtry
+    xSocket.settimeout(None)
+    if iFamily != socket.AF_UNIX:
+        xSocket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # endif
+    return xSocket
+
+
+# enddef
+
+
+#################################################################################################################
+def SendFrame(_xSocket: socket.socket, _dicHeader: dict, _bytPayload: bytes = b""):
+    bytHeader = json.dumps(_dicHeader).encode("utf-8")
+    _xSocket.sendall(g_xFrameHeader.pack(len(bytHeader), len(_bytPayload)) + bytHeader + _bytPayload)
+
+
+# enddef
+
+
+#################################################################################################################
+def _RecvExact(_xSocket: socket.socket, _iSize: int) -> Optional[bytes]:
+    xBuffer = bytearray(_iSize)
+    xView = memoryview(xBuffer)
+    iPos = 0
+    while iPos < _iSize:
+        iCnt = _xSocket.recv_into(xView[iPos:], _iSize - iPos)
+        if iCnt == 0:
+            return None
+        # endif
+        iPos += iCnt
+    # endwhile
+    return bytes(xBuffer)
+
+
+# enddef
+
+
+#################################################################################################################
+# Returns the tuple (header, payload) or None, if the connection has been closed.
+# Frames larger than '_iMaxSize' raise an exception.
+def RecvFrame(_xSocket: socket.socket, *, _iMaxSize: Optional[int] = None) -> Optional[tuple[dict, bytes]]:
+    bytSizes = _RecvExact(_xSocket, g_xFrameHeader.size)
+    if bytSizes is None:
+        return None
+    # endif
+
+    iHeaderSize, iPayloadSize = g_xFrameHeader.unpack(bytSizes)
+    if _iMaxSize is not None and iHeaderSize + iPayloadSize > _iMaxSize:
+        raise CAnyError_Message(sMsg=f"Frame of size {iHeaderSize + iPayloadSize} exceeds maximal size {_iMaxSize}")
+    # endif
+    bytHeader = _RecvExact(_xSocket, iHeaderSize)
+    if bytHeader is None:
+        return None
+    # endif
+
+    bytPayload = b""
+    if iPayloadSize > 0:
+        bytPayload = _RecvExact(_xSocket, iPayloadSize)
+        if bytPayload is None:
+            return None
+        # endif
+    # endif
+
+    return json.loads(bytHeader.decode("utf-8")), bytPayload
+
+
+# enddef
+
+
+#################################################################################################################
+# Returns the shared secret as bytes. An empty secret is not allowed.
+def ProvideSecret(_xSecret: Union[str, bytes]) -> bytes:
+    bytSecret = _xSecret.encode("utf-8") if isinstance(_xSecret, str) else bytes(_xSecret)
+    if len(bytSecret) == 0:
+        raise CAnyError_Message(sMsg="The shared secret of the execution agent must not be empty")
+    # endif
+    return bytSecret
+
+
+# enddef
+
+
+#################################################################################################################
+def _GetAuthMac(_bytSecret: bytes, _sRole: str, _bytNonceA: bytes, _bytNonceB: bytes) -> str:
+    return hmac.new(_bytSecret, _sRole.encode("ascii") + _bytNonceA + _bytNonceB, hashlib.sha256).hexdigest()
+
+
+# enddef
+
+
+#################################################################################################################
+# Returns the header of the next authentication frame with the given operation, or None
+def _RecvAuthFrame(_xSocket: socket.socket, _sOp: str) -> Optional[dict]:
+    try:
+        tFrame = RecvFrame(_xSocket, _iMaxSize=g_iMaxAuthFrameSize)
+    except (ValueError, CAnyError_Message):
+        return None
+    # endtry
+    if tFrame is None or not isinstance(tFrame[0], dict) or tFrame[0].get("sOp") != _sOp:
+        return None
+    # endif
+    return tFrame[0]
+
+
+# enddef
+
+
+#################################################################################################################
+def _GetNonce(_dicHeader: dict) -> Optional[bytes]:
+    try:
+        bytNonce = bytes.fromhex(_dicHeader.get("sNonce"))
+    except (TypeError, ValueError):
+        return None
+    # endtry
+    return bytNonce if len(bytNonce) == g_iAuthNonceSize else None
+
+
+# enddef
+
+
+#################################################################################################################
+def _IsValidMac(_dicHeader: dict, _sMac: str) -> bool:
+    sMac = _dicHeader.get("sMac")
+    return isinstance(sMac, str) and hmac.compare_digest(sMac, _sMac)
+
+
+# enddef
+
+
+#################################################################################################################
+# Agent side of the authentication handshake. The agent sends a random challenge,
+# the client answers with its own challenge and the HMAC of both with the shared secret,
+# and the agent confirms with the HMAC of both challenges in reverse order.
+# Returns True, if the client knows the secret.
+def AuthenticateClient(_xSocket: socket.socket, _bytSecret: bytes) -> bool:
+    bytNonce = secrets.token_bytes(g_iAuthNonceSize)
+    SendFrame(_xSocket, {"sOp": "challenge", "sNonce": bytNonce.hex()})
+
+    dicHeader = _RecvAuthFrame(_xSocket, "auth")
+    bytClientNonce = None if dicHeader is None else _GetNonce(dicHeader)
+    if bytClientNonce is None or not _IsValidMac(
+        dicHeader, _GetAuthMac(_bytSecret, "client", bytNonce, bytClientNonce)
+    ):
+        SendFrame(_xSocket, {"sOp": "auth-failed"})
+        return False
+    # endif
+
+    SendFrame(_xSocket, {"sOp": "auth-ok", "sMac": _GetAuthMac(_bytSecret, "agent", bytClientNonce, bytNonce)})
+    return True
+
+
+# enddef
+
+
+#################################################################################################################
+# Client side of the authentication handshake. Raises an exception, if the handshake fails,
+# i.e. if either side does not know the shared secret.
+def AuthenticateAgent(_xSocket: socket.socket, _bytSecret: bytes):
+    dicHeader = _RecvAuthFrame(_xSocket, "challenge")
+    bytNonce = None if dicHeader is None else _GetNonce(dicHeader)
+    if bytNonce is None:
+        raise CAnyError_Message(sMsg="Invalid authentication challenge from execution agent")
+    # endif
+
+    bytClientNonce = secrets.token_bytes(g_iAuthNonceSize)
+    SendFrame(
+        _xSocket,
+        {
+            "sOp": "auth",
+            "sNonce": bytClientNonce.hex(),
+            "sMac": _GetAuthMac(_bytSecret, "client", bytNonce, bytClientNonce),
+        },
+    )
+
+    dicHeader = _RecvAuthFrame(_xSocket, "auth-ok")
+    if dicHeader is None or not _IsValidMac(dicHeader, _GetAuthMac(_bytSecret, "agent", bytClientNonce, bytNonce)):
+        raise CAnyError_Message(sMsg="Authentication with execution agent failed")
+    # endif
+
+
+# enddef
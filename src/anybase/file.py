@@ -24,135 +24,1278 @@
 # </LICENSE>
 ###
 
+import io
 import os
 import sys
 import re
-import pyjson5
+import time
+import errno
+import mmap
+import contextlib
 import json
+import pyjson5
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
 from anybase.cls_any_error import CAnyError, CAnyError_Message
 from anybase.path import MakeNormPath
+from anybase import json_codec, compress
+
+
+#######################################################################
+# Create a new temporary file next to the given file and open it for writing.
+# The file is created with the permissions 'iMode', which the OS reduces by the umask
+# of the process, just like for any other new file. Returns the file descriptor and the path.
+def _CreateTempFile(_pathFile: Path, _iMode: int) -> tuple[int, str]:
+    import secrets
+
+    iFlags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0) | getattr(os, "O_NOINHERIT", 0)
+    while True:
+        sPathTemp = os.path.join(_pathFile.parent, f".{_pathFile.name}.{secrets.token_hex(8)}.tmp")
+        try:
+            return os.open(sPathTemp, iFlags, _iMode), sPathTemp
+        except FileExistsError:
+            continue
+        # endtry
+    # endwhile
+
+
+# enddef
+
+
+#######################################################################
+# Open a file for writing, such that the target file is replaced atomically.
+# The data is written to a temporary file in the same directory,
+# which replaces the target file when the context is left without exception.
+# Readers therefore either see the complete old or the complete new file.
+# If 'bSync' is True, the data is flushed to disk before the file is replaced.
+# The new file keeps the permissions of an existing file. Otherwise, it is created
+# with the permissions 'iMode' reduced by the umask, like any other new file.
+@contextlib.contextmanager
+def OpenAtomicWrite(
+    _xFilePath,
+    sMode: str = "w",
+    *,
+    bSync: bool = False,
+    sEncoding: Optional[str] = None,
+    iMode: int = 0o666,
+) -> Iterator:
+    if "w" not in sMode:
+        raise CAnyError_Message(sMsg=f"Invalid mode '{sMode}' for atomic write")
+    # endif
+
+    pathFile = MakeNormPath(_xFilePath)
+    iFd, sPathTemp = _CreateTempFile(pathFile, iMode)
+    try:
+        with os.fdopen(iFd, sMode, encoding=sEncoding) as xFile:
+            yield xFile
+            if bSync is True:
+                xFile.flush()
+                os.fsync(xFile.fileno())
+            # endif
+        # endwith
+
+        try:
+            os.chmod(sPathTemp, os.stat(pathFile).st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        # endtry
+
+        os.replace(sPathTemp, pathFile)
+
+        if bSync is True and os.name == "posix":
+            # Make the rename itself durable
+            iDirFd = os.open(pathFile.parent, os.O_RDONLY)
+            try:
+                os.fsync(iDirFd)
+            finally:
+                os.close(iDirFd)
+            # endtry
+        # endif
+    except BaseException:
+        try:
+            os.remove(sPathTemp)
+        except OSError:
+            pass
+        # endtry
+        raise
+    # endtry
+
+
+# enddef
 
 
 #######################################################################
-# Load JSON file from path
-def LoadJson(_xFilePath) -> dict:
+# Open a file for writing either atomically or in place.
+# Files with a compression suffix like '.gz' or '.zst' are compressed while writing.
+@contextlib.contextmanager
+def _OpenWrite(pathFile: Path, sMode: str, bAtomic: bool, bSync: bool, iCompressLevel: Optional[int] = None):
+    sCompress = compress.GetCompression(pathFile)
+    if sCompress is not None:
+        compress.CheckAvailable(sCompress)
+    # endif
+    sFileMode = sMode if sCompress is None else sMode.replace("t", "").replace("b", "") + "b"
+    if bAtomic is True:
+        xFileContext = OpenAtomicWrite(pathFile, sFileMode, bSync=bSync)
+    else:
+        xFileContext = pathFile.open(sFileMode)
+    # endif
 
+    if sCompress is None:
+        with xFileContext as xFile:
+            yield xFile
+        # endwith
+        return
+    # endif
+
+    with xFileContext as xFile:
+        with compress.WrapWrite(xFile, sCompress, iLevel=iCompressLevel) as xStream:
+            if "b" in sMode:
+                yield xStream
+            else:
+                with io.TextIOWrapper(xStream) as xText:
+                    yield xText
+                # endwith
+            # endif
+        # endwith
+    # endwith
+
+
+# enddef
+
+
+#######################################################################
+# Open a file for reading. Compressed files are decompressed while reading.
+@contextlib.contextmanager
+def _OpenRead(pathFile: Path, sMode: str = "rb"):
+    sCompress = compress.GetCompression(pathFile)
+    if sCompress is None:
+        with pathFile.open(sMode) as xFile:
+            yield xFile
+        # endwith
+        return
+    # endif
+
+    with pathFile.open("rb") as xFile:
+        with compress.WrapRead(xFile, sCompress) as xStream:
+            if "b" in sMode:
+                yield xStream
+            else:
+                with io.TextIOWrapper(xStream) as xText:
+                    yield xText
+                # endwith
+            # endif
+        # endwith
+    # endwith
+
+
+# enddef
+
+
+#######################################################################
+# Advisory lock for read-modify-write cycles on a file.
+# The lock is held on the separate file '<filename>.lock', as the target file itself
+# may be replaced by an atomic write while the lock is held.
+# All processes accessing the file need to use this lock for it to be effective.
+# Raises a TimeoutError if the lock cannot be acquired within 'fTimeout_s' seconds.
+@contextlib.contextmanager
+def LockFile(_xFilePath, *, fTimeout_s: Optional[float] = None, fPollInterval_s: float = 0.05) -> Iterator[Path]:
     pathFile = MakeNormPath(_xFilePath)
+    pathLock = pathFile.parent / (pathFile.name + ".lock")
 
+    xLockFile = pathLock.open("a+b")
     try:
-        with pathFile.open("r") as xFile:
-            dicData = pyjson5.decode_io(xFile)
+        fStartTime_s = time.monotonic()
+        while True:
+            try:
+                _LockFileHandle(xLockFile)
+                break
+            except OSError as xEx:
+                if xEx.errno not in (errno.EACCES, errno.EAGAIN, errno.EWOULDBLOCK, errno.EDEADLK):
+                    raise
+                # endif
+                if fTimeout_s is not None and time.monotonic() - fStartTime_s >= fTimeout_s:
+                    raise TimeoutError(f"Cannot acquire lock for file: {pathFile.as_posix()}")
+                # endif
+                time.sleep(fPollInterval_s)
+            # endtry
+        # endwhile
+
+        try:
+            yield pathFile
+        finally:
+            _UnlockFileHandle(xLockFile)
+        # endtry
+    finally:
+        xLockFile.close()
+    # endtry
+
+
+# enddef
+
+
+#######################################################################
+def _LockFileHandle(_xFile):
+    if os.name == "nt":
+        import msvcrt
+
+        _xFile.seek(0)
+        msvcrt.locking(_xFile.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(_xFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+def _UnlockFileHandle(_xFile):
+    if os.name == "nt":
+        import msvcrt
+
+        _xFile.seek(0)
+        msvcrt.locking(_xFile.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(_xFile.fileno(), fcntl.LOCK_UN)
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+# Files of at least this size are memory-mapped by LoadJson()
+g_iLoadJsonMmapMinSize: int = 1 << 20
+
+# Minimal file size for parsing a file in a separate process in LoadJsonMany()
+g_iLoadJsonProcessMinSize: int = 8 << 20
+
+
+#######################################################################
+# Returns the start of the UTF-8 encoded character at the given byte offset
+def _GetUtf8CharStart(_xBuffer, _iByteOffset: int) -> int:
+    iByte = min(max(0, _iByteOffset), len(_xBuffer) - 1)
+    while iByte > 0 and (_xBuffer[iByte] & 0xC0) == 0x80:
+        iByte -= 1
+    # endwhile
+    return max(0, iByte)
+
+
+# enddef
+
+
+#######################################################################
+# Create the error message for a JSON5 parse error.
+# Only the lines around the error position are decoded from the buffer.
+def _RaiseJsonParseError(_pathFile: Path, _xBuffer, _xEx: pyjson5.Json5IllegalCharacter):
+    print(_xEx.message)
+    xMatch = re.search(r"near\s+(\d+),", _xEx.message)
+    if xMatch is None:
+        raise CAnyError_Message(
+            sMsg=CAnyError.ListToString(
+                [
+                    "Illegal character encountered while parsing JSON file",
+                    _xEx.message,
+                    _pathFile.as_posix(),
+                ]
+            )
+        )
+    # endif
+    # The buffer is parsed as UTF-8, so the position is the byte offset after the illegal character
+    iBytePos = _GetUtf8CharStart(_xBuffer, int(xMatch.group(1)) - 1)
+    iBufferSize = len(_xBuffer)
+
+    def GetLineStart(_iPos: int) -> int:
+        return _xBuffer.rfind(b"\n", 0, _iPos) + 1
+
+    # enddef
+
+    def GetLineEnd(_iPos: int) -> int:
+        iEnd = _xBuffer.find(b"\n", _iPos)
+        return iBufferSize if iEnd < 0 else iEnd
+
+    # enddef
+
+    def GetLine(_iStart: int) -> str:
+        return bytes(_xBuffer[_iStart : GetLineEnd(_iStart)]).decode("utf-8", errors="replace")
+
+    # enddef
+
+    # Count the newlines before the error position in chunks
+    iLinePos = 0
+    iLineStart = GetLineStart(iBytePos)
+    for iChunkStart in range(0, iLineStart, 1 << 24):
+        iLinePos += bytes(_xBuffer[iChunkStart : min(iLineStart, iChunkStart + (1 << 24))]).count(b"\n")
+    # endfor
+
+    sErrorLine = GetLine(iLineStart)
+    iCharPosInLine = len(bytes(_xBuffer[iLineStart:iBytePos]).decode("utf-8", errors="replace"))
+    iCharPosInLine = min(len(sErrorLine) - 1, max(0, iCharPosInLine))
+
+    lMsg = [
+        "Unexpected character '{}' encountered in line {} at position {}".format(
+            _xEx.character, iLinePos + 1, iCharPosInLine + 1
+        )
+    ]
+
+    if iLineStart > 0:
+        lMsg.append(" {:3d} :  {}".format(iLinePos, GetLine(GetLineStart(iLineStart - 1))))
+    # endif
+
+    sMsg = ">{:3d}<: ".format(iLinePos + 1)
+    sMsg += sErrorLine[0:iCharPosInLine]
+    sMsg += ">{}<".format(sErrorLine[iCharPosInLine : iCharPosInLine + 1])
+    sMsg += sErrorLine[iCharPosInLine + 1 :]
+    lMsg.append(sMsg)
+
+    iNextLineStart = GetLineEnd(iLineStart) + 1
+    if iNextLineStart <= iBufferSize:
+        lMsg.append(" {:3d} :  {}".format(iLinePos + 2, GetLine(iNextLineStart)))
+    # endif
+
+    raise CAnyError_Message(
+        sMsg="Error parsing JSON file: {}{}".format(_pathFile.as_posix(), CAnyError.ListToString(lMsg))
+    )
+
+
+# enddef
+
+
+#######################################################################
+# Load JSON file from path.
+# Large files are memory-mapped and the mapped buffer is passed to the decoder without copy,
+# if the decoder supports it. Compressed files like 'data.json.gz' are decompressed in memory.
+def LoadJson(_xFilePath, *, sBackend: Optional[str] = None) -> dict:
+
+    pathFile = MakeNormPath(_xFilePath)
+
+    if compress.GetCompression(pathFile) is not None:
+        with _OpenRead(pathFile) as xFile:
+            xBuffer = xFile.read()
+        # endwith
+    else:
+        with pathFile.open("rb") as xFile:
+            iFileSize = os.fstat(xFile.fileno()).st_size
+            if iFileSize >= g_iLoadJsonMmapMinSize:
+                xBuffer = mmap.mmap(xFile.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                xBuffer = xFile.read()
+            # endif
+        # endwith
+    # endif
+
+    try:
+        with memoryview(xBuffer) as xView:
+            sSuffix = compress.GetDataPath(pathFile).suffix
+            # Data after the JSON value is ignored, as by pyjson5.decode_io()
+            dicData = json_codec.Decode(xView, sSuffix=sSuffix, sBackend=sBackend, bAllowTrailingData=True)
         # endwith
     except pyjson5.Json5IllegalCharacter as xEx:
-        print(xEx.message)
-        xMatch = re.search(r"near\s+(\d+),", xEx.message)
-        if xMatch is None:
-            raise CAnyError_Message(
-                sMsg=CAnyError.ListToString(
-                    [
-                        "Illegal character encountered while parsing JSON file",
-                        xEx.message,
-                        pathFile.as_posix(),
-                    ]
+        _RaiseJsonParseError(pathFile, xBuffer, xEx)
+    except pyjson5.Json5DecoderException as xEx:
+        raise CAnyError_Message(
+            sMsg=CAnyError.ListToString(["Error parsing JSON file", xEx.message, pathFile.as_posix()])
+        )
+    finally:
+        if isinstance(xBuffer, mmap.mmap):
+            try:
+                xBuffer.close()
+            except BufferError:
+                # Buffer still referenced, e.g. by an exception traceback. It is closed when released.
+                pass
+            # endtry
+        # endif
+    # endtry
+
+    return dicData
+
+
+# enddef
+
+
+#######################################################################
+# Worker function of LoadJsonMany() for loading a file in a separate process.
+# Exceptions are returned as message, as they may not be picklable.
+def _LoadJsonInProcess(_sFilePath: str, _sBackend: Optional[str]) -> tuple[bool, Any]:
+    try:
+        return True, LoadJson(_sFilePath, sBackend=_sBackend)
+    except Exception as xEx:
+        return False, str(xEx)
+    # endtry
+
+
+# enddef
+
+
+#######################################################################
+# Load many JSON files in parallel.
+# The files are read in a thread pool, so that file system latencies overlap.
+# Files of at least 'iProcessMinSize' bytes are parsed in a process pool instead,
+# if 'iMaxProcesses' is not 0, so that parsing large files is not serialized by the GIL.
+# If 'funcProvidePath' is given, it is called in the worker thread to map each given path
+# to the path of the file to load, e.g. to find the file extension.
+# Returns a dictionary with the elements:
+#   "lResults": list of dictionaries, one per given path in the same order, with the elements
+#               "pathFile", "bOK", "sMsg", "xData" and "xEx" (the exception, if loaded in a thread)
+#   "dicStats": statistics with the elements "iFileCnt", "iErrorCnt", "iProcessFileCnt",
+#               "iByteCnt", "fTime_s", "fFilesPerSec" and "fMBytesPerSec".
+def LoadJsonMany(
+    _iterFilePaths: Iterable,
+    *,
+    iMaxThreads: int = 16,
+    iMaxProcesses: Optional[int] = None,
+    iProcessMinSize: int = g_iLoadJsonProcessMinSize,
+    sBackend: Optional[str] = None,
+    funcProvidePath: Optional[Callable] = None,
+) -> dict:
+    import threading
+    import multiprocessing
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    lFilePaths = list(_iterFilePaths)
+    lResults: list[dict] = [None] * len(lFilePaths)
+
+    xProcLock = threading.Lock()
+    xProcPool: Optional[ProcessPoolExecutor] = None
+
+    def GetProcPool() -> ProcessPoolExecutor:
+        nonlocal xProcPool
+        with xProcLock:
+            if xProcPool is None:
+                xProcPool = ProcessPoolExecutor(
+                    max_workers=iMaxProcesses, mp_context=multiprocessing.get_context("spawn")
                 )
+            # endif
+            return xProcPool
+        # endwith
+
+    # enddef
+
+    def LoadOne(_iIdx: int):
+        dicRes = {"pathFile": None, "bOK": False, "sMsg": "", "xData": None, "xEx": None, "iSize": 0}
+        lResults[_iIdx] = dicRes
+        try:
+            if funcProvidePath is not None:
+                pathFile = funcProvidePath(lFilePaths[_iIdx])
+            else:
+                pathFile = MakeNormPath(lFilePaths[_iIdx])
+            # endif
+            dicRes["pathFile"] = pathFile
+
+            iSize = pathFile.stat().st_size
+            dicRes["iSize"] = iSize
+            if iMaxProcesses != 0 and iSize >= iProcessMinSize:
+                try:
+                    bOK, xData = GetProcPool().submit(_LoadJsonInProcess, pathFile.as_posix(), sBackend).result()
+                    dicRes["bProcess"] = True
+                except BrokenProcessPool:
+                    # Worker processes cannot be started, e.g. if the main module is not import-safe
+                    bOK, xData = True, LoadJson(pathFile, sBackend=sBackend)
+                # endtry
+                if bOK is False:
+                    dicRes["sMsg"] = xData
+                    return
+                # endif
+            else:
+                xData = LoadJson(pathFile, sBackend=sBackend)
+            # endif
+            dicRes["xData"] = xData
+            dicRes["bOK"] = True
+        except Exception as xEx:
+            dicRes["sMsg"] = str(xEx)
+            dicRes["xEx"] = xEx
+        # endtry
+
+    # enddef
+
+    fTimeStart = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, iMaxThreads)) as xPool:
+            list(xPool.map(LoadOne, range(len(lFilePaths))))
+        # endwith
+    finally:
+        if xProcPool is not None:
+            xProcPool.shutdown()
+        # endif
+    # endtry
+    fTime_s = time.perf_counter() - fTimeStart
+
+    iByteCnt = 0
+    iErrorCnt = 0
+    iProcessFileCnt = 0
+    for dicRes in lResults:
+        iByteCnt += dicRes.pop("iSize")
+        iProcessFileCnt += 1 if dicRes.pop("bProcess", False) else 0
+        iErrorCnt += 0 if dicRes["bOK"] else 1
+    # endfor
+
+    dicStats = {
+        "iFileCnt": len(lResults),
+        "iErrorCnt": iErrorCnt,
+        "iProcessFileCnt": iProcessFileCnt,
+        "iByteCnt": iByteCnt,
+        "fTime_s": fTime_s,
+        "fFilesPerSec": len(lResults) / fTime_s if fTime_s > 0.0 else 0.0,
+        "fMBytesPerSec": iByteCnt / (fTime_s * 1e6) if fTime_s > 0.0 else 0.0,
+    }
+
+    return {"lResults": lResults, "dicStats": dicStats}
+
+
+# enddef
+
+
+#######################################################################
+# save JSON file from relative path to script path.
+# JSON5 and ISON files are always written in compact form.
+# Files with a compression suffix like 'data.json.gz' are compressed with the given level,
+# or the default level of the format.
+def SaveJson(
+    _xFilePath,
+    _dicData,
+    iIndent=-1,
+    *,
+    bAtomic: bool = False,
+    bSync: bool = False,
+    bSortKeys: bool = False,
+    sBackend: Optional[str] = None,
+    iCompressLevel: Optional[int] = None,
+):
+
+    pathFile = MakeNormPath(_xFilePath)
+
+    if compress.GetDataPath(pathFile).suffix in json_codec.g_setJson5Suffix:
+        iIndent = -1
+    # endif
+    bytData = json_codec.Encode(_dicData, iIndent=iIndent, bSortKeys=bSortKeys, sBackend=sBackend)
+
+    with _OpenWrite(pathFile, "wb", bAtomic, bSync, iCompressLevel) as xFile:
+        xFile.write(bytData)
+    # endwith
+
+
+# enddef
+
+
+#######################################################################
+# Iterate over the elements of a JSON array in a file, without loading the whole file.
+# The array is referenced by a JSON pointer, e.g. "/frames" for the element "frames"
+# of the top-level object, or "" if the top-level element is the array.
+# Only strict JSON is supported.
+def IterJsonArray(_xFilePath, sPointer: str = "", *, iChunkSize: int = 1 << 16) -> Iterator:
+    from .cls_json_stream_reader import CJsonStreamReader
+
+    pathFile = MakeNormPath(_xFilePath)
+    with _OpenRead(pathFile) as xFile:
+        xReader = CJsonStreamReader(xFile, _iChunkSize=iChunkSize)
+        xReader.Seek(sPointer)
+        if xReader.Peek() != b"[":
+            raise CAnyError_Message(
+                sMsg=f"Element '{sPointer}' is not an array in JSON file: {pathFile.as_posix()}"
             )
         # endif
-        iCharPos = int(xMatch.group(1))
-        sText = pathFile.read_text()
-        lLines = sText.split("\n")
-        iCharCnt = 0
-        iLinePos = len(lLines) - 1
-
-        for iLineIdx, sLine in enumerate(lLines):
-            iCharCnt += len(sLine) + 1
-            if iCharCnt >= iCharPos:
-                iLinePos = iLineIdx
-                break
-            # endif
+
+        for iIdx in xReader.IterArrayIndices():
+            yield xReader.ReadValue()
         # endfor
+    # endwith
 
-        # From character position, subtract length of line with error and
-        # the numer of lines before this line, to subtract the newline characters
-        iCharPosInLine = min(
-            len(lLines[iLinePos]) - 1,
-            max(0, iCharPos - (iCharCnt - len(lLines[iLinePos]))),
-        )
 
-        lMsg = [
-            "Unexpected character '{}' encountered in line {} at position {}".format(
-                xEx.character, iLinePos + 1, iCharPosInLine + 1
-            )
-        ]
-        iLineStart = max(0, iLinePos - 1)
-        iLineEnd = min(len(lLines) - 1, iLinePos + 1)
-        for iLineIdx in range(iLineStart, iLineEnd + 1):
-            sLine = lLines[iLineIdx]
-            if iLineIdx == iLinePos:
-                sMsg = ">{:3d}<: ".format(iLineIdx + 1)
-                sMsg += sLine[0:iCharPosInLine]
-                sMsg += ">{}<".format(sLine[iCharPosInLine])
-                sMsg += sLine[iCharPosInLine + 1 :]
+# enddef
+
+
+#######################################################################
+# Load only the scalar members of the top-level object of a JSON file, like 'sDTI' or 'sId'.
+# Arrays and objects are skipped without decoding them, so that the header of
+# a large data file can be checked with bounded memory.
+def LoadJsonHeader(_xFilePath, *, iChunkSize: int = 1 << 16) -> dict:
+    from .cls_json_stream_reader import CJsonStreamReader
+
+    pathFile = MakeNormPath(_xFilePath)
+    dicHeader = {}
+    with _OpenRead(pathFile) as xFile:
+        xReader = CJsonStreamReader(xFile, _iChunkSize=iChunkSize)
+        for sKey in xReader.IterObjectKeys():
+            if xReader.Peek() in (b"{", b"["):
+                xReader.SkipValue()
             else:
-                sMsg = " {:3d} :  {}".format(iLineIdx + 1, sLine)
+                dicHeader[sKey] = xReader.ReadValue()
             # endif
-            lMsg.append(sMsg)
         # endfor
-        raise CAnyError_Message(
-            sMsg="Error parsing JSON file: {}{}".format(
-                pathFile.as_posix(), CAnyError.ListToString(lMsg)
-            )
-        )
+    # endwith
+
+    return dicHeader
+
+
+# enddef
+
+
+#######################################################################
+# Iterate over the records of a JSON-Lines file. Empty lines are ignored.
+def IterJsonLines(_xFilePath) -> Iterator:
+
+    pathFile = MakeNormPath(_xFilePath)
+    with _OpenRead(pathFile) as xFile:
+        for iLineIdx, bytLine in enumerate(xFile):
+            if len(bytLine.strip()) == 0:
+                continue
+            # endif
+            try:
+                yield json_codec.Decode(bytLine, sSuffix=".json")
+            except Exception as xEx:
+                raise CAnyError_Message(
+                    sMsg="Error parsing line {} of JSON-Lines file: {}".format(iLineIdx + 1, pathFile.as_posix()),
+                    xChildEx=xEx,
+                )
+            # endtry
+        # endfor
+    # endwith
+
+
+# enddef
+
+
+#######################################################################
+# Write records to a JSON-Lines file, one compact JSON object per line.
+# The records may be given by a generator, so that they never have to be held in memory together.
+# Returns the number of records written.
+def SaveJsonLines(
+    _xFilePath,
+    _iterRecords: Iterable,
+    *,
+    bAppend: bool = False,
+    bAtomic: bool = False,
+    bSync: bool = False,
+    iCompressLevel: Optional[int] = None,
+) -> int:
+
+    pathFile = MakeNormPath(_xFilePath)
+    if bAppend is True and bAtomic is True:
+        raise CAnyError_Message(sMsg="Atomic write is not supported in append mode")
+    # endif
+
+    iCnt = 0
+    with _OpenWrite(pathFile, "ab" if bAppend is True else "wb", bAtomic, bSync, iCompressLevel) as xFile:
+        for xRecord in _iterRecords:
+            xFile.write(json_codec.Encode(xRecord))
+            xFile.write(b"\n")
+            iCnt += 1
+        # endfor
+    # endwith
+
+    return iCnt
+
+
+# enddef
+
+
+#######################################################################
+# Container format for pickled data with out-of-band buffers (pickle protocol 5):
+# magic, header size, JSON header, pickle stream, buffers aligned to 'g_iPickleBufferAlign'.
+# Large contiguous buffers like NumPy arrays are stored as raw data, so that they can
+# be memory-mapped on load without copy.
+g_bytPickleContainerMagic: bytes = b"ANYPKL5\0"
+g_iPickleBufferAlign: int = 64
+
+
+#######################################################################
+def _WritePickleContainer(_xFile, _xData, *, dicMeta: Optional[dict] = None):
+    import pickle
+    import struct
+
+    lBuffers: list = []
+    bytPickle = pickle.dumps(_xData, protocol=5, buffer_callback=lBuffers.append)
+    lRaw = [xBuffer.raw() for xBuffer in lBuffers]
+
+    def Align(_iPos: int) -> int:
+        return (_iPos + g_iPickleBufferAlign - 1) // g_iPickleBufferAlign * g_iPickleBufferAlign
+
+    # enddef
+
+    # The buffer offsets depend on the header size, which in turn depends on the offsets.
+    # Reserve enough space for the header by iterating until the size is stable.
+    iHeaderSize = 0
+    while True:
+        iPos = Align(len(g_bytPickleContainerMagic) + 8 + iHeaderSize + len(bytPickle))
+        lBufferPos = []
+        for xRaw in lRaw:
+            lBufferPos.append([iPos, xRaw.nbytes])
+            iPos = Align(iPos + xRaw.nbytes)
+        # endfor
+        dicHeader = {"iPickleSize": len(bytPickle), "lBuffers": lBufferPos, "dicMeta": dicMeta}
+        bytHeader = json.dumps(dicHeader).encode("utf-8")
+        if len(bytHeader) <= iHeaderSize:
+            bytHeader += b" " * (iHeaderSize - len(bytHeader))
+            break
+        # endif
+        iHeaderSize = len(bytHeader) + 16
+    # endwhile
+
+    _xFile.write(g_bytPickleContainerMagic)
+    _xFile.write(struct.pack("<Q", len(bytHeader)))
+    _xFile.write(bytHeader)
+    _xFile.write(bytPickle)
+    iPos = len(g_bytPickleContainerMagic) + 8 + len(bytHeader) + len(bytPickle)
+    for xRaw, (iBufferPos, iBufferSize) in zip(lRaw, lBufferPos):
+        _xFile.write(b"\0" * (iBufferPos - iPos))
+        _xFile.write(xRaw)
+        iPos = iBufferPos + iBufferSize
+    # endfor
+
+
+# enddef
+
+
+#######################################################################
+# Returns the header of a pickle container, or None if the file is not a valid container
+def _ReadPickleContainerHeader(_xFile) -> Optional[dict]:
+    import struct
+
+    bytMagic = _xFile.read(len(g_bytPickleContainerMagic))
+    if bytMagic != g_bytPickleContainerMagic:
+        return None
+    # endif
+    bytSize = _xFile.read(8)
+    if len(bytSize) != 8:
+        return None
+    # endif
+    try:
+        return json.loads(_xFile.read(struct.unpack("<Q", bytSize)[0]).decode("utf-8"))
+    except ValueError:
+        return None
     # endtry
 
-    return dicData
+
+# enddef
+
+
+#######################################################################
+# Load the data of a pickle container from a buffer holding the whole container.
+# Out-of-band buffers reference the given buffer directly, without copy.
+def _LoadPickleContainer(_xBuffer) -> Any:
+    import pickle
+    import struct
+
+    xView = memoryview(_xBuffer)
+    iMagicSize = len(g_bytPickleContainerMagic)
+    if xView[0:iMagicSize] != g_bytPickleContainerMagic:
+        raise CAnyError_Message(sMsg="Invalid pickle container data")
+    # endif
+    iHeaderSize: int = struct.unpack_from("<Q", xView, iMagicSize)[0]
+    iPickleStart = iMagicSize + 8 + iHeaderSize
+    dicHeader = json.loads(bytes(xView[iMagicSize + 8 : iPickleStart]).decode("utf-8"))
+
+    iPickleSize: int = dicHeader["iPickleSize"]
+    lBuffers = [xView[iPos : iPos + iSize] for iPos, iSize in dicHeader["lBuffers"]]
+    return pickle.loads(xView[iPickleStart : iPickleStart + iPickleSize], buffers=lBuffers)
 
 
 # enddef
 
 
 #######################################################################
-# save JSON file from relative path to script path
-def SaveJson(_xFilePath, _dicData, iIndent=-1):
+# Load the data of a pickle container file. The file is memory-mapped and out-of-band buffers
+# reference the mapped memory directly, i.e. NumPy arrays are read-only views of the file.
+def _LoadPickleContainerFile(_pathFile: Path) -> Any:
+
+    with _pathFile.open("rb") as xFile:
+        xMap = mmap.mmap(xFile.fileno(), 0, access=mmap.ACCESS_READ)
+    # endwith
+
+    try:
+        return _LoadPickleContainer(xMap)
+    except CAnyError_Message:
+        raise CAnyError_Message(sMsg=f"Invalid pickle container file: {_pathFile.as_posix()}")
+    # endtry
+
+
+# enddef
+
+
+#######################################################################
+# Convert lists of numbers with at least 'iMinSize' elements to NumPy arrays.
+# The arrays have the same types as the columns of the cache file, see _GetJsonCacheColumnType().
+# Lists of integers that do not fit into 64 bit are kept.
+def _ListsToNumpy(_xData: Any, _iMinSize: int) -> Any:
+    import numpy as np
+
+    def Convert(_xValue: Any) -> Any:
+        if isinstance(_xValue, dict):
+            return {sKey: Convert(xValue) for sKey, xValue in _xValue.items()}
+        elif isinstance(_xValue, list):
+            sType = _GetJsonCacheColumnType(_xValue, _iMinSize)
+            if sType is not None:
+                try:
+                    return np.array(_xValue, dtype=g_dicJsonCacheColumnType[sType])
+                except OverflowError:
+                    return _xValue
+                # endtry
+            # endif
+            return [Convert(xValue) for xValue in _xValue]
+        # endif
+        return _xValue
+
+    # enddef
+
+    return Convert(_xData)
+
+
+# enddef
+
+
+#######################################################################
+# Returns the SHA-256 hash of the file contents as hex string
+def GetFileHash(_pathFile: Path) -> str:
+    import hashlib
+
+    xHash = hashlib.sha256()
+    with _pathFile.open("rb") as xFile:
+        for bytChunk in iter(lambda: xFile.read(1 << 20), b""):
+            xHash.update(bytChunk)
+        # endfor
+    # endwith
+    return xHash.hexdigest()
+
+
+# enddef
+
+
+#######################################################################
+# Path of the cache file of a data file. Without a cache directory,
+# the cache file is stored as hidden file next to the data file.
+def GetJsonCachePath(_xFilePath, *, xCacheDir=None) -> Path:
+    import hashlib
 
     pathFile = MakeNormPath(_xFilePath)
+    if xCacheDir is None:
+        return pathFile.parent / f".{pathFile.name}.anycache"
+    # endif
 
-    with pathFile.open("w") as xFile:
-        if iIndent < 0 or pathFile.suffix == ".json5" or pathFile.suffix == ".ison":
-            pyjson5.encode_io(_dicData, xFile, supply_bytes=False)
-        else:
-            json.dump(_dicData, xFile, indent=iIndent)
+    sPathHash = hashlib.sha1(pathFile.absolute().as_posix().encode("utf-8")).hexdigest()[0:16]
+    return MakeNormPath(xCacheDir) / f"{pathFile.name}.{sPathHash}.anycache"
+
+
+# enddef
+
+
+#######################################################################
+# Cache file format of LoadJsonCached(): magic, header size, JSON header, pickle stream,
+# column arrays aligned to 'g_iJsonCacheColumnAlign'.
+# If the lists of numbers are returned as NumPy arrays, they are not stored in the pickle stream,
+# but are appended to one column array per number type. The pickle stream only references them
+# via persistent IDs (type, start, size), and they are returned as views of the columns.
+# The header contains the cache key, the size of the pickle stream and the column positions.
+# The pickle stream is loaded with an unpickler that does not resolve any globals,
+# so that it can only create plain dictionaries, lists and scalars, but cannot execute code.
+g_bytJsonCacheMagic: bytes = b"ANYJSC2\0"
+g_iJsonCacheColumnAlign: int = 64
+g_dicJsonCacheColumnType: dict = {"i8": "<i8", "f8": "<f8"}
+
+
+#######################################################################
+# Returns the column type of a list of numbers, or None if the list is not stored as column.
+# Lists of only integers are stored as integer column,
+# and lists of floats, or of integers and floats, as float column.
+def _GetJsonCacheColumnType(_lValues: list, _iMinSize: int) -> Optional[str]:
+    if len(_lValues) < _iMinSize:
+        return None
+    # endif
+
+    setTypes = set(map(type, _lValues))
+    if setTypes == {int}:
+        return "i8"
+    elif setTypes == {float} or setTypes == {int, float}:
+        return "f8"
+    # endif
+    return None
+
+
+# enddef
+
+
+#######################################################################
+def _WriteJsonCache(_xFile, _xData: Any, *, dicMeta: dict, iMinArraySize: int, bNumpyArrays: bool):
+    import pickle
+    import struct
+    import numpy as np
+
+    dicColumnArrays: dict = {sType: [] for sType in g_dicJsonCacheColumnType}
+    dicColumnSize: dict = {sType: 0 for sType in g_dicJsonCacheColumnType}
+
+    class CPickler(pickle.Pickler):
+        def persistent_id(self, _xObj):
+            if type(_xObj) is not list:
+                return None
+            # endif
+            sType = _GetJsonCacheColumnType(_xObj, iMinArraySize)
+            if sType is None:
+                return None
+            # endif
+            try:
+                aValues = np.array(_xObj, dtype=g_dicJsonCacheColumnType[sType])
+            except OverflowError:
+                return None
+            # endtry
+
+            iStart = dicColumnSize[sType]
+            dicColumnArrays[sType].append(aValues)
+            dicColumnSize[sType] += len(aValues)
+            return (sType, iStart, len(aValues))
+
+        # enddef
+
+    # endclass
+
+    xStream = io.BytesIO()
+    if bNumpyArrays is True:
+        CPickler(xStream, protocol=5).dump(_xData)
+    else:
+        # Unpickling numbers directly is faster than creating them from the columns
+        pickle.Pickler(xStream, protocol=5).dump(_xData)
+    # endif
+    bytPickle = xStream.getvalue()
+
+    dicColumns = {
+        sType: np.concatenate(lArrays) for sType, lArrays in dicColumnArrays.items() if len(lArrays) > 0
+    }
+
+    def Align(_iPos: int) -> int:
+        return (_iPos + g_iJsonCacheColumnAlign - 1) // g_iJsonCacheColumnAlign * g_iJsonCacheColumnAlign
+
+    # enddef
+
+    # The column positions depend on the header size, which in turn depends on the positions.
+    # Reserve enough space for the header by iterating until the size is stable.
+    iHeaderSize = 0
+    while True:
+        iPos = Align(len(g_bytJsonCacheMagic) + 8 + iHeaderSize + len(bytPickle))
+        dicColumnPos = {}
+        for sType, aColumn in dicColumns.items():
+            dicColumnPos[sType] = [iPos, len(aColumn)]
+            iPos = Align(iPos + aColumn.nbytes)
+        # endfor
+        dicHeader = {"dicMeta": dicMeta, "iPickleSize": len(bytPickle), "dicColumns": dicColumnPos}
+        bytHeader = json.dumps(dicHeader).encode("utf-8")
+        if len(bytHeader) <= iHeaderSize:
+            bytHeader += b" " * (iHeaderSize - len(bytHeader))
+            break
         # endif
+        iHeaderSize = len(bytHeader) + 16
+    # endwhile
+
+    _xFile.write(g_bytJsonCacheMagic)
+    _xFile.write(struct.pack("<Q", len(bytHeader)))
+    _xFile.write(bytHeader)
+    _xFile.write(bytPickle)
+    iPos = len(g_bytJsonCacheMagic) + 8 + len(bytHeader) + len(bytPickle)
+    for sType, aColumn in dicColumns.items():
+        iColumnPos = dicColumnPos[sType][0]
+        _xFile.write(b"\0" * (iColumnPos - iPos))
+        _xFile.write(memoryview(aColumn).cast("B"))
+        iPos = iColumnPos + aColumn.nbytes
+    # endfor
+
+
+# enddef
+
+
+#######################################################################
+# Open a cache file for reading. On POSIX systems, the cache file is only used if it is owned
+# by the current user and not writable by others, so that no other user can change the data
+# that is returned. The checks are done on the opened file, and symbolic links are not followed.
+def _OpenJsonCache(_pathCache: Path) -> Optional[int]:
+    import stat
+
+    try:
+        iFd = os.open(_pathCache, os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        return None
+    # endtry
+
+    if hasattr(os, "geteuid"):
+        xStat = os.fstat(iFd)
+        if (
+            not stat.S_ISREG(xStat.st_mode)
+            or xStat.st_uid != os.geteuid()
+            or (xStat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)) != 0
+        ):
+            os.close(iFd)
+            return None
+        # endif
+    # endif
+
+    return iFd
+
+
+# enddef
+
+
+#######################################################################
+# Returns the header of a cache file, or None if the file is not a valid cache file
+def _ReadJsonCacheHeader(_xMap) -> Optional[dict]:
+    import struct
+
+    iMagicSize = len(g_bytJsonCacheMagic)
+    if len(_xMap) < iMagicSize + 8 or _xMap[0:iMagicSize] != g_bytJsonCacheMagic:
+        return None
+    # endif
+    iHeaderSize: int = struct.unpack_from("<Q", _xMap, iMagicSize)[0]
+    try:
+        dicHeader = json.loads(_xMap[iMagicSize + 8 : iMagicSize + 8 + iHeaderSize].decode("utf-8"))
+    except ValueError:
+        return None
+    # endtry
+    if not isinstance(dicHeader, dict):
+        return None
+    # endif
+    dicHeader["iPickleStart"] = iMagicSize + 8 + iHeaderSize
+    return dicHeader
+
+
+# enddef
+
+
+#######################################################################
+# Load the data of a memory-mapped cache file. The lists of numbers stored in columns
+# are returned as read-only NumPy arrays, which are views of the mapped memory.
+def _LoadJsonCache(_xMap, _dicHeader: dict) -> Any:
+    import gc
+    import pickle
+    import numpy as np
+
+    dicColumns = {}
+    for sType, (iPos, iSize) in _dicHeader["dicColumns"].items():
+        dicColumns[sType] = np.frombuffer(_xMap, dtype=g_dicJsonCacheColumnType[sType], count=iSize, offset=iPos)
+    # endfor
+
+    class CUnpickler(pickle.Unpickler):
+        def find_class(self, _sModule, _sName):
+            raise pickle.UnpicklingError(f"Invalid element '{_sModule}.{_sName}' in cache file")
+
+        # enddef
+
+        def persistent_load(self, _tId):
+            sType, iStart, iSize = _tId
+            return dicColumns[sType][iStart : iStart + iSize]
+
+        # enddef
+
+    # endclass
+
+    iPickleStart: int = _dicHeader["iPickleStart"]
+    with memoryview(_xMap)[iPickleStart : iPickleStart + _dicHeader["iPickleSize"]] as xView:
+        xStream = io.BytesIO(xView)
     # endwith
 
+    # The garbage collector would repeatedly scan the many new containers, which cannot contain cycles
+    bGcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        return CUnpickler(xStream).load()
+    finally:
+        if bGcEnabled is True:
+            gc.enable()
+        # endif
+    # endtry
+
 
 # enddef
 
 
 #######################################################################
-# Save Python object as Pickle file
-def SavePickle(_xFilePath, _dicData):
+# Load a JSON file via a binary cache file.
+# After the first parse, the data is stored in a cache file next to the data file,
+# or in the given cache directory. Later loads use the cache file, if the size and modification
+# time of the data file are unchanged, or if only the modification time has changed, but not
+# the SHA-256 hash of the data file.
+# If 'bNumpyArrays' is True, lists of at least 'iMinArraySize' numbers are stored in a few large
+# column arrays and are returned as read-only NumPy arrays, which are views of the memory-mapped
+# cache file and are therefore shared between processes.
+# See _WriteJsonCache() and _OpenJsonCache() for the file format and its protection.
+# If the cache file cannot be written, the data is returned nonetheless.
+def LoadJsonCached(
+    _xFilePath,
+    *,
+    xCacheDir=None,
+    bNumpyArrays: bool = False,
+    iMinArraySize: int = 16,
+    sBackend: Optional[str] = None,
+) -> Any:
+
+    pathFile = MakeNormPath(_xFilePath)
+    pathCache = GetJsonCachePath(pathFile, xCacheDir=xCacheDir)
+
+    xStat = os.stat(pathFile)
+    dicMeta = {
+        "iSize": xStat.st_size,
+        "iMTime_ns": xStat.st_mtime_ns,
+        "bNumpyArrays": bNumpyArrays,
+        "iMinArraySize": iMinArraySize,
+    }
+
+    sHash: Optional[str] = None
+    iFd = _OpenJsonCache(pathCache)
+    if iFd is not None:
+        try:
+            xMap = mmap.mmap(iFd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # ValueError for empty files, which cannot be mapped
+            xMap = None
+        finally:
+            os.close(iFd)
+        # endtry
+
+        dicHeader = None if xMap is None else _ReadJsonCacheHeader(xMap)
+        if dicHeader is not None and isinstance(dicHeader.get("dicMeta"), dict):
+            dicCacheMeta = dicHeader["dicMeta"]
+            bValid = all(dicCacheMeta.get(sKey) == xValue for sKey, xValue in dicMeta.items())
+            if bValid is False and dicCacheMeta.get("iSize") == dicMeta["iSize"]:
+                # The data file may only have been touched or copied
+                sHash = GetFileHash(pathFile)
+                bValid = sHash == dicCacheMeta.get("sHash") and all(
+                    dicCacheMeta.get(sKey) == dicMeta[sKey] for sKey in ("bNumpyArrays", "iMinArraySize")
+                )
+            # endif
+
+            if bValid is True:
+                try:
+                    return _LoadJsonCache(xMap, dicHeader)
+                except Exception:
+                    pass
+                # endtry
+            # endif
+        # endif
+    # endif
+
+    xData = LoadJson(pathFile, sBackend=sBackend)
+
+    # Only store the data, if the data file has not changed while loading it
+    if sHash is None:
+        sHash = GetFileHash(pathFile)
+    # endif
+    xStatAfter = os.stat(pathFile)
+    if (xStatAfter.st_size, xStatAfter.st_mtime_ns) == (dicMeta["iSize"], dicMeta["iMTime_ns"]):
+        dicMeta["sHash"] = sHash
+        try:
+            pathCache.parent.mkdir(parents=True, exist_ok=True)
+            with OpenAtomicWrite(pathCache, "wb", iMode=0o644) as xFile:
+                _WriteJsonCache(
+                    xFile, xData, dicMeta=dicMeta, iMinArraySize=iMinArraySize, bNumpyArrays=bNumpyArrays
+                )
+            # endwith
+            # An existing cache file may have passed its permissions on to the new file
+            iMode = os.stat(pathCache).st_mode & 0o777
+            if iMode & 0o022 != 0:
+                os.chmod(pathCache, iMode & ~0o022)
+            # endif
+        except OSError:
+            pass
+        # endtry
+    # endif
+
+    if bNumpyArrays is True:
+        xData = _ListsToNumpy(xData, iMinArraySize)
+    # endif
+
+    return xData
+
+
+# enddef
+
+
+#######################################################################
+# Save Python object as Pickle file, using pickle protocol 5.
+# If 'bOutOfBand' is True, contiguous buffers like NumPy arrays are not copied into the pickle
+# stream, but written as aligned raw data after it. LoadPickle() then memory-maps these buffers.
+# Instead of a path, a writable binary file object may be given, into which the data is streamed.
+# The arguments 'bAtomic', 'bSync' and 'iCompressLevel' are ignored in this case.
+def SavePickle(
+    _xFilePath,
+    _dicData,
+    *,
+    bAtomic: bool = False,
+    bSync: bool = False,
+    iCompressLevel: Optional[int] = None,
+    bOutOfBand: bool = False,
+):
     import pickle
 
+    def Write(_xFile):
+        if bOutOfBand is True:
+            _WritePickleContainer(_xFile, _dicData)
+        else:
+            pickle.dump(_dicData, _xFile, protocol=5)
+        # endif
+
+    # enddef
+
+    if hasattr(_xFilePath, "write"):
+        Write(_xFilePath)
+        return
+    # endif
+
     pathFile = MakeNormPath(_xFilePath)
 
-    with pathFile.open("wb") as xFile:
-        pickle.dump(_dicData, xFile)
+    with _OpenWrite(pathFile, "wb", bAtomic, bSync, iCompressLevel) as xFile:
+        Write(xFile)
     # endwith
 
 
 # enddef
 
 #######################################################################
-# Load Pickel file from path
+# Load Pickel file from path, or from a readable binary file object.
+# Files written with out-of-band buffers are memory-mapped, if they are not compressed,
+# so that NumPy arrays are loaded without copy as read-only views of the file.
 def LoadPickle(_xFilePath):
     import pickle
 
+    def Read(_xFile):
+        iMagicSize = len(g_bytPickleContainerMagic)
+        if hasattr(_xFile, "peek"):
+            bytStart = _xFile.peek(iMagicSize)[0:iMagicSize]
+            if len(bytStart) == iMagicSize:
+                if bytStart == g_bytPickleContainerMagic:
+                    return _LoadPickleContainer(_xFile.read())
+                # endif
+                return pickle.load(_xFile)
+            # endif
+        # endif
+
+        bytStart = _xFile.read(iMagicSize)
+        if bytStart == g_bytPickleContainerMagic:
+            return _LoadPickleContainer(bytStart + _xFile.read())
+        elif _xFile.seekable():
+            _xFile.seek(-len(bytStart), os.SEEK_CUR)
+            return pickle.load(_xFile)
+        # endif
+        return pickle.loads(bytStart + _xFile.read())
+
+    # enddef
+
+    if hasattr(_xFilePath, "read"):
+        return Read(_xFilePath)
+    # endif
+
     pathFile = MakeNormPath(_xFilePath)
 
+    if compress.GetCompression(pathFile) is None:
+        with pathFile.open("rb") as xFile:
+            bIsContainer = xFile.read(len(g_bytPickleContainerMagic)) == g_bytPickleContainerMagic
+        # endwith
+        if bIsContainer is True:
+            return _LoadPickleContainerFile(pathFile)
+        # endif
+    # endif
+
     dicData = None
-    with pathFile.open("rb") as xFile:
-        dicData = pickle.load(xFile)
+    with _OpenRead(pathFile) as xFile:
+        dicData = Read(xFile)
     # endwith
 
     return dicData
@@ -167,7 +1310,7 @@ def LoadText(_xFilePath):
     pathFile = MakeNormPath(_xFilePath)
 
     sText = ""
-    with pathFile.open("r") as xFile:
+    with _OpenRead(pathFile, "r") as xFile:
         sText = xFile.read()
     # endwith
 
@@ -178,10 +1321,12 @@ def LoadText(_xFilePath):
 
 #######################################################################
 # Save text file from relative path to script path
-def SaveText(_xFilePath, _sText):
+def SaveText(
+    _xFilePath, _sText, *, bAtomic: bool = False, bSync: bool = False, iCompressLevel: Optional[int] = None
+):
 
     pathFile = MakeNormPath(_xFilePath)
-    with pathFile.open("w") as xFile:
+    with _OpenWrite(pathFile, "w", bAtomic, bSync, iCompressLevel) as xFile:
         xFile.write(_sText)
     # endwith
 
@@ -28,6 +28,7 @@
 
 from pathlib import Path
 from . import path
+from . import compress
 
 
 def GetVarDict(_xFilepath):
@@ -35,11 +36,13 @@ def GetVarDict(_xFilepath):
     xP = path.MakeNormPath(_xFilepath)
 
     if len(xP.suffix) > 0:
-        # assume given filepath is a path to a file
+        # assume given filepath is a path to a file.
+        # For compressed files like 'cfg.json.gz', the compression suffix is part of the extension.
+        xDataP = compress.GetDataPath(xP)
         dicVar = {
-            "filebasename": xP.stem,
+            "filebasename": xDataP.stem,
             "filename": xP.name,
-            "fileext": xP.suffix,
+            "fileext": xP.name[len(xDataP.stem) :],
             "folder": xP.parent.name,
             "parentfolder": xP.parent.parent.name,
             "path": xP.parent.as_posix(),
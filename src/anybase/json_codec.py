@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+# Pluggable JSON codecs for loading and saving JSON files.
+# The fastest available backend is selected per file type:
+# strict JSON ('.json') is decoded with msgspec if installed, with a fallback
+# to pyjson5 for files that use JSON5 extensions. Files of type '.json5' and '.ison' are
+# always decoded with pyjson5. All encoders produce standard JSON.
+# orjson is only used for decoding, if it is requested explicitly, as it decodes
+# integers that exceed 64 bit as floats and would thereby change the data.
+# As orjson and msgspec write non-finite floats (NaN, Infinity) as 'null', data containing
+# such values is encoded with the standard library, which writes them as 'NaN' and 'Infinity'.
+
+import json
+import math
+from typing import Any, Callable, Optional, Union
+
+import pyjson5
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# endtry
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+# endtry
+
+TBuffer = Union[bytes, bytearray, memoryview]
+
+# Suffixes of files that may contain JSON5 extensions like comments
+g_setJson5Suffix: set[str] = {".json5", ".ison"}
+
+# Backends tried for strict JSON, before the JSON5 parser, if no backend is given
+g_tFastDecoder: tuple[str, ...] = ("msgspec",)
+
+
+#######################################################################
+# Decoders: take a bytes-like object and return the decoded data
+def _DecodeOrJson(_xData: TBuffer) -> Any:
+    return orjson.loads(_xData)
+
+
+# enddef
+
+
+def _DecodeMsgSpec(_xData: TBuffer) -> Any:
+    return msgspec.json.decode(_xData)
+
+
+# enddef
+
+
+# The buffer is parsed in place as UTF-8. Error positions are therefore byte offsets.
+def _DecodePyJson5(_xData: TBuffer, _bAllowTrailingData: bool = False) -> Any:
+    return pyjson5.decode_buffer(_xData, some=_bAllowTrailingData, wordlength=0)
+
+
+# enddef
+
+
+def _DecodeStdLib(_xData: TBuffer) -> Any:
+    return json.loads(bytes(_xData))
+
+
+# enddef
+
+
+#######################################################################
+# Test whether the data contains non-finite floats
+def _HasNonFiniteFloat(_xData: Any) -> bool:
+    lStack = [_xData]
+    while len(lStack) > 0:
+        xValue = lStack.pop()
+        if isinstance(xValue, float):
+            if not math.isfinite(xValue):
+                return True
+            # endif
+        elif isinstance(xValue, dict):
+            lStack.extend(xValue.values())
+        elif isinstance(xValue, (list, tuple)):
+            lStack.extend(xValue)
+        # endif
+    # endwhile
+    return False
+
+
+# enddef
+
+
+#######################################################################
+# Non-finite floats are written as 'null' by orjson and msgspec.
+# The data is only scanned for them, if the encoded data contains 'null' at all.
+def _IsEncodedLossless(_bytData: bytes, _xData: Any) -> bool:
+    return b"null" not in _bytData or not _HasNonFiniteFloat(_xData)
+
+
+# enddef
+
+
+#######################################################################
+# Encoders: return the encoded data or None, if the backend does not support the given options
+# or the given data.
+def _EncodeOrJson(_xData: Any, _iIndent: int, _bSortKeys: bool) -> Optional[bytes]:
+    iOption = orjson.OPT_SORT_KEYS if _bSortKeys is True else 0
+    if _iIndent == 2:
+        iOption |= orjson.OPT_INDENT_2
+    elif _iIndent >= 0:
+        return None
+    # endif
+    bytData = orjson.dumps(_xData, option=iOption)
+    return bytData if _IsEncodedLossless(bytData, _xData) else None
+
+
+# enddef
+
+
+def _EncodeMsgSpec(_xData: Any, _iIndent: int, _bSortKeys: bool) -> Optional[bytes]:
+    if _bSortKeys is True:
+        bytData = msgspec.json.encode(_xData, order="sorted")
+    else:
+        bytData = msgspec.json.encode(_xData)
+    # endif
+    if not _IsEncodedLossless(bytData, _xData):
+        return None
+    # endif
+    if _iIndent >= 0:
+        bytData = msgspec.json.format(bytData, indent=_iIndent)
+    # endif
+    return bytData
+
+
+# enddef
+
+
+def _EncodePyJson5(_xData: Any, _iIndent: int, _bSortKeys: bool) -> Optional[bytes]:
+    if _iIndent >= 0 or _bSortKeys is True:
+        return None
+    # endif
+    return pyjson5.encode(_xData).encode("utf-8")
+
+
+# enddef
+
+
+def _EncodeStdLib(_xData: Any, _iIndent: int, _bSortKeys: bool) -> Optional[bytes]:
+    if _iIndent < 0:
+        sData = json.dumps(_xData, separators=(",", ":"), sort_keys=_bSortKeys)
+    else:
+        sData = json.dumps(_xData, indent=_iIndent, sort_keys=_bSortKeys)
+    # endif
+    return sData.encode("utf-8")
+
+
+# enddef
+
+
+#######################################################################
+# Available backends in order of preference
+g_dicDecoder: dict[str, Callable[[TBuffer], Any]] = dict()
+g_dicEncoder: dict[str, Callable[[Any, int, bool], Optional[bytes]]] = dict()
+
+if orjson is not None:
+    g_dicDecoder["orjson"] = _DecodeOrJson
+    g_dicEncoder["orjson"] = _EncodeOrJson
+# endif
+
+if msgspec is not None:
+    g_dicDecoder["msgspec"] = _DecodeMsgSpec
+    g_dicEncoder["msgspec"] = _EncodeMsgSpec
+# endif
+
+g_dicDecoder["pyjson5"] = _DecodePyJson5
+g_dicEncoder["pyjson5"] = _EncodePyJson5
+g_dicDecoder["json"] = _DecodeStdLib
+g_dicEncoder["json"] = _EncodeStdLib
+
+
+#######################################################################
+def GetBackends() -> list[str]:
+    return list(g_dicDecoder.keys())
+
+
+# enddef
+
+
+#######################################################################
+def _GetDecoder(_sBackend: str) -> Callable[[TBuffer], Any]:
+    funcDecode = g_dicDecoder.get(_sBackend)
+    if funcDecode is None:
+        raise RuntimeError(f"JSON backend '{_sBackend}' not available. Available are: {GetBackends()}")
+    # endif
+    return funcDecode
+
+
+# enddef
+
+
+#######################################################################
+# Decode JSON data from a bytes-like object or string.
+# If no backend is given, the fastest available backend for the file type given by 'sSuffix' is used.
+# If 'bAllowTrailingData' is True, data after the first JSON value is ignored. This is only
+# supported by the JSON5 parser, which is used for data that the other backends reject.
+# Errors of the JSON5 parser are passed on as pyjson5 exceptions.
+def Decode(
+    _xData: Union[TBuffer, str],
+    *,
+    sSuffix: str = ".json",
+    sBackend: Optional[str] = None,
+    bAllowTrailingData: bool = False,
+) -> Any:
+    if isinstance(_xData, str):
+        _xData = _xData.encode("utf-8")
+    # endif
+
+    if sBackend == "pyjson5":
+        return _DecodePyJson5(_xData, bAllowTrailingData)
+    elif sBackend is not None:
+        return _GetDecoder(sBackend)(_xData)
+    # endif
+
+    if sSuffix not in g_setJson5Suffix:
+        for sName in g_tFastDecoder:
+            funcDecode = g_dicDecoder.get(sName)
+            if funcDecode is not None:
+                try:
+                    return funcDecode(_xData)
+                except Exception:
+                    # Not strict JSON, e.g. comments in a '.json' file.
+                    # The JSON5 parser decides whether the data is valid.
+                    break
+                # endtry
+            # endif
+        # endfor
+    # endif
+
+    return _DecodePyJson5(_xData, bAllowTrailingData)
+
+
+# enddef
+
+
+#######################################################################
+# Encode data as JSON. A negative indent results in compact output.
+def Encode(
+    _xData: Any,
+    *,
+    iIndent: int = -1,
+    bSortKeys: bool = False,
+    sBackend: Optional[str] = None,
+) -> bytes:
+    if sBackend is not None:
+        funcEncode = g_dicEncoder.get(sBackend)
+        if funcEncode is None:
+            raise RuntimeError(f"JSON backend '{sBackend}' not available. Available are: {GetBackends()}")
+        # endif
+        bytData = funcEncode(_xData, iIndent, bSortKeys)
+        if bytData is None:
+            raise RuntimeError(
+                f"JSON backend '{sBackend}' does not support indent {iIndent}, sorted keys or non-finite floats"
+            )
+        # endif
+        return bytData
+    # endif
+
+    for sName, funcEncode in g_dicEncoder.items():
+        if sName == "pyjson5":
+            continue
+        # endif
+        try:
+            bytData = funcEncode(_xData, iIndent, bSortKeys)
+        except Exception:
+            # E.g. non-string keys or integers that exceed 64 bit, which the standard library supports
+            bytData = None
+        # endtry
+        if bytData is not None:
+            return bytData
+        # endif
+    # endfor
+
+    return _EncodeStdLib(_xData, iIndent, bSortKeys)
+
+
+# enddef
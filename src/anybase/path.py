@@ -25,7 +25,10 @@
 ###
 
 import os
-from typing import Union
+import re
+import time
+import functools
+from typing import Optional, Union
 from pathlib import Path
 from .cls_any_error import CAnyError, CAnyError_Message
 
@@ -44,7 +47,88 @@ def ProvideWriteFilepathExt(_xFilepath, _sExt):
 
 
 #######################################################################
-def ProvideReadFilepathExt(_xFilepath, _lExt, bDoRaise=False):
+# Directory listing cache for ProvideReadFilepathExt().
+# A cached listing answers all extension probes for a folder with a single scandir call.
+# Files created or removed within the time-to-live of a listing may not be seen.
+# The cache is disabled by default, i.e. for a time-to-live of zero.
+g_fDirListCacheTtl_s: float = 0.0
+g_iDirListCacheMaxSize: int = 1024
+g_dicDirListCache: dict[str, tuple[float, Optional[frozenset]]] = {}
+
+
+#######################################################################
+# Set the default time-to-live of cached directory listings. Zero disables the cache.
+def SetDirListCacheTtl(_fTtl_s: float):
+    global g_fDirListCacheTtl_s
+
+    g_fDirListCacheTtl_s = max(0.0, float(_fTtl_s))
+    if g_fDirListCacheTtl_s == 0.0:
+        g_dicDirListCache.clear()
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+# Remove the listing of the given directory, or all listings, from the cache
+def ClearDirListCache(_xDir=None):
+    if _xDir is None:
+        g_dicDirListCache.clear()
+    else:
+        sKey = os.path.normcase(MakeNormPath(_xDir).as_posix())
+        g_dicDirListCache.pop(sKey, None)
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+# Returns the set of existing entry names of a directory from the cache.
+# Returns None if the directory cannot be listed, so that the caller tests the files
+# directly.
+def _GetDirListing(_pathDir: Path, _fTtl_s: float) -> Optional[frozenset]:
+    sKey = os.path.normcase(_pathDir.as_posix())
+    fNow = time.monotonic()
+    tEntry = g_dicDirListCache.get(sKey)
+    if tEntry is not None and fNow - tEntry[0] < _fTtl_s:
+        return tEntry[1]
+    # endif
+
+    try:
+        with os.scandir(_pathDir) as xIter:
+            # Path.exists() is False for broken symbolic links
+            setNames = frozenset(
+                os.path.normcase(xEntry.name)
+                for xEntry in xIter
+                if not xEntry.is_symlink() or os.path.exists(xEntry.path)
+            )
+        # endwith
+    except (FileNotFoundError, NotADirectoryError):
+        setNames = frozenset()
+    except OSError:
+        setNames = None
+    # endtry
+
+    if len(g_dicDirListCache) >= g_iDirListCacheMaxSize:
+        g_dicDirListCache.clear()
+    # endif
+    g_dicDirListCache[sKey] = (fNow, setNames)
+    return setNames
+
+
+# enddef
+
+
+#######################################################################
+# If the file path has no extension, returns the path with the first of the given
+# extensions, for which the file exists.
+# If 'fCacheTtl_s' is None, the default set by SetDirListCacheTtl() is used.
+# For a positive value, the folder listing is cached for this time.
+def ProvideReadFilepathExt(
+    _xFilepath, _lExt, bDoRaise=False, *, fCacheTtl_s: Optional[float] = None
+):
 
     pathFile = MakeNormPath(_xFilepath)
     sExt = pathFile.suffix
@@ -52,9 +136,19 @@ def ProvideReadFilepathExt(_xFilepath, _lExt, bDoRaise=False):
         return pathFile
     # endif
 
+    fTtl_s = g_fDirListCacheTtl_s if fCacheTtl_s is None else fCacheTtl_s
+    setNames = None
+    if fTtl_s > 0.0:
+        setNames = _GetDirListing(pathFile.parent, fTtl_s)
+    # endif
+
     for sExt in _lExt:
         pathNew = pathFile.parent / (pathFile.name + sExt)
-        if pathNew.exists():
+        if setNames is not None:
+            if os.path.normcase(pathNew.name) in setNames:
+                return pathNew
+            # endif
+        elif pathNew.exists():
             return pathNew
         # endif
     # endfor
@@ -130,16 +224,79 @@ def CreateDir(_xAbsPath):
 # enddef
 
 
+#######################################################################
+# Names of the environment variables, which influence the expansion of a path string
+if os.name == "nt":
+    g_reEnvVar = re.compile(r"\$(\w+)|\$\{([^}]*)\}|%([^%]*)%")
+    g_tHomeVars = ("USERPROFILE", "HOMEDRIVE", "HOMEPATH")
+else:
+    g_reEnvVar = re.compile(r"\$(\w+)|\$\{([^}]*)\}")
+    g_tHomeVars = ("HOME",)
+# endif
+
+
+#######################################################################
+# Returns the values of the environment variables a path string depends on.
+# The result is part of the cache key of the normalized paths, so that the cache
+# entry of a path is not used anymore, when one of these variables changes.
+def _GetPathEnvDeps(_sPath: str) -> tuple:
+    if "$" not in _sPath and "~" not in _sPath and "%" not in _sPath:
+        return ()
+    # endif
+
+    lDeps = []
+    if _sPath.startswith("~"):
+        lDeps.extend((sName, os.environ.get(sName)) for sName in g_tHomeVars)
+    # endif
+    for xMatch in g_reEnvVar.finditer(_sPath):
+        sName = next(sGroup for sGroup in xMatch.groups() if sGroup is not None)
+        lDeps.append((sName, os.environ.get(sName)))
+    # endfor
+    return tuple(lDeps)
+
+
+# enddef
+
+
+#######################################################################
+@functools.lru_cache(maxsize=4096)
+def _NormPathStr(_sPath: str, _tEnvDeps: tuple) -> str:
+    return Path(
+        os.path.normpath(os.path.expandvars(os.path.expanduser(_sPath)))
+    ).as_posix()
+
+
+# enddef
+
+
+#######################################################################
+# Path objects are immutable, so that the cached instances can be shared
+@functools.lru_cache(maxsize=4096)
+def _NormPathObj(_pathX: Path, _tEnvDeps: tuple) -> Path:
+    return Path(os.path.normpath(os.path.expandvars(os.path.expanduser(_pathX))))
+
+
+# enddef
+
+
+#######################################################################
+# Clear the cache of normalized paths
+def ClearNormPathCache():
+    _NormPathStr.cache_clear()
+    _NormPathObj.cache_clear()
+
+
+# enddef
+
+
 #######################################################################
 def NormPath(_xPath: Union[str, Path]):
 
     if isinstance(_xPath, str):
-        return Path(
-            os.path.normpath(os.path.expandvars(os.path.expanduser(_xPath)))
-        ).as_posix()
+        return _NormPathStr(_xPath, _GetPathEnvDeps(_xPath))
 
     elif isinstance(_xPath, Path):
-        return Path(NormPath(_xPath.as_posix()))
+        return _NormPathObj(_xPath, _GetPathEnvDeps(str(_xPath)))
 
     else:
         raise CAnyError_Message(
@@ -166,10 +323,13 @@ def MakePath(_xParts: Union[str, list, tuple, Path]) -> Path:
             pathX = Path(".")
 
         else:
-            pathX = MakePath(_xParts[0])
-            for xPart in _xParts[1:]:
-                pathX /= MakePath(xPart)
-            # endfor
+            # Joining all parts at once is equivalent to joining them one after another
+            pathX = Path(
+                *(
+                    xPart if isinstance(xPart, str) else MakePath(xPart)
+                    for xPart in _xParts
+                )
+            )
         # endif
 
     elif isinstance(_xParts, Path):
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+
+# Recursive globbing based on os.scandir().
+# The pattern is split into components once. Literal components are tested directly,
+# wildcard components are matched with a compiled regular expression, and only
+# matching folders are descended into. The results are equal to those of
+# 'glob.glob(pattern, recursive=True)' with normalized paths, in the same order,
+# except that consecutive '**' components do not return duplicates, and that
+# a final '**' does not match a folder that does not exist.
+# Names starting with '.' are only matched by components starting with '.'.
+
+import os
+import re
+import fnmatch
+import threading
+from typing import Callable, Iterator, Optional
+
+g_reMagic = re.compile(r"[*?[]")
+
+# Defaults of IterGlob() and Glob(), used by the '$dir_list' function
+g_iDefaultMaxWorkers: int = 1
+g_bDefaultCache: bool = False
+
+# Cached results: pattern -> (directory modification times, result paths)
+g_iCacheMaxSize: int = 64
+g_dicCache: dict[str, tuple[dict[str, int], list[str]]] = {}
+g_xCacheLock = threading.Lock()
+
+
+#######################################################################
+# Set the defaults for parallel traversal and result caching
+def SetGlobDefaults(*, iMaxWorkers: Optional[int] = None, bCache: Optional[bool] = None):
+    global g_iDefaultMaxWorkers, g_bDefaultCache
+
+    if iMaxWorkers is not None:
+        g_iDefaultMaxWorkers = max(1, iMaxWorkers)
+    # endif
+    if bCache is not None:
+        g_bDefaultCache = bCache
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+def ClearGlobCache():
+    with g_xCacheLock:
+        g_dicCache.clear()
+    # endwith
+
+
+# enddef
+
+
+#######################################################################
+# Pattern component: literal name, '**', or compiled wildcard pattern
+class _CComponent:
+    def __init__(self, _sPattern: str):
+        self.sPattern: str = _sPattern
+        self.bRecursive: bool = _sPattern == "**"
+        self.bMagic: bool = self.bRecursive or g_reMagic.search(_sPattern) is not None
+        self.bMatchHidden: bool = _sPattern.startswith(".")
+        self.funcMatch: Optional[Callable] = None
+        if self.bMagic and not self.bRecursive:
+            iFlags = re.IGNORECASE if os.name == "nt" else 0
+            self.funcMatch = re.compile(fnmatch.translate(_sPattern), iFlags).match
+        # endif
+
+    # enddef
+
+    def Matches(self, _sName: str) -> bool:
+        if _sName.startswith(".") and not self.bMatchHidden:
+            return False
+        # endif
+        return self.funcMatch(_sName) is not None
+
+    # enddef
+
+
+# endclass
+
+
+#######################################################################
+class _CGlobWalker:
+    def __init__(self, _lComponents: list[_CComponent], _bRecordMTimes: bool):
+        self.lComponents = _lComponents
+        self.iLastIdx = len(_lComponents) - 1
+        self.dicMTimes: Optional[dict[str, int]] = {} if _bRecordMTimes else None
+
+    # enddef
+
+    # ##############################################################################
+    def _Record(self, _sDir: str):
+        if self.dicMTimes is not None and _sDir not in self.dicMTimes:
+            try:
+                self.dicMTimes[_sDir] = os.stat(_sDir or ".").st_mtime_ns
+            except OSError:
+                self.dicMTimes[_sDir] = -1
+            # endtry
+        # endif
+
+    # enddef
+
+    # ##############################################################################
+    def ScanDir(self, _sDir: str) -> list:
+        self._Record(_sDir)
+        try:
+            with os.scandir(_sDir or ".") as xIter:
+                return list(xIter)
+            # endwith
+        except OSError:
+            return []
+        # endtry
+
+    # enddef
+
+    # ##############################################################################
+    @staticmethod
+    def Join(_sDir: str, _sName: str) -> str:
+        if len(_sDir) == 0:
+            return _sName
+        elif _sDir.endswith("/"):
+            return _sDir + _sName
+        # endif
+        return _sDir + "/" + _sName
+
+    # enddef
+
+    # ##############################################################################
+    @staticmethod
+    def IsDir(_xEntry) -> bool:
+        try:
+            return _xEntry.is_dir()
+        except OSError:
+            return False
+        # endtry
+
+    # enddef
+
+    # ##############################################################################
+    # Returns the sub-tasks for matching component '_iIdx' in folder '_sDir'.
+    # Each task is a callable returning an iterator of result paths.
+    # The results of all tasks in order are the results of Match().
+    def GetTasks(self, _sDir: str, _iIdx: int) -> list[Callable[[], Iterator[str]]]:
+        xComp = self.lComponents[_iIdx]
+        if not xComp.bMagic:
+            return [lambda: self.Match(_sDir, _iIdx)]
+        # endif
+
+        lEntries = self.ScanDir(_sDir)
+        lTasks = []
+        if xComp.bRecursive and _iIdx == self.iLastIdx:
+            # Consecutive files are matched in one task, each sub-folder in a separate task
+            lFiles = [_sDir] if len(_sDir) > 0 else []
+            for xEntry in lEntries:
+                if xEntry.name.startswith("."):
+                    continue
+                # endif
+                sPath = self.Join(_sDir, xEntry.name)
+                if self.IsDir(xEntry):
+                    if len(lFiles) > 0:
+                        lTasks.append(lambda lFiles=lFiles: iter(lFiles))
+                        lFiles = []
+                    # endif
+                    lTasks.append(lambda sPath=sPath: self._MatchRecursiveBelow(sPath, _iIdx))
+                else:
+                    lFiles.append(sPath)
+                # endif
+            # endfor
+            if len(lFiles) > 0:
+                lTasks.append(lambda lFiles=lFiles: iter(lFiles))
+            # endif
+        elif xComp.bRecursive:
+            lTasks.append(lambda: self.Match(_sDir, _iIdx + 1, lEntries))
+            for xEntry in lEntries:
+                if not xEntry.name.startswith(".") and self.IsDir(xEntry):
+                    sPath = self.Join(_sDir, xEntry.name)
+                    lTasks.append(lambda sPath=sPath: self._MatchRecursiveBelow(sPath, _iIdx))
+                # endif
+            # endfor
+        elif _iIdx == self.iLastIdx:
+            lTasks.append(lambda: self._MatchEntries(_sDir, _iIdx, lEntries))
+        else:
+            for xEntry in lEntries:
+                if xComp.Matches(xEntry.name) and self.IsDir(xEntry):
+                    sPath = self.Join(_sDir, xEntry.name)
+                    lTasks.append(lambda sPath=sPath: self.Match(sPath, _iIdx + 1))
+                # endif
+            # endfor
+        # endif
+        return lTasks
+
+    # enddef
+
+    # ##############################################################################
+    # Iterate over the paths matching the components from '_iIdx' on, in folder '_sDir'
+    def Match(self, _sDir: str, _iIdx: int, _lEntries: Optional[list] = None) -> Iterator[str]:
+        xComp = self.lComponents[_iIdx]
+
+        if not xComp.bMagic:
+            sPath = self.Join(_sDir, xComp.sPattern)
+            self._Record(_sDir)
+            if _iIdx == self.iLastIdx:
+                if os.path.lexists(sPath):
+                    yield sPath
+                # endif
+            elif os.path.isdir(sPath):
+                yield from self.Match(sPath, _iIdx + 1)
+            # endif
+            return
+        # endif
+
+        lEntries = self.ScanDir(_sDir) if _lEntries is None else _lEntries
+        if xComp.bRecursive and _iIdx == self.iLastIdx:
+            if len(_sDir) > 0:
+                yield _sDir
+            # endif
+            yield from self._IterTree(_sDir, lEntries)
+
+        elif xComp.bRecursive:
+            yield from self.Match(_sDir, _iIdx + 1, lEntries)
+            for xEntry in lEntries:
+                if not xEntry.name.startswith(".") and self.IsDir(xEntry):
+                    yield from self._MatchRecursiveBelow(self.Join(_sDir, xEntry.name), _iIdx)
+                # endif
+            # endfor
+
+        elif _iIdx == self.iLastIdx:
+            yield from self._MatchEntries(_sDir, _iIdx, lEntries)
+
+        else:
+            for xEntry in lEntries:
+                if xComp.Matches(xEntry.name) and self.IsDir(xEntry):
+                    yield from self.Match(self.Join(_sDir, xEntry.name), _iIdx + 1)
+                # endif
+            # endfor
+        # endif
+
+    # enddef
+
+    # ##############################################################################
+    def _MatchEntries(self, _sDir: str, _iIdx: int, _lEntries: list) -> Iterator[str]:
+        xComp = self.lComponents[_iIdx]
+        for xEntry in _lEntries:
+            if xComp.Matches(xEntry.name):
+                yield self.Join(_sDir, xEntry.name)
+            # endif
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    # All files and sub-folders below a folder in pre-order, for a final '**'
+    def _IterTree(self, _sDir: str, _lEntries: list) -> Iterator[str]:
+        for xEntry in _lEntries:
+            if xEntry.name.startswith("."):
+                continue
+            # endif
+            sPath = self.Join(_sDir, xEntry.name)
+            yield sPath
+            if self.IsDir(xEntry):
+                yield from self._IterTree(sPath, self.ScanDir(sPath))
+            # endif
+        # endfor
+
+    # enddef
+
+    # ##############################################################################
+    # Results of '**' and the following components in a sub-folder, which matches '**'
+    def _MatchRecursiveBelow(self, _sDir: str, _iIdx: int) -> Iterator[str]:
+        if _iIdx == self.iLastIdx:
+            yield _sDir
+            yield from self._IterTree(_sDir, self.ScanDir(_sDir))
+        else:
+            yield from self.Match(_sDir, _iIdx)
+        # endif
+
+    # enddef
+
+
+# endclass
+
+
+#######################################################################
+# Split a normalized pattern into the literal base folder and the pattern components
+def _SplitPattern(_sPattern: str) -> tuple[str, list[_CComponent]]:
+    lParts = _sPattern.split("/")
+    iBaseCnt = 0
+    while iBaseCnt < len(lParts) - 1 and g_reMagic.search(lParts[iBaseCnt]) is None:
+        iBaseCnt += 1
+    # endwhile
+
+    sBase = "/".join(lParts[0:iBaseCnt])
+    if iBaseCnt > 0 and (len(sBase) == 0 or sBase.endswith(":")):
+        # Root folder of absolute paths, e.g. '/*' or 'C:/*'
+        sBase += "/"
+    # endif
+
+    lComponents = []
+    for sPart in lParts[iBaseCnt:]:
+        # Consecutive '**' components are equivalent to a single one
+        if sPart == "**" and len(lComponents) > 0 and lComponents[-1].bRecursive:
+            continue
+        # endif
+        lComponents.append(_CComponent(sPart))
+    # endfor
+
+    return sBase, lComponents
+
+
+# enddef
+
+
+#######################################################################
+def _IsCacheValid(_dicMTimes: dict[str, int]) -> bool:
+    for sDir, iMTime in _dicMTimes.items():
+        try:
+            if os.stat(sDir or ".").st_mtime_ns != iMTime:
+                return False
+            # endif
+        except OSError:
+            if iMTime != -1:
+                return False
+            # endif
+        # endtry
+    # endfor
+    return True
+
+
+# enddef
+
+
+#######################################################################
+# Iterate over the paths matching a glob pattern with '**' for recursion.
+# The pattern must be normalized, e.g. with path.NormPath(). The resulting
+# paths are normalized as well.
+# If 'iMaxWorkers' is larger than 1, the top-level sub-trees are traversed in parallel threads.
+# The results are still returned in order, but the results of each sub-tree are collected first.
+# If 'bCache' is True, the results are cached and reused, as long as the modification times
+# of all folders visited are unchanged. Note that file systems with coarse time stamps
+# may not show changes, which happen within the same time stamp interval as the listing.
+def IterGlob(
+    _sPattern: str, *, iMaxWorkers: Optional[int] = None, bCache: Optional[bool] = None
+) -> Iterator[str]:
+    iMaxWorkers = g_iDefaultMaxWorkers if iMaxWorkers is None else iMaxWorkers
+    bCache = g_bDefaultCache if bCache is None else bCache
+
+    if bCache is True:
+        with g_xCacheLock:
+            tEntry = g_dicCache.get(_sPattern)
+        # endwith
+        if tEntry is not None and _IsCacheValid(tEntry[0]):
+            yield from tEntry[1]
+            return
+        # endif
+    # endif
+
+    sBase, lComponents = _SplitPattern(_sPattern)
+    if len(lComponents) == 1 and not lComponents[0].bMagic:
+        # Pattern without wildcards
+        if os.path.lexists(_sPattern):
+            yield _sPattern
+        # endif
+        return
+    # endif
+
+    if len(sBase) > 0 and not os.path.isdir(sBase):
+        return
+    # endif
+
+    xWalker = _CGlobWalker(lComponents, bCache)
+    if iMaxWorkers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        lTasks = xWalker.GetTasks(sBase, 0)
+        with ThreadPoolExecutor(max_workers=iMaxWorkers) as xPool:
+            lResults = []
+            for lTaskResults in xPool.map(lambda funcTask: list(funcTask()), lTasks):
+                if bCache is True:
+                    lResults.extend(lTaskResults)
+                # endif
+                yield from lTaskResults
+            # endfor
+        # endwith
+    else:
+        lResults = []
+        for sPath in xWalker.Match(sBase, 0):
+            if bCache is True:
+                lResults.append(sPath)
+            # endif
+            yield sPath
+        # endfor
+    # endif
+
+    if bCache is True:
+        with g_xCacheLock:
+            if len(g_dicCache) >= g_iCacheMaxSize:
+                g_dicCache.pop(next(iter(g_dicCache)))
+            # endif
+            g_dicCache[_sPattern] = (xWalker.dicMTimes, lResults)
+        # endwith
+    # endif
+
+
+# enddef
+
+
+#######################################################################
+# Returns the list of paths matching a glob pattern. See IterGlob().
+def Glob(_sPattern: str, *, iMaxWorkers: Optional[int] = None, bCache: Optional[bool] = None) -> list[str]:
+    return list(IterGlob(_sPattern, iMaxWorkers=iMaxWorkers, bCache=bCache))
+
+
+# enddef
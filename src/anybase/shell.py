@@ -26,11 +26,11 @@
 
 
 import os
+import re
 import time
-import queue
-import threading
-import select
-from typing import Callable, Optional, Union, IO
+import codecs
+import locale
+from typing import Optional, Union
 
 # import asyncio
 import subprocess
@@ -38,6 +38,9 @@ import tempfile
 from pathlib import Path
 from .cls_any_error import CAnyError_Message
 from .cls_process_handler import CProcessHandler
+from .cls_exec_env import CExecEnv
+from .cls_exec_backend import CExecBackend, CExecProcess
+from .cls_exec_backend_local import CExecBackendLocal
 
 
 #################################################################################################################
@@ -50,8 +53,15 @@ def ExecCmd(
     bDoRaiseOnError: bool = False,
     bReturnStdOut: bool = False,
     sPrintPrefix: str = "",
-    dicEnv: Optional[dict] = None,
+    dicEnv: Optional[Union[dict, CExecEnv]] = None,
     xProcHandler: Optional[CProcessHandler] = None,
+    fTimeout_s: Optional[float] = None,
+    fInactivityTimeout_s: Optional[float] = None,
+    fTerminateGrace_s: float = 5.0,
+    bNewProcessGroup: bool = False,
+    bReadChunks: bool = False,
+    iChunkSize: int = 65536,
+    xBackend: Optional[CExecBackend] = None,
 ) -> Union[tuple[bool, list[str]], bool]:
     if sCwd is None:
         sEffCwd = os.getcwd()
@@ -59,15 +69,10 @@ def ExecCmd(
         sEffCwd = sCwd
     # endif
 
-    dicEnviron = os.environ.copy()
-    if dicEnv is not None:
-        dicEnviron.update(dicEnv)
-    # endif
-
     return _ExecProc(
         xCmd=sCmd,
         sCwd=sEffCwd,
-        dicEnviron=dicEnviron,
+        xEnv=dicEnv,
         bShell=True,
         bDoPrint=bDoPrint,
         bDoPrintOnError=bDoPrintOnError,
@@ -75,6 +80,13 @@ def ExecCmd(
         bReturnStdOut=bReturnStdOut,
         sPrintPrefix=sPrintPrefix,
         xProcHandler=xProcHandler,
+        fTimeout_s=fTimeout_s,
+        fInactivityTimeout_s=fInactivityTimeout_s,
+        fTerminateGrace_s=fTerminateGrace_s,
+        bNewProcessGroup=bNewProcessGroup,
+        bReadChunks=bReadChunks,
+        iChunkSize=iChunkSize,
+        xBackend=xBackend,
     )
 
 
@@ -92,8 +104,15 @@ def ExecShellCmds(
     bDoRaiseOnError: bool = False,
     bReturnStdOut: bool = False,
     sPrintPrefix: str = "",
-    dicEnv: Optional[dict] = None,
+    dicEnv: Optional[Union[dict, CExecEnv]] = None,
     xProcHandler: Optional[CProcessHandler] = None,
+    fTimeout_s: Optional[float] = None,
+    fInactivityTimeout_s: Optional[float] = None,
+    fTerminateGrace_s: float = 5.0,
+    bNewProcessGroup: bool = False,
+    bReadChunks: bool = False,
+    iChunkSize: int = 65536,
+    xBackend: Optional[CExecBackend] = None,
 ) -> Union[tuple[bool, list[str]], bool]:
     if not isinstance(lCmds, list):
         raise CAnyError_Message(sMsg="Argument 'lCmds' must be a list")
@@ -105,11 +124,6 @@ def ExecShellCmds(
         sEffCwd = sCwd
     # endif
 
-    dicEnviron = os.environ.copy()
-    if dicEnv is not None:
-        dicEnviron.update(dicEnv)
-    # endif
-
     sCmd = "\n".join(lCmds)
 
     pathScript = None
@@ -123,7 +137,7 @@ def ExecShellCmds(
     return _ExecProc(
         xCmd=lCmd,
         sCwd=sEffCwd,
-        dicEnviron=dicEnviron,
+        xEnv=dicEnv,
         bShell=False,
         bDoPrint=bDoPrint,
         bDoPrintOnError=bDoPrintOnError,
@@ -131,6 +145,13 @@ def ExecShellCmds(
         bReturnStdOut=bReturnStdOut,
         sPrintPrefix=sPrintPrefix,
         xProcHandler=xProcHandler,
+        fTimeout_s=fTimeout_s,
+        fInactivityTimeout_s=fInactivityTimeout_s,
+        fTerminateGrace_s=fTerminateGrace_s,
+        bNewProcessGroup=bNewProcessGroup,
+        bReadChunks=bReadChunks,
+        iChunkSize=iChunkSize,
+        xBackend=xBackend,
     )
 
 
@@ -147,8 +168,15 @@ def ExecPowerShellCmds(
     bDoRaiseOnError: bool = False,
     bReturnStdOut: bool = False,
     sPrintPrefix: str = "",
-    dicEnv: Optional[dict] = None,
+    dicEnv: Optional[Union[dict, CExecEnv]] = None,
     xProcHandler: Optional[CProcessHandler] = None,
+    fTimeout_s: Optional[float] = None,
+    fInactivityTimeout_s: Optional[float] = None,
+    fTerminateGrace_s: float = 5.0,
+    bNewProcessGroup: bool = False,
+    bReadChunks: bool = False,
+    iChunkSize: int = 65536,
+    xBackend: Optional[CExecBackend] = None,
 ) -> Union[tuple[bool, list[str]], bool]:
     return ExecShellCmds(
         sShellPath="powershell.exe",
@@ -161,6 +189,13 @@ def ExecPowerShellCmds(
         sPrintPrefix=sPrintPrefix,
         dicEnv=dicEnv,
         xProcHandler=xProcHandler,
+        fTimeout_s=fTimeout_s,
+        fInactivityTimeout_s=fInactivityTimeout_s,
+        fTerminateGrace_s=fTerminateGrace_s,
+        bNewProcessGroup=bNewProcessGroup,
+        bReadChunks=bReadChunks,
+        iChunkSize=iChunkSize,
+        xBackend=xBackend,
     )
 
 
@@ -177,8 +212,15 @@ def ExecBashCmds(
     bDoRaiseOnError: bool = False,
     bReturnStdOut: bool = False,
     sPrintPrefix: str = "",
-    dicEnv: Optional[dict] = None,
+    dicEnv: Optional[Union[dict, CExecEnv]] = None,
     xProcHandler: Optional[CProcessHandler] = None,
+    fTimeout_s: Optional[float] = None,
+    fInactivityTimeout_s: Optional[float] = None,
+    fTerminateGrace_s: float = 5.0,
+    bNewProcessGroup: bool = False,
+    bReadChunks: bool = False,
+    iChunkSize: int = 65536,
+    xBackend: Optional[CExecBackend] = None,
 ) -> Union[tuple[bool, list[str]], bool]:
     return ExecShellCmds(
         sShellPath="/bin/bash",
@@ -191,6 +233,13 @@ def ExecBashCmds(
         sPrintPrefix=sPrintPrefix,
         dicEnv=dicEnv,
         xProcHandler=xProcHandler,
+        fTimeout_s=fTimeout_s,
+        fInactivityTimeout_s=fInactivityTimeout_s,
+        fTerminateGrace_s=fTerminateGrace_s,
+        bNewProcessGroup=bNewProcessGroup,
+        bReadChunks=bReadChunks,
+        iChunkSize=iChunkSize,
+        xBackend=xBackend,
     )
 
 
@@ -208,8 +257,15 @@ def ExecProgram(
     bDoRaiseOnError: bool = False,
     bReturnStdOut: bool = False,
     sPrintPrefix: str = "",
-    dicEnv: Optional[dict] = None,
+    dicEnv: Optional[Union[dict, CExecEnv]] = None,
     xProcHandler: Optional[CProcessHandler] = None,
+    fTimeout_s: Optional[float] = None,
+    fInactivityTimeout_s: Optional[float] = None,
+    fTerminateGrace_s: float = 5.0,
+    bNewProcessGroup: bool = False,
+    bReadChunks: bool = False,
+    iChunkSize: int = 65536,
+    xBackend: Optional[CExecBackend] = None,
 ) -> Union[tuple[bool, list[str]], bool]:
     if sCwd is None:
         sEffCwd = os.getcwd()
@@ -217,18 +273,13 @@ def ExecProgram(
         sEffCwd = sCwd
     # endif
 
-    dicEnviron = os.environ.copy()
-    if dicEnv is not None:
-        dicEnviron.update(dicEnv)
-    # endif
-
     lCmd = [sProgram]
     lCmd.extend(lArgs)
 
     return _ExecProc(
         xCmd=lCmd,
         sCwd=sEffCwd,
-        dicEnviron=dicEnviron,
+        xEnv=dicEnv,
         bShell=False,
         bDoPrint=bDoPrint,
         bDoPrintOnError=bDoPrintOnError,
@@ -236,6 +287,13 @@ def ExecProgram(
         bReturnStdOut=bReturnStdOut,
         sPrintPrefix=sPrintPrefix,
         xProcHandler=xProcHandler,
+        fTimeout_s=fTimeout_s,
+        fInactivityTimeout_s=fInactivityTimeout_s,
+        fTerminateGrace_s=fTerminateGrace_s,
+        bNewProcessGroup=bNewProcessGroup,
+        bReadChunks=bReadChunks,
+        iChunkSize=iChunkSize,
+        xBackend=xBackend,
     )
 
 
@@ -243,16 +301,47 @@ def ExecProgram(
 
 
 #################################################################################################################
-def _ReadPipeToQueue(_xPipe: IO[str], _qLines: queue.Queue):
-    for sLine in iter(_xPipe.readline, ""):
-        _qLines.put(sLine)
-    # endfor
-    _xPipe.close()
+class _CLineSplitter:
+    """Incrementally decodes byte chunks and splits them into lines.
 
-    # # print(">> READ PIPE TO QUEUE ENDED")
+    Lines are terminated by '\\n', '\\r\\n' or a single '\\r', so that carriage-return
+    progress bars result in one line per update. The line terminators are kept.
+    """
 
+    reLine = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)")
 
-# enddef
+    def __init__(self, _sEncoding: str):
+        self._xDecoder = codecs.getincrementaldecoder(_sEncoding)(errors="replace")
+        self._sPending: str = ""
+
+    # enddef
+
+    def Push(self, _bytChunk: bytes, *, _bFinal: bool = False) -> list[str]:
+        sText = self._sPending + self._xDecoder.decode(_bytChunk, final=_bFinal)
+
+        lLines: list[str] = []
+        iEnd: int = 0
+        for xMatch in self.reLine.finditer(sText):
+            # A trailing '\r' may be the first half of a '\r\n' split across chunks
+            if _bFinal is False and xMatch.end() == len(sText) and sText.endswith("\r"):
+                break
+            # endif
+            lLines.append(xMatch.group(0))
+            iEnd = xMatch.end()
+        # endfor
+
+        self._sPending = sText[iEnd:]
+        if _bFinal is True and len(self._sPending) > 0:
+            lLines.append(self._sPending)
+            self._sPending = ""
+        # endif
+
+        return lLines
+
+    # enddef
+
+
+# endclass
 
 
 #################################################################################################################
@@ -260,7 +349,7 @@ def _ExecProc(
     *,
     xCmd: Union[str, list],
     sCwd: str,
-    dicEnviron: dict,
+    xEnv: Optional[Union[dict, CExecEnv]],
     bShell: bool,
     bDoPrint: bool = False,
     bDoPrintOnError: bool = False,
@@ -268,6 +357,13 @@ def _ExecProc(
     bReturnStdOut: bool = False,
     sPrintPrefix: str = "",
     xProcHandler: Optional[CProcessHandler] = None,
+    fTimeout_s: Optional[float] = None,
+    fInactivityTimeout_s: Optional[float] = None,
+    fTerminateGrace_s: float = 5.0,
+    bNewProcessGroup: bool = False,
+    bReadChunks: bool = False,
+    iChunkSize: int = 65536,
+    xBackend: Optional[CExecBackend] = None,
 ) -> Union[tuple[bool, list[str]], bool]:
     lCmd: list = None
     if isinstance(xCmd, list):
@@ -292,113 +388,180 @@ def _ExecProc(
         xProcHandler.PreStart(lCmd)
     # endif
 
-    qLines = queue.Queue()
+    if xBackend is None:
+        xBackend = CExecBackendLocal()
+    # endif
 
-    procChild = subprocess.Popen(
-        xCmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        shell=bShell,
-        cwd=sCwd,
-        universal_newlines=True,
-        env=dicEnviron,
+    xProc: CExecProcess = xBackend.Start(
+        xCmd=xCmd,
+        sCwd=sCwd,
+        xEnv=xEnv,
+        bShell=bShell,
+        bReadChunks=bReadChunks,
+        iChunkSize=iChunkSize,
+        bNewProcessGroup=bNewProcessGroup,
     )
 
-    threadRead = threading.Thread(target=_ReadPipeToQueue, args=(procChild.stdout, qLines), daemon=True)
-    threadRead.start()
-
+    xProcHandler.SetExecHost(xBackend.sHost)
     if xProcHandler.bPostStartAvailable:
-        xProcHandler.PostStart(lCmd, procChild.pid)
+        xProcHandler.PostStart(lCmd, xProc.iPid)
     # endif
 
     lLines = []
+
+    # In chunked read mode, lines are only decoded if they are needed,
+    # i.e. if there is no chunk handler, or if the lines are handled or returned as well.
+    xLineSplitter: _CLineSplitter = None
+    if bReadChunks is True and (
+        xProcHandler.bStdOutAvailable or not xProcHandler.bStdOutChunkAvailable or bReturnStdOut is True
+    ):
+        xLineSplitter = _CLineSplitter(locale.getpreferredencoding(False))
+    # endif
+
+    def HandleLine(_sLine: str):
+        if xProcHandler.bStdOutAvailable:
+            xProcHandler.StdOut(_sLine)
+        else:
+            lLines.append(_sLine)
+            if bDoPrint:
+                print(sPrintPrefix + _sLine, end="", flush=True)
+            # endif
+        # endif
+
+    # enddef
+
+    def HandleOutput(_xOutput: Union[str, bytes]):
+        if bReadChunks is False:
+            HandleLine(_xOutput)
+            return
+        # endif
+
+        if xProcHandler.bStdOutChunkAvailable:
+            xProcHandler.StdOutChunk(_xOutput)
+        # endif
+
+        if xLineSplitter is not None:
+            for sLine in xLineSplitter.Push(_xOutput):
+                HandleLine(sLine)
+            # endfor
+        # endif
+
+    # enddef
+
     bTerminate: bool = False
+    sTerminateReason: str = None
+    fTimeoutFired_s: float = None
+    fStartTime_s: float = time.monotonic()
+    fLastOutputTime_s: float = fStartTime_s
 
-    while True:
+    try:
         while True:
-            if xProcHandler.bPollTerminateAvailable:
-                bTerminate = xProcHandler.PollTerminate()
-                if bTerminate is True:
+            while True:
+                if xProcHandler.bPollTerminateAvailable:
+                    bTerminate = xProcHandler.PollTerminate()
+                    if bTerminate is True:
+                        break
+                    # endif
+                # endif
+
+                xOutput = xProc.GetOutput()
+                if xOutput is None:
                     break
                 # endif
+
+                fLastOutputTime_s = time.monotonic()
+                HandleOutput(xOutput)
+
+            # endwhile read output from queue
+
+            if bTerminate is True:
+                break
             # endif
 
-            try:
-                sLine = qLines.get_nowait()
-            except queue.Empty:
+            fNow_s = time.monotonic()
+            if fTimeout_s is not None and fNow_s - fStartTime_s >= fTimeout_s:
+                bTerminate = True
+                fTimeoutFired_s = fTimeout_s
+                sTerminateReason = f"Process exceeded timeout of {fTimeout_s}s"
                 break
-            # endtry
+            # endif
 
-            if xProcHandler.bStdOutAvailable:
-                xProcHandler.StdOut(sLine)
-            else:
-                lLines.append(sLine)
-                if bDoPrint:
-                    print(sPrintPrefix + sLine, end="", flush=True)
-                # endif
+            if fInactivityTimeout_s is not None and fNow_s - fLastOutputTime_s >= fInactivityTimeout_s:
+                bTerminate = True
+                fTimeoutFired_s = fInactivityTimeout_s
+                sTerminateReason = f"Process produced no output for {fInactivityTimeout_s}s"
+                break
             # endif
 
-        # endwhile read lines from queue
+            if xProc.Wait(0.01) is not None:
+                # print(f">> PROCESS ENDED: {lCmd}")
+                break
+            # endif
 
-        if bTerminate is True:
-            break
-        # endif
+            # See whether output stream has ended
+            if xProc.WaitOutputEnded(0.1) is True:
+                # print(f">> Read Thread Ended: {lCmd}")
+                break
+            # endif
+        # endwhile waiting for process output
 
-        try:
-            procChild.wait(timeout=0.01)
-            # print(f">> PROCESS ENDED: {lCmd}")
-            break
-        except subprocess.TimeoutExpired:
-            pass
-        # endtry
-
-        # See whether read thread has ended
-        threadRead.join(0.1)
-        if threadRead.is_alive() is False:
-            # print(f">> Read Thread Ended: {lCmd}")
-            break
-        # endif
-    # endwhile waiting for process output
+    except BaseException:
+        # Do not leave orphaned processes behind, e.g. on KeyboardInterrupt
+        xProc.Terminate(_fGraceTime_s=fTerminateGrace_s)
+        raise
+    # endtry
 
-    # Read remaining lines
+    if bTerminate is True:
+        xProc.Terminate(_fGraceTime_s=fTerminateGrace_s)
+        # Give the read thread the chance to collect the last output of the terminated process
+        xProc.WaitOutputEnded(fTerminateGrace_s)
+    else:
+        # The process may have ended before the read thread has passed on all of its output.
+        # The pipe is closed as soon as the process ended, unless it is still held
+        # by a detached child process, hence the bounded wait.
+        xProc.WaitOutputEnded(1.0)
+    # endif
+
+    # Read remaining output
     while True:
-        try:
-            sLine = qLines.get_nowait()
-        except queue.Empty:
+        xOutput = xProc.GetOutput()
+        if xOutput is None:
             break
-        # endtry
-
-        if xProcHandler.bStdOutAvailable:
-            xProcHandler.StdOut(sLine)
-        else:
-            lLines.append(sLine)
-            if bDoPrint:
-                print(sPrintPrefix + sLine, end="", flush=True)
-            # endif
         # endif
 
-    # endwhile read lines from queue
+        HandleOutput(xOutput)
 
-    if bTerminate is True:
-        procChild.terminate()
+    # endwhile read output from queue
+
+    if xLineSplitter is not None:
+        for sLine in xLineSplitter.Push(b"", _bFinal=True):
+            HandleLine(sLine)
+        # endfor
     # endif
 
-    # procChild.stdout.close()
-    iReturnCode = procChild.wait()
+    iReturnCode = xProc.Wait()
+    # A process that was terminated due to a timeout has failed, even if it ended with return code 0
+    bOK: bool = iReturnCode == 0 and sTerminateReason is None
 
     # if threadRead.is_alive() is True:
     #     print(f">>! Read Thread still alive: {lCmd}")
     # # endif
 
-    if iReturnCode != 0:
+    if not bOK:
         if bDoRaiseOnError:
             if xProcHandler.bEndedAvailable:
-                xProcHandler.Ended(iReturnCode, "")
+                xProcHandler.Ended(iReturnCode, "" if sTerminateReason is None else sTerminateReason)
+            # endif
+            if sTerminateReason is not None:
+                raise subprocess.TimeoutExpired(lCmd, fTimeoutFired_s)
             # endif
             raise subprocess.CalledProcessError(iReturnCode, lCmd)
 
         elif (not bDoPrint and bDoPrintOnError is True) or xProcHandler.bEndedAvailable:
             sMsg = sPrintPrefix + "ERROR:\n"
+            if sTerminateReason is not None:
+                sMsg += sPrintPrefix + sTerminateReason + "\n"
+            # endif
             for sLine in lLines:
                 sMsg += sPrintPrefix + "! " + sLine
             # endfor
@@ -414,9 +577,9 @@ def _ExecProc(
     # endif
 
     if bReturnStdOut is True:
-        return iReturnCode == 0, lLines
+        return bOK, lLines
     else:
-        return iReturnCode == 0
+        return bOK
     # endif
 
 
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+###
+# <LICENSE id="Apache-2.0">
+#
+#   Image-Render Base Functions module
+#   Copyright 2026 Robert Bosch GmbH and its subsidiaries
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# </LICENSE>
+###
+
+# Benchmark of the JSON backends available to 'anybase.json_codec'.
+# Usage: python bench_json_codec.py [json file] [--repeat N]
+# Without a file, a synthetic annotation-like data set is used.
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+from anybase import json_codec
+
+
+def CreateTestData(_iFrameCnt: int = 2000) -> dict:
+    xRnd = random.Random(1)
+    return {
+        "sDTI": "/anybase/bench:1.0",
+        "lFrames": [
+            {
+                "iFrame": iFrame,
+                "sName": f"frame_{iFrame:05d}",
+                "lPose": [xRnd.random() for _ in range(16)],
+                "lObjects": [
+                    {"sLabel": f"obj{i}", "lBox": [xRnd.randint(0, 1920) for _ in range(4)], "fScore": xRnd.random()}
+                    for i in range(10)
+                ],
+            }
+            for iFrame in range(_iFrameCnt)
+        ],
+    }
+
+
+# enddef
+
+
+def Measure(_funcX, _iRepeat: int) -> float:
+    fBest = None
+    for _ in range(_iRepeat):
+        fStart = time.perf_counter()
+        _funcX()
+        fTime = time.perf_counter() - fStart
+        fBest = fTime if fBest is None else min(fBest, fTime)
+    # endfor
+    return fBest
+
+
+# enddef
+
+
+def Main():
+    xParser = argparse.ArgumentParser()
+    xParser.add_argument("sFile", nargs="?", default=None)
+    xParser.add_argument("--repeat", dest="iRepeat", type=int, default=5)
+    xArgs = xParser.parse_args()
+
+    if xArgs.sFile is not None:
+        bytData = Path(xArgs.sFile).read_bytes()
+        xData = json_codec.Decode(bytData, sSuffix=Path(xArgs.sFile).suffix)
+    else:
+        xData = CreateTestData()
+        bytData = json_codec.Encode(xData, sBackend="json")
+    # endif
+
+    print(f"Data size: {len(bytData) / 1e6:.2f} MB, backends: {json_codec.GetBackends()}")
+    print(f"{'backend':<10} {'decode [ms]':>12} {'encode [ms]':>12} {'encode indent 4 [ms]':>22}")
+
+    for sBackend in json_codec.GetBackends():
+        fDecode = Measure(lambda: json_codec.Decode(bytData, sBackend=sBackend), xArgs.iRepeat)
+
+        lEncode = []
+        for iIndent in (-1, 4):
+            try:
+                fEncode = Measure(lambda: json_codec.Encode(xData, iIndent=iIndent, sBackend=sBackend), xArgs.iRepeat)
+                lEncode.append(f"{fEncode * 1e3:.1f}")
+            except RuntimeError:
+                lEncode.append("n/a")
+            # endtry
+        # endfor
+
+        print(f"{sBackend:<10} {fDecode * 1e3:>12.1f} {lEncode[0]:>12} {lEncode[1]:>22}")
+    # endfor
+
+
+# enddef
+
+if __name__ == "__main__":
+    sys.exit(Main())
+# endif
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from anybase import compress, file, path
+from anybase.cls_any_error import CAnyError_Message
+
+dicData = {"lValues": list(range(200)), "sText": "äöü " * 50}
+
+
+#################################################################################################################
+def test_SuffixHelpers():
+    assert compress.GetCompression(Path("a/data.json.GZ")) == ".gz"
+    assert compress.GetCompression(Path("a/data.json")) is None
+    assert compress.GetDataPath(Path("a/data.json.xz")) == Path("a/data.json")
+    assert compress.GetDataPath(Path("a/data.json")) == Path("a/data.json")
+
+    lSuffixes = compress.ExtendSuffixes([".json", ".ison"])
+    assert lSuffixes[0:2] == [".json", ".ison"]
+    assert ".json.gz" in lSuffixes and ".ison.bz2" in lSuffixes and ".json.xz" in lSuffixes
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("sCompress", compress.GetSuffixes())
+def test_JsonRoundTrip(tmp_path, sCompress: str):
+    pathFile = tmp_path / f"data.json{sCompress}"
+    file.SaveJson(pathFile, dicData)
+    assert pathFile.read_bytes()[0:1] != b"{"
+    assert file.LoadJson(pathFile) == dicData
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("sCompress", compress.GetSuffixes())
+def test_TextAndPickleRoundTrip(tmp_path, sCompress: str):
+    pathText = tmp_path / f"data.txt{sCompress}"
+    file.SaveText(pathText, dicData["sText"], bAtomic=True)
+    assert file.LoadText(pathText) == dicData["sText"]
+
+    pathPickle = tmp_path / f"data.pickle{sCompress}"
+    file.SavePickle(pathPickle, dicData, iCompressLevel=1)
+    assert file.LoadPickle(pathPickle) == dicData
+
+
+# enddef
+
+
+#################################################################################################################
+def test_Json5Compressed(tmp_path):
+    pathFile = tmp_path / "data.json5.gz"
+    pathFile.write_bytes(gzip.compress(b"{a: 1, // comment\n}"))
+    assert file.LoadJson(pathFile) == {"a": 1}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ProvideCompressedFile(tmp_path):
+    file.SaveJson(tmp_path / "data.json.gz", dicData)
+    pathFound = path.ProvideReadFilepathExt(
+        tmp_path / "data", compress.ExtendSuffixes([".json", ".json5"]), bDoRaise=True
+    )
+    assert pathFound.name == "data.json.gz"
+
+    # The uncompressed file is preferred
+    file.SaveJson(tmp_path / "data.json", dicData)
+    pathFound = path.ProvideReadFilepathExt(
+        tmp_path / "data", compress.ExtendSuffixes([".json", ".json5"]), bDoRaise=True
+    )
+    assert pathFound.name == "data.json"
+
+
+# enddef
+
+
+#################################################################################################################
+def test_UnavailableFormat(tmp_path):
+    if ".zst" in compress.GetSuffixes():
+        pytest.skip("zstandard is installed")
+    # endif
+    with pytest.raises(CAnyError_Message):
+        file.SaveJson(tmp_path / "data.json.zst", dicData)
+    # endwith
+
+
+# enddef
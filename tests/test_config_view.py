@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import copy
+import json
+
+from anybase import json_codec
+from anybase.cls_config_view import CConfigView, CConfigListView
+from anybase.cls_frozen_config import Freeze
+
+
+#################################################################################################################
+def _GetBase() -> dict:
+    return {"a": {"b": {"c": 1}, "l": [1, {"d": 2}]}, "e": {"f": 3}, "s": "x"}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ChangesDoNotModifyBase():
+    dicBase = _GetBase()
+    dicView = CConfigView(dicBase)
+    dicView["a"]["b"]["c"] = 10
+    dicView["a"]["l"][1]["d"] = 20
+    dicView["a"]["l"].append(30)
+    dicView["s"] = "y"
+    dicView.setdefault("n", {})["x"] = 1
+
+    assert dicBase == _GetBase()
+    assert dicView.ToDict() == {
+        "a": {"b": {"c": 10}, "l": [1, {"d": 20}, 30]},
+        "e": {"f": 3},
+        "s": "y",
+        "n": {"x": 1},
+    }
+
+
+# enddef
+
+
+#################################################################################################################
+def test_UntouchedBranchesAreShared():
+    dicBase = _GetBase()
+    dicView = CConfigView(dicBase)
+    dicView["a"]["b"]["c"] = 10
+    dicData = dicView.ToDict()
+    assert dicData["e"] is dicBase["e"]
+    assert dicData["a"]["l"] is dicBase["a"]["l"]
+    assert dicData["a"]["b"] is not dicBase["a"]["b"]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_MappingMethods():
+    dicBase = _GetBase()
+    dicView = CConfigView(dicBase)
+    for xValue in dicView.values():
+        if isinstance(xValue, dict):
+            xValue["new"] = 1
+        # endif
+    # endfor
+    for sKey, xValue in dicView.items():
+        if isinstance(xValue, dict):
+            xValue.pop("new")
+            xValue["other"] = 2
+        # endif
+    # endfor
+    dicView.get("e")["f"] = 4
+    assert dicView.get("missing", 5) == 5
+    dicView.pop("a")["b"]["c"] = 7
+    dicView.update({"u": 1}, v=2)
+    dicView |= {"w": 3}
+
+    assert dicBase == _GetBase()
+    assert dicView.ToDict() == {"e": {"f": 4, "other": 2}, "s": "x", "u": 1, "v": 2, "w": 3}
+
+    sKey, xValue = dicView.popitem()
+    assert (sKey, xValue) == ("w", 3)
+    dicView.clear()
+    assert dicView.ToDict() == {} and dicBase == _GetBase()
+
+
+# enddef
+
+
+#################################################################################################################
+def test_CopiesAreIndependent():
+    dicBase = _GetBase()
+    dicView = CConfigView(dicBase)
+    dicView["a"]["b"]["c"] = 10
+    for dicCopy in (dicView.copy(), copy.copy(dicView)):
+        dicCopy["a"]["b"]["c"] = 20
+        dicCopy["a"]["l"].append(3)
+    # endfor
+    assert dicView["a"]["b"]["c"] == 10 and dicView["a"]["l"] == [1, {"d": 2}]
+
+    lView = CConfigListView(dicBase["a"]["l"])
+    lCopy = lView.copy()
+    lCopy[1]["d"] = 5
+    assert lView.ToList() == [1, {"d": 2}] and lCopy.ToList() == [1, {"d": 5}]
+    assert dicBase == _GetBase()
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ViewOfFrozenData():
+    dicFrozen = Freeze(_GetBase())
+    dicView = CConfigView(dicFrozen)
+    dicView["a"]["l"][1]["d"] = 20
+    assert dicFrozen == _GetBase()
+    assert dicView.ToDict()["a"]["l"] == [1, {"d": 20}]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_Serialize():
+    dicView = CConfigView(_GetBase())
+    dicView["a"]["b"]["c"] = 10
+    dicExpect = dicView.ToDict()
+    assert json.loads(json.dumps(dicView)) == dicExpect
+    for sBackend in json_codec.GetBackends():
+        assert json_codec.Decode(json_codec.Encode(dicView, sBackend=sBackend)) == dicExpect
+    # endfor
+
+
+# enddef
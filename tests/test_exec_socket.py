@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+import socket
+import threading
+
+import pytest
+
+from anybase.cls_any_error import CAnyError_Message
+from anybase.cls_exec_agent import CExecAgent
+from anybase.cls_exec_backend_socket import CExecBackendSocket
+from anybase import exec_socket
+
+sSecret = "test-secret"
+
+
+#################################################################################################################
+@pytest.fixture
+def xAgent():
+    xAgent = CExecAgent(0, _xSecret=sSecret)
+    xAgent.Start()
+    yield xAgent
+    xAgent.Stop()
+
+
+# enddef
+
+
+#################################################################################################################
+def test_FrameRoundTrip():
+    xA, xB = socket.socketpair()
+    with xA, xB:
+        exec_socket.SendFrame(xA, {"sOp": "output", "iJobId": 3}, b"\x00\x01payload")
+        exec_socket.SendFrame(xA, {"sOp": "exit"})
+        assert exec_socket.RecvFrame(xB) == ({"sOp": "output", "iJobId": 3}, b"\x00\x01payload")
+        assert exec_socket.RecvFrame(xB) == ({"sOp": "exit"}, b"")
+        xA.close()
+        assert exec_socket.RecvFrame(xB) is None
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+def test_FrameMaxSize():
+    xA, xB = socket.socketpair()
+    with xA, xB:
+        exec_socket.SendFrame(xA, {"sOp": "x"}, b"0" * 100)
+        with pytest.raises(CAnyError_Message):
+            exec_socket.RecvFrame(xB, _iMaxSize=50)
+        # endwith
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("sClientSecret, bValid", [(sSecret, True), ("other", False)])
+def test_Handshake(sClientSecret: str, bValid: bool):
+    xA, xB = socket.socketpair()
+    lResult = []
+    with xA, xB:
+        threadAgent = threading.Thread(
+            target=lambda: lResult.append(exec_socket.AuthenticateClient(xA, sSecret.encode("utf-8")))
+        )
+        threadAgent.start()
+        if bValid:
+            exec_socket.AuthenticateAgent(xB, sClientSecret.encode("utf-8"))
+        else:
+            xB.settimeout(5.0)
+            with pytest.raises(CAnyError_Message):
+                exec_socket.AuthenticateAgent(xB, sClientSecret.encode("utf-8"))
+            # endwith
+            xB.close()
+        # endif
+        threadAgent.join(5.0)
+    # endwith
+    assert lResult == [bValid]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_RunJob(xAgent: CExecAgent):
+    xBackend = CExecBackendSocket(xAgent.xAddress, _xSecret=sSecret)
+    try:
+        xProc = xBackend.Start(xCmd="echo hello; exit 3", sCwd=None, xEnv=None, bShell=True)
+        assert xProc.Wait(10.0) == 3
+        assert xProc.GetOutput(_fTimeout_s=1.0).strip() == "hello"
+        assert xBackend.sHost.startswith("socket:")
+    finally:
+        xBackend.Close()
+    # endtry
+
+
+# enddef
+
+
+#################################################################################################################
+def test_TerminateJob(xAgent: CExecAgent):
+    xBackend = CExecBackendSocket(xAgent.xAddress, _xSecret=sSecret)
+    try:
+        xProc = xBackend.Start(xCmd="sleep 60", sCwd=None, xEnv=None, bShell=True)
+        assert xProc.Wait(0.2) is None
+        xProc.Terminate(_fGraceTime_s=1.0)
+        assert xProc.Wait(5.0) is not None
+    finally:
+        xBackend.Close()
+    # endtry
+
+
+# enddef
+
+
+#################################################################################################################
+def test_RejectWrongSecret(xAgent: CExecAgent):
+    xBackend = CExecBackendSocket(xAgent.xAddress, _xSecret="wrong", _fTimeout_s=5.0)
+    with pytest.raises(CAnyError_Message):
+        xBackend.Connect()
+    # endwith
+    assert xBackend.bIsConnected is False
+
+
+# enddef
+
+
+#################################################################################################################
+def test_EmptySecret():
+    with pytest.raises(CAnyError_Message):
+        CExecAgent(0, _xSecret="")
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets not available")
+def test_UnixSocket(tmp_path):
+    sPath = (tmp_path / "agent.sock").as_posix()
+    xAgent = CExecAgent(sPath, _xSecret=sSecret)
+    xAgent.Start()
+    try:
+        assert os.stat(sPath).st_mode & 0o777 == 0o600
+        xBackend = CExecBackendSocket(sPath, _xSecret=sSecret)
+        xProc = xBackend.Start(xCmd=["true"], sCwd=None, xEnv=None, bShell=False)
+        assert xProc.Wait(10.0) == 0
+        xBackend.Close()
+    finally:
+        xAgent.Stop()
+    # endtry
+    assert not os.path.exists(sPath)
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets not available")
+def test_KeepNonSocketFile(tmp_path):
+    pathFile = tmp_path / "agent.sock"
+    pathFile.write_text("data")
+    with pytest.raises(CAnyError_Message):
+        CExecAgent(pathFile.as_posix(), _xSecret=sSecret).Start()
+    # endwith
+    assert pathFile.read_text() == "data"
+
+
+# enddef
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from anybase import json_codec
+from anybase.cls_frozen_config import CFrozenDict, CFrozenList, Freeze, IsFrozen, Thaw
+
+dicData = {"a": {"b": [1, {"c": 2}], "s": "x"}, "l": [[1, 2], [3]], "n": None}
+
+
+#################################################################################################################
+def test_FreezeAndThaw():
+    dicFrozen = Freeze(dicData)
+    assert IsFrozen(dicFrozen) and IsFrozen(dicFrozen["a"]) and IsFrozen(dicFrozen["a"]["b"][1])
+    assert isinstance(dicFrozen, dict) and isinstance(dicFrozen["l"], list)
+    assert dicFrozen == dicData
+    assert Freeze(dicFrozen) is dicFrozen
+    assert Freeze((1, 2)) == CFrozenList([1, 2])
+
+    dicThawed = Thaw(dicFrozen)
+    assert dicThawed == dicData
+    assert not IsFrozen(dicThawed) and not IsFrozen(dicThawed["a"]["b"])
+    dicThawed["a"]["b"].append(3)
+
+
+# enddef
+
+
+#################################################################################################################
+def test_Immutable():
+    dicFrozen = Freeze(dicData)
+    for funcModify in [
+        lambda: dicFrozen.__setitem__("a", 1),
+        lambda: dicFrozen.__delitem__("a"),
+        lambda: dicFrozen.update({"a": 1}),
+        lambda: dicFrozen.pop("a"),
+        lambda: dicFrozen.setdefault("x", 1),
+        lambda: dicFrozen.clear(),
+        lambda: dicFrozen["l"].append(1),
+        lambda: dicFrozen["l"].__setitem__(0, 1),
+        lambda: dicFrozen["l"].sort(),
+    ]:
+        with pytest.raises(TypeError):
+            funcModify()
+        # endwith
+    # endfor
+
+    xValue = dicFrozen
+    with pytest.raises(TypeError):
+        xValue |= {"x": 1}
+    # endwith
+    assert dicFrozen == dicData
+
+
+# enddef
+
+
+#################################################################################################################
+def test_HashAndCopy():
+    dicFrozen = Freeze(dicData)
+    assert hash(dicFrozen) == hash(Freeze(copy.deepcopy(dicData)))
+    assert {dicFrozen: 1}[Freeze(dicData)] == 1
+    assert copy.copy(dicFrozen) is dicFrozen
+    assert copy.deepcopy(dicFrozen) is dicFrozen
+    assert dicFrozen.copy() is dicFrozen
+
+
+# enddef
+
+
+#################################################################################################################
+def test_Serialize():
+    dicFrozen = Freeze(dicData)
+    dicLoaded = pickle.loads(pickle.dumps(dicFrozen))
+    assert isinstance(dicLoaded, CFrozenDict) and isinstance(dicLoaded["a"]["b"], CFrozenList)
+    assert dicLoaded == dicData
+
+    assert json.loads(json.dumps(dicFrozen)) == dicData
+    for sBackend in json_codec.GetBackends():
+        assert json_codec.Decode(json_codec.Encode(dicFrozen, sBackend=sBackend)) == dicData
+    # endfor
+
+
+# enddef
+
+
+#################################################################################################################
+def test_DictUpdates():
+    dicFrozen = Freeze(dicData)
+    dicSet = dicFrozen.Set("n", {"x": [1]})
+    assert IsFrozen(dicSet["n"]["x"])
+    assert dicSet["a"] is dicFrozen["a"]
+    assert dicFrozen["n"] is None
+
+    dicRemoved = dicFrozen.Remove("n")
+    assert "n" not in dicRemoved and "n" in dicFrozen
+    with pytest.raises(KeyError):
+        dicFrozen.Remove("missing")
+    # endwith
+
+    dicMerged = dicFrozen.Merge({"n": 1, "m": [2]})
+    assert dicMerged["n"] == 1 and IsFrozen(dicMerged["m"])
+    assert dicMerged["l"] is dicFrozen["l"]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_PathAccess():
+    dicFrozen = Freeze(dicData)
+    assert dicFrozen.GetAtPath("a/b/1/c") == 2
+    assert dicFrozen.GetAtPath(("l", "0", "1")) == 2
+    assert dicFrozen.GetAtPath("a/b/5", xDefault=-1) == -1
+    assert dicFrozen.GetAtPath("a/s/x", xDefault=-1) == -1
+    assert dicFrozen.GetAtPath("n", xDefault=-1) == -1
+
+    dicSet = dicFrozen.SetAtPath("a/b/1/c", 3)
+    assert dicSet.GetAtPath("a/b/1/c") == 3
+    assert dicFrozen.GetAtPath("a/b/1/c") == 2
+    # Only the containers along the path are copied
+    assert dicSet["l"] is dicFrozen["l"]
+    assert dicSet["a"]["b"][0] == 1 and dicSet["a"]["s"] is dicFrozen["a"]["s"]
+
+    # Missing dictionaries are created
+    dicSet = dicFrozen.SetAtPath("x/y/z", [1])
+    assert dicSet["x"] == {"y": {"z": [1]}} and IsFrozen(dicSet["x"]["y"]["z"])
+
+    with pytest.raises(IndexError):
+        dicFrozen.SetAtPath("l/5", 1)
+    # endwith
+    with pytest.raises(KeyError):
+        dicFrozen.SetAtPath("l/x", 1)
+    # endwith
+    with pytest.raises(TypeError):
+        dicFrozen.SetAtPath("a/s/x", 1)
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ListUpdates():
+    lFrozen = CFrozenList([1, [2], {"a": 3}])
+    assert lFrozen.Set(0, [4]) == [[4], [2], {"a": 3}] and IsFrozen(lFrozen.Set(0, [4])[0])
+    assert lFrozen.Append(5)[-1] == 5
+    assert lFrozen.Remove(1) == [1, {"a": 3}]
+    assert lFrozen == [1, [2], {"a": 3}]
+    assert hash(lFrozen) == hash(CFrozenList([1, [2], {"a": 3}]))
+
+
+# enddef
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+
+import pytest
+
+from anybase.cls_import_graph import CImportGraph
+
+
+#################################################################################################################
+@pytest.fixture
+def dicFiles(tmp_path) -> dict[str, str]:
+    # Three files, where 'a' imports 'b', and 'b' imports 'c'
+    dicFiles = {}
+    for sName in ("a", "b", "c"):
+        pathFile = tmp_path / f"{sName}.json"
+        pathFile.write_text(f'{{"s": "{sName}"}}')
+        dicFiles[sName] = pathFile.as_posix()
+    # endfor
+    return dicFiles
+
+
+# enddef
+
+
+#################################################################################################################
+def _CreateGraph(_dicFiles: dict[str, str]) -> CImportGraph:
+    xGraph = CImportGraph()
+    for sName, sFilePath in _dicFiles.items():
+        xGraph.SetResult(sFilePath, "key", sName, tFileState=CImportGraph.GetFileState(sFilePath))
+    # endfor
+    xGraph.AddImport(_dicFiles["a"], _dicFiles["b"])
+    xGraph.AddImport(_dicFiles["b"], _dicFiles["c"])
+    return xGraph
+
+
+# enddef
+
+
+#################################################################################################################
+def _Touch(_sFilePath: str, _sText: str):
+    xStat = os.stat(_sFilePath)
+    with open(_sFilePath, "w") as xFile:
+        xFile.write(_sText)
+    # endwith
+    iMTime_ns = xStat.st_mtime_ns + 10**9
+    os.utime(_sFilePath, ns=(iMTime_ns, iMTime_ns))
+
+
+# enddef
+
+
+#################################################################################################################
+def test_GetResult(dicFiles: dict):
+    xGraph = _CreateGraph(dicFiles)
+    assert xGraph.GetResult(dicFiles["a"], "key") == "a"
+    assert xGraph.GetResult(dicFiles["a"], "other") is None
+    assert xGraph.GetResult("missing.json", "key") is None
+    assert xGraph.GetChanged() == []
+
+
+# enddef
+
+
+#################################################################################################################
+def test_IndirectImportChanged(dicFiles: dict):
+    xGraph = _CreateGraph(dicFiles)
+    _Touch(dicFiles["c"], '{"s": "C"}')
+
+    assert xGraph.GetChanged() == [dicFiles["c"]]
+    assert xGraph.GetResult(dicFiles["a"], "key") is None
+    assert xGraph.GetResult(dicFiles["b"], "key") is None
+    assert xGraph.GetResult(dicFiles["c"], "key") is None
+    assert xGraph.GetGraph()[dicFiles["a"]]["bCached"] is False
+
+
+# enddef
+
+
+#################################################################################################################
+def test_OnlyModificationTimeChanged(dicFiles: dict):
+    xGraph = _CreateGraph(dicFiles)
+    # Same contents: the hash is still valid
+    _Touch(dicFiles["c"], '{"s": "c"}')
+    assert xGraph.GetChanged() == []
+    assert xGraph.GetResult(dicFiles["a"], "key") == "a"
+
+
+# enddef
+
+
+#################################################################################################################
+def test_FileChangedWhileLoading(dicFiles: dict):
+    xGraph = CImportGraph()
+    tFileState = CImportGraph.GetFileState(dicFiles["a"])
+    _Touch(dicFiles["a"], '{"s": "changed"}')
+    xGraph.SetResult(dicFiles["a"], "key", "a", tFileState=tFileState)
+    assert xGraph.GetResult(dicFiles["a"], "key") is None
+
+    xGraph.SetResult(dicFiles["a"], "key", "a", tFileState=None)
+    assert xGraph.GetResult(dicFiles["a"], "key") is None
+
+
+# enddef
+
+
+#################################################################################################################
+def test_GetAffected(dicFiles: dict):
+    xGraph = _CreateGraph(dicFiles)
+    assert xGraph.GetAffected(dicFiles["c"]) == set(dicFiles.values())
+    assert xGraph.GetAffected(dicFiles["a"]) == {dicFiles["a"]}
+
+    # Removed imports are no longer considered
+    xGraph.ResetImports(dicFiles["b"])
+    assert xGraph.GetAffected(dicFiles["c"]) == {dicFiles["c"]}
+    _Touch(dicFiles["c"], '{"s": "C"}')
+    assert xGraph.GetResult(dicFiles["a"], "key") == "a"
+
+
+# enddef
+
+
+#################################################################################################################
+def test_InvalidateAndClear(dicFiles: dict):
+    xGraph = _CreateGraph(dicFiles)
+    xGraph.Invalidate(dicFiles["b"])
+    assert xGraph.GetResult(dicFiles["b"], "key") is None
+    # An import without stored state counts as changed
+    assert xGraph.GetResult(dicFiles["a"], "key") is None
+    assert xGraph.GetResult(dicFiles["c"], "key") == "c"
+
+    xGraph.Clear()
+    assert xGraph.GetGraph() == {}
+
+
+# enddef
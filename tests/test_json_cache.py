@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+import json
+import struct
+import pickle
+
+import numpy as np
+import pytest
+
+from anybase import file
+
+dicData = {
+    "lInt": list(range(20)),
+    "lFloat": [i * 0.25 for i in range(20)],
+    "lMixed": [1, 2.5] * 10,
+    "lShort": [1, 2, 3],
+    "lBigInt": [2**70] * 20,
+    "lStr": ["a"] * 20,
+    "dicSub": {"lInt": list(range(100, 130)), "bFlag": True, "xNone": None},
+}
+
+
+#################################################################################################################
+@pytest.fixture
+def lLoads(monkeypatch) -> list:
+    # Record the calls of LoadJson, i.e. the cache misses
+    lLoads = []
+    funcLoadJson = file.LoadJson
+
+    def LoadJson(_xFilePath, **kwargs):
+        lLoads.append(_xFilePath)
+        return funcLoadJson(_xFilePath, **kwargs)
+
+    # enddef
+
+    monkeypatch.setattr(file, "LoadJson", LoadJson)
+    return lLoads
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.fixture
+def pathData(tmp_path):
+    pathFile = tmp_path / "data.json"
+    pathFile.write_text(json.dumps(dicData))
+    return pathFile
+
+
+# enddef
+
+
+#################################################################################################################
+def _WriteData(_pathFile, _xData, _iMTime_ns: int):
+    _pathFile.write_text(json.dumps(_xData))
+    os.utime(_pathFile, ns=(_iMTime_ns, _iMTime_ns))
+
+
+# enddef
+
+
+#################################################################################################################
+def test_CacheHit(pathData, lLoads: list):
+    assert file.LoadJsonCached(pathData) == dicData
+    assert file.GetJsonCachePath(pathData).exists()
+    assert file.LoadJsonCached(pathData) == dicData
+    assert len(lLoads) == 1
+
+
+# enddef
+
+
+#################################################################################################################
+def test_CacheDir(pathData, tmp_path, lLoads: list):
+    pathCacheDir = tmp_path / "cache"
+    assert file.LoadJsonCached(pathData, xCacheDir=pathCacheDir) == dicData
+    assert file.LoadJsonCached(pathData, xCacheDir=pathCacheDir) == dicData
+    assert len(lLoads) == 1
+    assert file.GetJsonCachePath(pathData, xCacheDir=pathCacheDir).parent == pathCacheDir
+    assert not file.GetJsonCachePath(pathData).exists()
+
+
+# enddef
+
+
+#################################################################################################################
+def test_CacheInvalidation(pathData, lLoads: list):
+    iMTime_ns = pathData.stat().st_mtime_ns
+    assert file.LoadJsonCached(pathData) == dicData
+
+    # Changed size
+    _WriteData(pathData, {"a": 1}, iMTime_ns)
+    assert file.LoadJsonCached(pathData) == {"a": 1}
+    assert len(lLoads) == 2
+
+    # Same size, changed content and modification time
+    _WriteData(pathData, {"a": 2}, iMTime_ns + 10**9)
+    assert file.LoadJsonCached(pathData) == {"a": 2}
+    assert len(lLoads) == 3
+
+    # Only modification time changed: the content hash is still valid
+    os.utime(pathData, ns=(iMTime_ns + 2 * 10**9, iMTime_ns + 2 * 10**9))
+    assert file.LoadJsonCached(pathData) == {"a": 2}
+    assert len(lLoads) == 3
+
+
+# enddef
+
+
+#################################################################################################################
+def test_CacheOptionsAreKeyed(pathData, lLoads: list):
+    file.LoadJsonCached(pathData)
+    file.LoadJsonCached(pathData, bNumpyArrays=True)
+    file.LoadJsonCached(pathData, bNumpyArrays=True, iMinArraySize=4)
+    assert len(lLoads) == 3
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("bCached", [False, True], ids=["miss", "hit"])
+def test_NumpyArrays(pathData, bCached: bool):
+    if bCached:
+        file.LoadJsonCached(pathData, bNumpyArrays=True)
+    # endif
+    dicResult = file.LoadJsonCached(pathData, bNumpyArrays=True)
+
+    assert isinstance(dicResult["lInt"], np.ndarray) and dicResult["lInt"].dtype.kind == "i"
+    assert isinstance(dicResult["lFloat"], np.ndarray) and dicResult["lFloat"].dtype.kind == "f"
+    assert isinstance(dicResult["lMixed"], np.ndarray) and dicResult["lMixed"].dtype.kind == "f"
+    assert isinstance(dicResult["dicSub"]["lInt"], np.ndarray)
+    assert dicResult["lShort"] == [1, 2, 3]
+    assert dicResult["lBigInt"] == dicData["lBigInt"]
+    assert dicResult["lStr"] == dicData["lStr"]
+    for sKey in ("lInt", "lFloat", "lMixed"):
+        assert dicResult[sKey].tolist() == dicData[sKey]
+    # endfor
+    assert dicResult["dicSub"]["lInt"].tolist() == dicData["dicSub"]["lInt"]
+
+
+# enddef
+
+
+#################################################################################################################
+class CEvil:
+    def __reduce__(self):
+        return (os.getpid, ())
+
+
+# endclass
+
+
+#################################################################################################################
+def test_RejectCacheWithGlobals(pathData, lLoads: list):
+    file.LoadJsonCached(pathData)
+    pathCache = file.GetJsonCachePath(pathData)
+
+    # Replace the pickle stream of a valid cache file by one that calls a function
+    with open(pathCache, "rb") as xFile:
+        bytCache = xFile.read()
+    # endwith
+    iMagicSize = len(file.g_bytJsonCacheMagic)
+    iHeaderSize = struct.unpack_from("<Q", bytCache, iMagicSize)[0]
+    dicHeader = json.loads(bytCache[iMagicSize + 8 : iMagicSize + 8 + iHeaderSize])
+    bytPickle = pickle.dumps({"x": CEvil()}, protocol=5)
+    dicHeader["iPickleSize"] = len(bytPickle)
+    dicHeader["dicColumns"] = {}
+    bytHeader = json.dumps(dicHeader).encode("utf-8")
+    with open(pathCache, "wb") as xFile:
+        xFile.write(file.g_bytJsonCacheMagic + struct.pack("<Q", len(bytHeader)) + bytHeader + bytPickle)
+    # endwith
+
+    assert file.LoadJsonCached(pathData) == dicData
+    assert len(lLoads) == 2
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.skipif(not hasattr(os, "geteuid"), reason="Ownership check only on POSIX")
+def test_IgnoreWritableCache(pathData, lLoads: list):
+    file.LoadJsonCached(pathData)
+    pathCache = file.GetJsonCachePath(pathData)
+    assert pathCache.stat().st_mode & 0o022 == 0
+
+    os.chmod(pathCache, 0o666)
+    assert file.LoadJsonCached(pathData) == dicData
+    assert len(lLoads) == 2
+    # The cache file is rewritten without write permission for others
+    assert pathCache.stat().st_mode & 0o022 == 0
+
+
+# enddef
+
+
+#################################################################################################################
+def test_CorruptCache(pathData, lLoads: list):
+    file.LoadJsonCached(pathData)
+    pathCache = file.GetJsonCachePath(pathData)
+    pathCache.write_bytes(file.g_bytJsonCacheMagic + b"\xff" * 4)
+    assert file.LoadJsonCached(pathData) == dicData
+    pathCache.write_bytes(b"")
+    assert file.LoadJsonCached(pathData) == dicData
+    assert len(lLoads) == 3
+
+
+# enddef
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import math
+
+import pytest
+
+from anybase import json_codec
+
+
+#################################################################################################################
+@pytest.fixture
+def lCalls(monkeypatch):
+    # Record the calls of the decoders, keeping their order of preference
+    lCalls = []
+    dicDecoder = {}
+    for sName, funcDecode in json_codec.g_dicDecoder.items():
+
+        def Decode(_xData, *args, _sName=sName, _funcDecode=funcDecode):
+            lCalls.append(_sName)
+            return _funcDecode(_xData, *args)
+
+        # enddef
+        dicDecoder[sName] = Decode
+    # endfor
+    monkeypatch.setattr(json_codec, "g_dicDecoder", dicDecoder)
+    monkeypatch.setattr(json_codec, "_DecodePyJson5", dicDecoder["pyjson5"])
+    return lCalls
+
+
+# enddef
+
+
+#################################################################################################################
+def test_BackendOrder():
+    lBackends = json_codec.GetBackends()
+    assert lBackends[-2:] == ["pyjson5", "json"]
+    if "orjson" in lBackends and "msgspec" in lBackends:
+        assert lBackends.index("orjson") < lBackends.index("msgspec")
+    # endif
+
+
+# enddef
+
+
+#################################################################################################################
+def test_StrictJsonUsesFastestBackend(lCalls: list):
+    assert json_codec.Decode(b'{"a": [1, 2.5, "x"]}') == {"a": [1, 2.5, "x"]}
+    if "msgspec" in json_codec.GetBackends():
+        assert lCalls == ["msgspec"]
+    else:
+        assert lCalls == ["pyjson5"]
+    # endif
+
+
+# enddef
+
+
+#################################################################################################################
+def test_LargeIntegersAreExact():
+    lValues = [2**70, -(2**70), 2**64 - 1, 0.5]
+    bytData = b"[1180591620717411303424, -1180591620717411303424, 18446744073709551615, 0.5]"
+    assert json_codec.Decode(bytData) == lValues
+    assert json_codec.Decode(json_codec.Encode(lValues)) == lValues
+
+
+# enddef
+
+
+#################################################################################################################
+def test_Json5InJsonFileFallsBackToPyJson5(lCalls: list):
+    assert json_codec.Decode(b'{\n // comment\n a: 1, }') == {"a": 1}
+    # Only the fastest backend is tried before the JSON5 parser
+    assert lCalls[-1] == "pyjson5"
+    assert len(lCalls) <= 2
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("sSuffix", [".json5", ".ison"])
+def test_Json5SuffixUsesPyJson5(lCalls: list, sSuffix: str):
+    assert json_codec.Decode(b'{"a": 1}', sSuffix=sSuffix) == {"a": 1}
+    assert lCalls == ["pyjson5"]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_InvalidJsonRaisesPyJson5Error():
+    with pytest.raises(json_codec.pyjson5.Json5Exception):
+        json_codec.Decode(b'{"a": }')
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+def test_TrailingData():
+    assert json_codec.Decode(b'{"a": 1} trailing', bAllowTrailingData=True) == {"a": 1}
+    with pytest.raises(json_codec.pyjson5.Json5Exception):
+        json_codec.Decode(b'{"a": 1} trailing')
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+def test_DecodeStrAndMemoryView():
+    assert json_codec.Decode('{"ä": "€"}') == {"ä": "€"}
+    assert json_codec.Decode(memoryview('{"ä": "€"}'.encode("utf-8")), sBackend="pyjson5") == {"ä": "€"}
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("sBackend", json_codec.GetBackends())
+def test_EncodeDecodeRoundTrip(sBackend: str):
+    dicData = {"b": [1, 2.5, None, True], "a": {"s": "text ä"}}
+    bytData = json_codec.Encode(dicData, sBackend=sBackend)
+    assert json_codec.Decode(bytData, sBackend=sBackend) == dicData
+
+
+# enddef
+
+
+#################################################################################################################
+def test_EncodeOptions():
+    dicData = {"b": 1, "a": [1, 2]}
+    assert json_codec.Encode(dicData, bSortKeys=True).replace(b" ", b"") == b'{"a":[1,2],"b":1}'
+    assert json_codec.Decode(json_codec.Encode(dicData, iIndent=4)) == dicData
+    assert b"\n    " in json_codec.Encode(dicData, iIndent=4)
+
+
+# enddef
+
+
+#################################################################################################################
+def test_EncodeNonFiniteFloats():
+    # Fast backends write non-finite floats as null. The standard library is used instead.
+    bytData = json_codec.Encode({"a": math.inf, "b": None})
+    dicData = json_codec.Decode(bytData)
+    assert dicData["a"] == math.inf and dicData["b"] is None
+
+
+# enddef
+
+
+#################################################################################################################
+def test_EncodeUnknownBackend():
+    with pytest.raises(RuntimeError):
+        json_codec.Encode({}, sBackend="unknown")
+    # endwith
+
+
+# enddef
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import io
+import json
+
+import pytest
+
+from anybase import file
+from anybase.cls_any_error import CAnyError_Message
+from anybase.cls_json_stream_reader import CJsonStreamReader
+
+dicData = {
+    "sDTI": "/anybase/test:1.0",
+    "iCount": 3,
+    "dicMeta": {"s": "a}b]c\"d", "l": [[], {}, [1, {"x": "]"}]]},
+    "lFrames": [{"iIdx": i, "sName": f"f\\{i}ä", "lValues": [i * 0.5, None, True]} for i in range(50)],
+    "bLast": False,
+}
+
+
+#################################################################################################################
+@pytest.fixture(params=[1, 7, 1 << 16], ids=["chunk1", "chunk7", "chunk64k"])
+def iChunkSize(request) -> int:
+    return request.param
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.fixture
+def pathData(tmp_path):
+    pathFile = tmp_path / "data.json"
+    pathFile.write_text(json.dumps(dicData, indent=1, ensure_ascii=False), encoding="utf-8")
+    return pathFile
+
+
+# enddef
+
+
+#################################################################################################################
+def test_IterJsonArray(pathData, iChunkSize: int):
+    lFrames = list(file.IterJsonArray(pathData, "/lFrames", iChunkSize=iChunkSize))
+    assert lFrames == dicData["lFrames"]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_IterJsonArrayNested(pathData, iChunkSize: int):
+    assert list(file.IterJsonArray(pathData, "/dicMeta/l/2", iChunkSize=iChunkSize)) == [1, {"x": "]"}]
+    assert list(file.IterJsonArray(pathData, "/lFrames/3/lValues", iChunkSize=iChunkSize)) == [1.5, None, True]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_IterJsonArrayErrors(pathData):
+    with pytest.raises(CAnyError_Message):
+        list(file.IterJsonArray(pathData, "/dicMeta"))
+    # endwith
+    with pytest.raises(CAnyError_Message):
+        list(file.IterJsonArray(pathData, "/missing"))
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+def test_LoadJsonHeader(pathData, iChunkSize: int):
+    dicHeader = file.LoadJsonHeader(pathData, iChunkSize=iChunkSize)
+    assert dicHeader == {"sDTI": "/anybase/test:1.0", "iCount": 3, "bLast": False}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ReaderSkipAndRead(iChunkSize: int):
+    xReader = CJsonStreamReader(io.BytesIO(b' [ "a\\"]" , {"k": [1, 2]}, -1.5e3 ,null ] '), _iChunkSize=iChunkSize)
+    lValues = []
+    for iIdx in xReader.IterArrayIndices():
+        if iIdx == 1:
+            xReader.SkipValue()
+        else:
+            lValues.append(xReader.ReadValue())
+        # endif
+    # endfor
+    assert lValues == ['a"]', -1500.0, None]
+    assert xReader.Peek() is None
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ReaderEmptyContainers():
+    xReader = CJsonStreamReader(io.BytesIO(b'{"a": [], "b": {}}'))
+    dicValues = {sKey: xReader.ReadValue() for sKey in xReader.IterObjectKeys()}
+    assert dicValues == {"a": [], "b": {}}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ReaderInvalidData():
+    xReader = CJsonStreamReader(io.BytesIO(b"[1 2]"))
+    with pytest.raises(CAnyError_Message):
+        for iIdx in xReader.IterArrayIndices():
+            xReader.ReadValue()
+        # endfor
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("sName", ["data.jsonl", "data.jsonl.gz"])
+def test_JsonLinesRoundTrip(tmp_path, sName: str):
+    pathFile = tmp_path / sName
+    assert file.SaveJsonLines(pathFile, (dicFrame for dicFrame in dicData["lFrames"][0:10])) == 10
+    assert file.SaveJsonLines(pathFile, dicData["lFrames"][10:], bAppend=not sName.endswith(".gz")) == 40
+
+    lRecords = list(file.IterJsonLines(pathFile))
+    if sName.endswith(".gz"):
+        assert lRecords == dicData["lFrames"][10:]
+    else:
+        assert lRecords == dicData["lFrames"]
+    # endif
+
+
+# enddef
+
+
+#################################################################################################################
+def test_JsonLinesErrorLine(tmp_path):
+    pathFile = tmp_path / "data.jsonl"
+    pathFile.write_bytes(b'{"a": 1}\n\n{"a": \n')
+    with pytest.raises(CAnyError_Message) as xInfo:
+        list(file.IterJsonLines(pathFile))
+    # endwith
+    assert "line 3" in str(xInfo.value)
+
+
+# enddef
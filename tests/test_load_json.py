@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import pytest
+
+from anybase import file
+from anybase.cls_any_error import CAnyError_Message
+
+
+#################################################################################################################
+@pytest.fixture(params=[False, True], ids=["read", "mmap"])
+def bMmap(request, monkeypatch) -> bool:
+    if request.param is True:
+        monkeypatch.setattr(file, "g_iLoadJsonMmapMinSize", 0)
+    # endif
+    return request.param
+
+
+# enddef
+
+
+#################################################################################################################
+def test_LoadJson(tmp_path, bMmap: bool):
+    pathFile = tmp_path / "data.json"
+    pathFile.write_text('{"a": [1, 2], "s": "äö€"}', encoding="utf-8")
+    assert file.LoadJson(pathFile) == {"a": [1, 2], "s": "äö€"}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_LoadJsonWithComments(tmp_path, bMmap: bool):
+    pathFile = tmp_path / "data.json"
+    pathFile.write_text('{\n  // comment\n  "a": 1,\n}\n', encoding="utf-8")
+    assert file.LoadJson(pathFile) == {"a": 1}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_LoadJsonIgnoresTrailingData(tmp_path, bMmap: bool):
+    pathFile = tmp_path / "data.json5"
+    pathFile.write_text("{a: 1}\ntrailing", encoding="utf-8")
+    assert file.LoadJson(pathFile) == {"a": 1}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_SaveLoadRoundTrip(tmp_path, bMmap: bool):
+    pathFile = tmp_path / "data.json"
+    dicData = {"lValues": list(range(100)), "dicSub": {"fValue": 0.5, "sText": "ä"}}
+    file.SaveJson(pathFile, dicData, iIndent=2)
+    assert file.LoadJson(pathFile) == dicData
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ParseErrorPosition(tmp_path, bMmap: bool):
+    pathFile = tmp_path / "data.json5"
+    pathFile.write_text('{\n  "ä": "€€",\n  "b": §x,\n  "c": 1\n}\n', encoding="utf-8")
+    with pytest.raises(CAnyError_Message) as xInfo:
+        file.LoadJson(pathFile)
+    # endwith
+
+    sMsg = str(xInfo.value)
+    # The position is given in characters, although the file is parsed as UTF-8 bytes
+    assert "Unexpected character '§' encountered in line 3 at position 8" in sMsg
+    assert '"b": >§<x,' in sMsg
+    assert '"ä": "€€",' in sMsg
+    assert '"c": 1' in sMsg
+
+
+# enddef
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+import glob
+
+import pytest
+
+from anybase import path_glob
+
+
+#################################################################################################################
+@pytest.fixture
+def sRoot(tmp_path) -> str:
+    for sFile in [
+        "a/x.json",
+        "a/y.txt",
+        "a/b/z.json",
+        "a/b/c/w.json",
+        "a/.hidden/h.json",
+        "a/.h.json",
+        "d/e.json",
+        "f[1]/g.json",
+    ]:
+        pathFile = tmp_path / sFile
+        pathFile.parent.mkdir(parents=True, exist_ok=True)
+        pathFile.write_text("{}")
+    # endfor
+    return tmp_path.as_posix()
+
+
+# enddef
+
+
+#################################################################################################################
+def _GlobRef(_sPattern: str) -> list[str]:
+    # Results of glob.glob() with normalized paths. A final '**' only matches existing folders.
+    return [
+        os.path.normpath(sPath).replace(os.sep, "/")
+        for sPath in glob.glob(_sPattern, recursive=True)
+        if os.path.exists(sPath)
+    ]
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize(
+    "sPattern",
+    [
+        "*",
+        "a/*.json",
+        "a/**/*.json",
+        "**/*.json",
+        "**",
+        "a/**",
+        "*/b/*",
+        "a/?.*",
+        "a/[xy].*",
+        "a/.*",
+        "a/**/.*/*.json",
+        "a/b/z.json",
+        "a/missing/*.json",
+        "missing/**",
+        "f[[]1]/*",
+    ],
+)
+@pytest.mark.parametrize("iMaxWorkers", [1, 4])
+def test_SameAsGlob(sRoot: str, sPattern: str, iMaxWorkers: int):
+    sFullPattern = f"{sRoot}/{sPattern}"
+    assert path_glob.Glob(sFullPattern, iMaxWorkers=iMaxWorkers) == _GlobRef(sFullPattern)
+
+
+# enddef
+
+
+#################################################################################################################
+def test_RepeatedRecursionHasNoDuplicates(sRoot: str):
+    lPaths = path_glob.Glob(f"{sRoot}/**/**/*.json")
+    assert len(lPaths) == len(set(lPaths))
+    assert sorted(lPaths) == sorted(_GlobRef(f"{sRoot}/**/*.json"))
+
+
+# enddef
+
+
+#################################################################################################################
+def test_Cache(sRoot: str):
+    sPattern = f"{sRoot}/a/**/*.json"
+    path_glob.ClearGlobCache()
+    lPaths = path_glob.Glob(sPattern, bCache=True)
+    assert sPattern in path_glob.g_dicCache
+
+    # Cached result is reused, while the folders are unchanged
+    assert path_glob.Glob(sPattern, bCache=True) == lPaths
+
+    # A new file changes the modification time of its folder
+    with open(f"{sRoot}/a/b/c/new.json", "w") as xFile:
+        xFile.write("{}")
+    # endwith
+    os.utime(f"{sRoot}/a/b/c", ns=(0, 0))
+    assert path_glob.Glob(sPattern, bCache=True) == _GlobRef(sPattern)
+    assert f"{sRoot}/a/b/c/new.json" in path_glob.Glob(sPattern, bCache=True)
+    path_glob.ClearGlobCache()
+
+
+# enddef
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import io
+import pickle
+
+import numpy as np
+import pytest
+
+from anybase import file
+
+
+#################################################################################################################
+def _GetData() -> dict:
+    return {
+        "aImage": np.arange(4096, dtype=np.float32).reshape(64, 64),
+        "aIdx": np.arange(7, dtype=np.int16),
+        "lItems": [1, "a", None, np.arange(3)],
+        "sName": "test",
+    }
+
+
+# enddef
+
+
+#################################################################################################################
+def _AssertEqual(_dicA: dict, _dicB: dict):
+    assert _dicA.keys() == _dicB.keys()
+    np.testing.assert_array_equal(_dicA["aImage"], _dicB["aImage"])
+    assert _dicA["aImage"].dtype == _dicB["aImage"].dtype
+    np.testing.assert_array_equal(_dicA["aIdx"], _dicB["aIdx"])
+    assert _dicA["lItems"][0:3] == _dicB["lItems"][0:3]
+    np.testing.assert_array_equal(_dicA["lItems"][3], _dicB["lItems"][3])
+    assert _dicA["sName"] == _dicB["sName"]
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("bOutOfBand", [False, True])
+def test_RoundTrip(tmp_path, bOutOfBand: bool):
+    pathFile = tmp_path / "data.pickle"
+    file.SavePickle(pathFile, _GetData(), bOutOfBand=bOutOfBand, bAtomic=True)
+    dicData = file.LoadPickle(pathFile)
+    _AssertEqual(dicData, _GetData())
+    if bOutOfBand is False:
+        # Plain pickle stream of protocol 5
+        assert pathFile.read_bytes()[0:2] == b"\x80\x05"
+    # endif
+
+
+# enddef
+
+
+#################################################################################################################
+def test_OutOfBandBuffersAreMapped(tmp_path):
+    pathFile = tmp_path / "data.pickle"
+    file.SavePickle(pathFile, _GetData(), bOutOfBand=True)
+    assert pathFile.read_bytes().startswith(file.g_bytPickleContainerMagic)
+
+    dicData = file.LoadPickle(pathFile)
+    aImage: np.ndarray = dicData["aImage"]
+    # A read-only view of the mapped file, aligned for vectorized access
+    assert aImage.flags.writeable is False
+    assert aImage.ctypes.data % file.g_iPickleBufferAlign == 0
+    with pytest.raises(ValueError):
+        aImage[0, 0] = 1.0
+    # endwith
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("bOutOfBand", [False, True])
+def test_FileObjects(bOutOfBand: bool):
+    xStream = io.BytesIO()
+    file.SavePickle(xStream, _GetData(), bOutOfBand=bOutOfBand)
+    xStream.seek(0)
+    _AssertEqual(file.LoadPickle(xStream), _GetData())
+
+    # Not seekable and without peek()
+    class CStream:
+        def __init__(self, _bytData: bytes):
+            self._xStream = io.BytesIO(_bytData)
+
+        def read(self, *args):
+            return self._xStream.read(*args)
+
+        def seekable(self) -> bool:
+            return False
+
+    # endclass
+
+    _AssertEqual(file.LoadPickle(CStream(xStream.getvalue())), _GetData())
+
+
+# enddef
+
+
+#################################################################################################################
+def test_LoadPlainPickle(tmp_path):
+    # Files written with a plain pickle.dump() are still supported
+    pathFile = tmp_path / "data.pickle"
+    with pathFile.open("wb") as xFile:
+        pickle.dump({"a": [1, 2]}, xFile, protocol=2)
+    # endwith
+    assert file.LoadPickle(pathFile) == {"a": [1, 2]}
+
+
+# enddef
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import sys
+import subprocess
+
+import psutil
+import pytest
+
+from anybase import shell
+from anybase.cls_process_handler import CProcessHandler
+from anybase.cls_process_journal import CProcessJournal
+from anybase.cls_process_group_handler import CProcessGroupHandler, EProcessStatus
+
+
+#################################################################################################################
+@pytest.fixture
+def procSleep():
+    procX = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    yield procX
+    procX.kill()
+    procX.wait()
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ReadReplaysEvents(tmp_path):
+    pathJournal = tmp_path / "journal.jsonl"
+    xJournal = CProcessJournal(pathJournal)
+    xJournal.WriteRegister(1, {"sName": "a"})
+    xJournal.WriteRegister(2)
+    xJournal.WriteStatus(1, "RUNNING", sHost="local", iPid=10, fCreateTime=1.5)
+    xJournal.WriteOutput(1, 0, ["l0", "l1"])
+    xJournal.WriteOutput(1, 1, ["l1b", "l2"])
+    xJournal.WriteStatus(1, "ENDED", iReturnCode=0, sEndMsg="")
+    xJournal.Close()
+
+    # Incomplete last record of a controller that died while writing
+    with pathJournal.open("a", encoding="utf-8") as xFile:
+        xFile.write('{"sEvent": "status", "iJo')
+    # endwith
+
+    dicJobs = CProcessJournal.Read(pathJournal)
+    assert sorted(dicJobs.keys()) == [1, 2]
+    assert dicJobs[1]["dicJobInfo"] == {"sName": "a"}
+    assert dicJobs[1]["sStatus"] == "ENDED"
+    assert dicJobs[1]["sHost"] == "local"
+    assert dicJobs[1]["lLines"] == ["l0", "l1b", "l2"]
+    assert dicJobs[2]["sStatus"] == "NOT_STARTED"
+
+    xJournal = CProcessJournal(pathJournal)
+    xJournal.WriteClear()
+    xJournal.Close()
+    assert CProcessJournal.Read(pathJournal) == {}
+
+
+# enddef
+
+
+#################################################################################################################
+def test_JournalRecordsHost(tmp_path):
+    pathJournal = tmp_path / "journal.jsonl"
+    xGroup = CProcessGroupHandler(_xJournal=CProcessJournal(pathJournal))
+    xHandler = CProcessHandler()
+    xGroup.AddProcessHandler(_iJobId=0, _xProcHandler=xHandler)
+    shell.ExecProgram(sProgram=sys.executable, lArgs=["-c", "print('out')"], xProcHandler=xHandler)
+    xGroup.UpdateProcOutput()
+    xGroup.xJournal.Close()
+
+    dicJob = CProcessJournal.Read(pathJournal)[0]
+    assert dicJob["sHost"] == "local"
+    assert dicJob["fCreateTime"] is not None
+    assert dicJob["sStatus"] == "ENDED"
+    assert dicJob["lLines"] == ["out\n"]
+
+
+# enddef
+
+
+#################################################################################################################
+def test_RestoreReattachesOnlyVerifiedLocalJobs(tmp_path, procSleep: subprocess.Popen):
+    pathJournal = tmp_path / "journal.jsonl"
+    fCreateTime = psutil.Process(procSleep.pid).create_time()
+
+    xJournal = CProcessJournal(pathJournal)
+    for iJobId in range(5):
+        xJournal.WriteRegister(iJobId)
+    # endfor
+    xJournal.WriteStatus(0, "RUNNING", sHost="local", iPid=procSleep.pid, fCreateTime=fCreateTime)
+    # Same pid on a remote host
+    xJournal.WriteStatus(1, "RUNNING", sHost="socket:/tmp/agent", iPid=procSleep.pid, fCreateTime=None)
+    # Unknown creation time
+    xJournal.WriteStatus(2, "RUNNING", sHost="local", iPid=procSleep.pid, fCreateTime=None)
+    # Re-used pid
+    xJournal.WriteStatus(3, "RUNNING", sHost="local", iPid=procSleep.pid, fCreateTime=fCreateTime - 100.0)
+    xJournal.WriteStatus(4, "ENDED", sHost="local", iPid=1, iReturnCode=0, sEndMsg="")
+    xJournal.Close()
+
+    xGroup = CProcessGroupHandler(_xJournal=CProcessJournal(pathJournal))
+    xGroup.RestoreFromJournal()
+    assert xGroup.GetProcStatus(0) == EProcessStatus.RUNNING
+    assert xGroup.IsReattached(0) is True
+    for iJobId in (1, 2, 3):
+        assert xGroup.GetProcStatus(iJobId) == EProcessStatus.INTERRUPTED
+        assert xGroup.IsReattached(iJobId) is False
+    # endfor
+    assert xGroup.GetProcStatus(4) == EProcessStatus.ENDED
+
+    # Only the verified job is terminated
+    for iJobId in range(5):
+        xGroup.TerminateProc(iJobId)
+    # endfor
+    assert procSleep.wait(5.0) is not None
+
+    xGroup.PollReattachedProcs()
+    assert xGroup.GetProcStatus(0) == EProcessStatus.ENDED_UNKNOWN
+    xGroup.xJournal.Close()
+
+
+# enddef
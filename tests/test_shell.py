@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+import os
+import sys
+import time
+
+import psutil
+import pytest
+
+from anybase import shell
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="Uses bash")
+
+
+#################################################################################################################
+def _FindProcs(_sMarker: str) -> list:
+    lProcs = []
+    for procX in psutil.process_iter(["cmdline"]):
+        lCmd = procX.info["cmdline"] or []
+        if _sMarker in " ".join(lCmd) and procX.pid != os.getpid():
+            lProcs.append(procX)
+        # endif
+    # endfor
+    return lProcs
+
+
+# enddef
+
+
+#################################################################################################################
+def test_ExecCmdReturnsOutput():
+    bOk, lLines = shell.ExecBashCmds(lCmds=["echo hello", "echo world"], bReturnStdOut=True)
+    assert bOk is True
+    assert [sLine.strip() for sLine in lLines] == ["hello", "world"]
+
+
+# enddef
+
+
+#################################################################################################################
+@pytest.mark.parametrize("bNewProcessGroup", [False, True])
+def test_TimeoutTerminatesProcessTree(bNewProcessGroup: bool):
+    # Unique argument, so that the grandchildren can be found
+    sMarker = f"{sys.executable} -c import time; time.sleep(60.{os.getpid()}{int(bNewProcessGroup)})"
+    sCmd = f"'{sys.executable}' -c 'import time; time.sleep(60.{os.getpid()}{int(bNewProcessGroup)})'"
+
+    fStart = time.monotonic()
+    bOk = shell.ExecBashCmds(
+        lCmds=[f"{sCmd} & {sCmd} & wait"],
+        fTimeout_s=1.0,
+        fTerminateGrace_s=1.0,
+        bNewProcessGroup=bNewProcessGroup,
+    )
+    fDuration_s = time.monotonic() - fStart
+
+    assert bOk is False
+    assert fDuration_s < 20.0
+    _, lAlive = psutil.wait_procs(_FindProcs(sMarker), timeout=2.0)
+    assert lAlive == []
+
+
+# enddef
+
+
+#################################################################################################################
+def test_InactivityTimeout():
+    bOk, lLines = shell.ExecBashCmds(
+        lCmds=["echo start", "sleep 60"], fInactivityTimeout_s=1.0, fTerminateGrace_s=1.0, bReturnStdOut=True
+    )
+    assert bOk is False
+    assert lLines[0].strip() == "start"
+
+
+# enddef